@@ -0,0 +1,75 @@
+# backend/benchmarks/bench_context.py
+"""
+Prompt context size and build time over a long conversation session.
+
+Simulates a session whose turns vary from one line to long monologues and
+prints, at intervals, the estimated context tokens and build time for the
+old "last six messages verbatim" context and for the token-budgeted one.
+
+Run from backend/:  python -m benchmarks.bench_context [--turns 300]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from services.context_manager import ConversationContextManager, estimate_tokens
+from services.session_store import SessionStore
+
+SENTENCES = [
+    "I want my opening to grab attention.",
+    "I keep losing my train of thought in the middle section of the talk.",
+    "The data slide always takes too long and people stop listening.",
+    "Try a short pause after each key number so it lands.",
+    "Last time I rushed the conclusion because I was running out of time.",
+]
+
+
+def make_turn(rng: random.Random) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.choice([1, 2, 4, 12, 30])))
+
+
+def last_six_context(history: list) -> str:
+    return "".join(
+        f"{'User' if msg['speaker'] == 'user' else 'Coach'}: {msg['text']}\n"
+        for msg in history[-6:]
+    )
+
+
+async def run(turns: int, report_every: int):
+    rng = random.Random(7)
+    store = SessionStore()
+    manager = ConversationContextManager()
+    session = store.create()
+    full_history = []
+
+    print(f"{'turn':>5} {'last-6 tok':>11} {'budgeted tok':>13} {'build us':>9} {'summarized':>11}")
+    for turn in range(1, turns + 1):
+        new_turns = [(speaker, make_turn(rng)) for speaker in ("user", "ai")]
+        full_history.extend({"speaker": speaker, "text": text} for speaker, text in new_turns)
+        session = store.append_turns(session.session_id, new_turns)
+
+        start = time.perf_counter()
+        context = manager.build_for_session(session, store)
+        build_us = (time.perf_counter() - start) * 1e6
+        # Let the background summary refresh finish, as it would between requests
+        refresh = manager._refreshing.get(session.session_id)
+        if refresh is not None:
+            await refresh
+            session = store.get(session.session_id)
+
+        if turn % report_every == 0:
+            print(f"{turn:>5} {estimate_tokens(last_six_context(full_history)):>11} "
+                  f"{context.tokens:>13} {build_us:>9.0f} {session.summarized_upto:>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--report-every", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(run(args.turns, args.report_every))
+
+
+if __name__ == "__main__":
+    main()
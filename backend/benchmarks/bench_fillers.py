@@ -0,0 +1,129 @@
+# backend/benchmarks/bench_fillers.py
+"""
+Acoustic filled-pause detection (services/filler_detector.py): time per
+minute of audio, in process and through the audio process pool, plus
+detection accuracy on synthetic speech with known fillers.
+
+The synthetic speech is formant-synthesized: syllables of 120-280 ms whose
+pitch and formants glide towards new targets, separated by short noise
+bursts (consonants) and word pauses; fillers are 300-800 ms neutral vowels
+("uh": F1 550, F2 1500 Hz) at a flat, slightly falling pitch, usually
+next to a pause. A detection counts as a hit when it overlaps a filler.
+Run from backend/:  python -m benchmarks.bench_fillers
+"""
+import time
+
+import numpy as np
+
+from services.audio_pool import AudioProcessPool
+from services.filler_detector import detect_fillers
+
+SAMPLE_RATE = 16000
+MINUTES = [1, 5]
+POOL_CLIPS = 8
+FILLERS_PER_MINUTE = 8
+
+
+def _voice(f0: np.ndarray, formants: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Harmonics of per-sample f0, weighted by a per-sample formant envelope (bandwidth 100 Hz)."""
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    out = np.zeros(len(f0))
+    for k in range(1, int(4000 / f0.min()) + 1):
+        frequency = k * f0
+        gain = sum(1.0 / (1.0 + ((frequency - formants[:, i]) / 100.0) ** 2) for i in range(formants.shape[1]))
+        out += np.where(frequency < 0.45 * sample_rate, gain * np.sin(k * phase) / k ** 0.5, 0.0)
+    return out
+
+
+def synth_speech(minutes: float, seed: int = 0) -> tuple:
+    """(samples, filler intervals in seconds)."""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * SAMPLE_RATE)
+    f0 = np.full(total, 120.0)
+    formants = np.tile([500.0, 1500.0, 2500.0], (total, 1))
+    gate = np.zeros(total)
+    noise_gate = np.zeros(total)
+    fillers = []
+    position = int(0.3 * SAMPLE_RATE)
+    filler_prob = FILLERS_PER_MINUTE / 150.0   # about 150 words a minute
+
+    while position < total - SAMPLE_RATE:
+        if rng.random() < filler_prob:
+            # Filled pause, usually with a pause before and/or after
+            position += int(rng.choice([0.0, 0.15, 0.3]) * SAMPLE_RATE)
+            length = int(rng.uniform(0.3, 0.8) * SAMPLE_RATE)
+            span = slice(position, position + length)
+            f0[span] = 115.0 * 2 ** (np.linspace(0, -1.0, length) / 12)
+            formants[span] = [550.0, 1500.0, 2500.0]
+            gate[span] = 1.0
+            fillers.append((position / SAMPLE_RATE, (position + length) / SAMPLE_RATE))
+            position += length + int(rng.choice([0.0, 0.2, 0.4]) * SAMPLE_RATE)
+            continue
+        # A word: 1-3 syllables with moving pitch and formants, consonants between
+        for _ in range(rng.integers(1, 4)):
+            consonant = int(rng.uniform(0.03, 0.08) * SAMPLE_RATE)
+            noise_gate[position:position + consonant] = 1.0
+            position += consonant
+            length = int(rng.uniform(0.12, 0.28) * SAMPLE_RATE)
+            span = slice(position, position + length)
+            ramp = np.linspace(0, 1, length)
+            start_pitch, end_pitch = 120.0 * 2 ** (rng.uniform(-3, 4, 2) / 12)
+            f0[span] = start_pitch + (end_pitch - start_pitch) * ramp
+            first = np.array([rng.uniform(300, 800), rng.uniform(900, 2300), rng.uniform(2300, 3000)])
+            last = np.array([rng.uniform(300, 800), rng.uniform(900, 2300), rng.uniform(2300, 3000)])
+            formants[span] = first + (last - first) * ramp[:, None]
+            gate[span] = np.minimum(1.0, np.minimum(ramp, 1 - ramp) * 10)
+            position += length
+        position += int(rng.uniform(0.05, 0.35) * SAMPLE_RATE)
+
+    voice = _voice(f0, formants, SAMPLE_RATE) * gate
+    voice = 0.3 * voice / np.abs(voice).max()
+    noise = rng.standard_normal(total)
+    samples = voice + 0.05 * noise * noise_gate + 0.002 * noise
+    return samples.astype(np.float32), fillers
+
+
+def score(result: dict, fillers: list) -> tuple:
+    """(precision, recall) of detected segments against the true filler intervals."""
+    detected = [(s["start"], s["end"]) for s in result.get("segments", [])]
+    overlaps = lambda a, b: a[0] < b[1] and b[0] < a[1]
+    hits = sum(any(overlaps(d, f) for f in fillers) for d in detected)
+    found = sum(any(overlaps(d, f) for d in detected) for f in fillers)
+    return hits / max(len(detected), 1), found / max(len(fillers), 1)
+
+
+def main():
+    print(f"{'minutes':>7} {'fillers':>8} {'found':>6} {'precision':>9} {'recall':>7} {'ms':>8} {'ms/min':>8} {'RTF':>7}")
+    clips = {}
+    for minutes in MINUTES:
+        samples, fillers = synth_speech(minutes)
+        clips[minutes] = samples
+        start = time.perf_counter()
+        result = detect_fillers(samples, SAMPLE_RATE)
+        elapsed = time.perf_counter() - start
+        precision, recall = score(result, fillers)
+        print(f"{minutes:>7} {len(fillers):>8} {result['filled_pauses']:>6} {precision:>9.2f} {recall:>7.2f} "
+              f"{elapsed * 1000:>8.1f} {elapsed * 1000 / minutes:>8.1f} {elapsed / (minutes * 60):>7.4f}")
+
+    # Throughput through the pool: one-minute clips in parallel vs one after another
+    clip = clips[1]
+    start = time.perf_counter()
+    for _ in range(POOL_CLIPS):
+        detect_fillers(clip, SAMPLE_RATE)
+    serial = time.perf_counter() - start
+    pool = AudioProcessPool()
+    try:
+        pool.run(detect_fillers, clip[:SAMPLE_RATE], SAMPLE_RATE)   # start the workers
+        start = time.perf_counter()
+        futures = [pool.submit(detect_fillers, clip, SAMPLE_RATE) for _ in range(POOL_CLIPS)]
+        for future in futures:
+            future.result()
+        pooled = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    print(f"\n{POOL_CLIPS} one-minute clips: in process {serial * 1000 / POOL_CLIPS:.1f} ms/min, "
+          f"pool of {pool.workers} {pooled * 1000 / POOL_CLIPS:.1f} ms/min (including transfer)")
+
+
+if __name__ == "__main__":
+    main()
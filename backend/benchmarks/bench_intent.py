@@ -0,0 +1,81 @@
+# backend/benchmarks/bench_intent.py
+"""
+Local intent routing: how many coaching turns reach Gemini, and what
+routing costs per turn.
+
+Compares the keyword rules, the trained classifier alone and the routing
+ConversationService uses (classifier, with keyword matches it backs at low
+confidence) on held-out turns (5-fold, so the classifier never sees the
+turn it routes). A turn is
+"misrouted" when it gets a canned answer for the wrong intent, or a canned
+answer when it should have gone to Gemini.
+
+Run from backend/:  python -m benchmarks.bench_intent [--threshold 0.6] [--keyword-proba 0.15]
+"""
+import argparse
+import random
+import time
+
+from config.settings import settings
+from data.intent_examples import INTENT_EXAMPLES
+from scripts.train_intent_classifier import keyword_examples
+from services.conversation_service import keyword_intent, route_intent
+from services.intent_classifier import IntentClassifier
+
+
+def held_out_routes(examples: list, threshold: float, folds: int = 5, seed: int = 0, hybrid: bool = False):
+    """Yield (label, routed intent, microseconds) for every example, out of fold."""
+    shuffled = examples[:]
+    random.Random(seed).shuffle(shuffled)
+    for fold in range(folds):
+        train = [example for i, example in enumerate(shuffled) if i % folds != fold] + keyword_examples()
+        model = IntentClassifier.train([t for t, _ in train], [label for _, label in train])
+        for text, label in shuffled[fold::folds]:
+            start = time.perf_counter()
+            if hybrid:
+                intent = route_intent(model, text)
+            else:
+                intent, confidence = model.predict(text)
+                intent = intent if confidence >= threshold else "other"
+            yield label, intent, (time.perf_counter() - start) * 1e6
+
+
+def summarize(name: str, routes: list):
+    total = len(routes)
+    llm = sum(1 for _, intent, _ in routes if intent == "other")
+    misrouted = sum(1 for label, intent, _ in routes if intent != "other" and intent != label)
+    missed = sum(1 for label, intent, _ in routes if intent == "other" and label != "other")
+    mean_us = sum(us for _, _, us in routes) / total
+    print(f"{name:<12} {llm / total:>9.1%} {misrouted / total:>10.1%} {missed / total:>13.1%} {mean_us:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=settings.INTENT_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--keyword-proba", type=float, default=settings.INTENT_KEYWORD_MIN_PROBA)
+    args = parser.parse_args()
+    settings.INTENT_CONFIDENCE_THRESHOLD = args.threshold
+    settings.INTENT_KEYWORD_MIN_PROBA = args.keyword_proba
+
+    keyword_routes = []
+    for text, label in INTENT_EXAMPLES:
+        start = time.perf_counter()
+        intent = keyword_intent(text)
+        keyword_routes.append((label, intent, (time.perf_counter() - start) * 1e6))
+
+    classifier_routes = list(held_out_routes(list(INTENT_EXAMPLES), args.threshold))
+    hybrid_routes = list(held_out_routes(list(INTENT_EXAMPLES), args.threshold, hybrid=True))
+    always_llm = [(label, "other", 0.0) for _, label in INTENT_EXAMPLES]
+
+    print(f"{len(INTENT_EXAMPLES)} labelled turns, classifier threshold {args.threshold}, "
+          f"keyword backing {args.keyword_proba}")
+    print(f"{'routing':<12} {'LLM calls':>9} {'misrouted':>10} {'LLM-eligible':>13} {'us/turn':>9}")
+    summarize("gemini-only", always_llm)
+    summarize("keywords", keyword_routes)
+    summarize("classifier", classifier_routes)
+    summarize("routed", hybrid_routes)
+    print("(LLM-eligible: canned-intent turns sent to Gemini anyway - safe, just not saved)")
+
+
+if __name__ == "__main__":
+    main()
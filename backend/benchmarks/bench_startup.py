@@ -0,0 +1,76 @@
+# backend/benchmarks/bench_startup.py
+"""
+Cold-start benchmark: import time of main.py and time from process spawn to
+the first healthy /health response under uvicorn.
+
+Run from backend/:  python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import main; "
+    "print('IMPORT_SECONDS', time.perf_counter() - t)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    line = next(l for l in output.splitlines() if l.startswith("IMPORT_SECONDS"))
+    return float(line.split()[1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(timeout: float = 30.0) -> float:
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("Server did not become healthy")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    healths = [measure_first_health() for _ in range(args.runs)]
+
+    print(f"import main        median {statistics.median(imports) * 1000:8.1f} ms   "
+          f"min {min(imports) * 1000:8.1f} ms")
+    print(f"first /health 200  median {statistics.median(healths) * 1000:8.1f} ms   "
+          f"min {min(healths) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# backend/benchmarks/bench_uploads.py
+"""
+Peak Python-heap memory (tracemalloc; NumPy buffers included) to take in an
+uploaded recording, old way vs. spooled:
+
+- read():       `await file.read()`, the whole recording copied into memory
+- read_upload:  size/duration checks, hash and buffer over the spooled file
+- decode:       decode_wav from that buffer (the mono float32 result is the
+                only allocation: 2x the 16-bit PCM size)
+
+Run from backend/:  python -m benchmarks.bench_uploads
+"""
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from starlette.datastructures import UploadFile
+
+from services.audio_io import encode_wav, decode_wav
+from services.uploads import read_upload
+
+SAMPLE_RATE = 16000
+CLIP_MINUTES = [1, 5, 15]
+
+
+def write_clip(path: str, minutes: float):
+    rng = np.random.default_rng(0)
+    samples = (0.1 * rng.standard_normal(int(minutes * 60 * SAMPLE_RATE))).astype(np.float32)
+    with open(path, "wb") as f:
+        f.write(encode_wav(samples, SAMPLE_RATE))
+
+
+def peak_mb(fn) -> tuple:
+    """(result, peak MB, ms) of fn()"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def main():
+    print(f"{'clip (min)':>10} {'file MB':>8} {'read() MB':>10} {'read_upload MB':>15} {'ms':>6} {'decode MB':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for minutes in CLIP_MINUTES:
+            path = os.path.join(workdir, f"clip_{minutes}.wav")
+            write_clip(path, minutes)
+            size = os.path.getsize(path)
+
+            with open(path, "rb") as f:
+                data, read_peak, _ = peak_mb(lambda: asyncio.run(UploadFile(f, size=size).read()))
+                del data
+            # Starlette hands endpoints the upload as an already spooled file
+            with open(path, "rb") as f:
+                audio, spool_peak, spool_ms = peak_mb(lambda: asyncio.run(read_upload(UploadFile(f, size=size))))
+                samples, decode_peak, _ = peak_mb(lambda: decode_wav(audio.data))
+                del samples
+                audio.close()
+
+            print(f"{minutes:>10} {size / 2 ** 20:>8.1f} {read_peak:>10.1f} {spool_peak:>15.2f} {spool_ms:>6.1f} "
+                  f"{decode_peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# backend/benchmarks/bench_voice_quality.py
+"""
+Voice-quality analysis (services/voice_quality.py) against a reference
+implementation, on synthetic voices with known jitter, shimmer and noise.
+
+The reference is the textbook per-cycle procedure written as plain loops:
+walk the waveform one glottal cycle at a time (next peak searched around
+the previous one plus the local period), and compute HNR frame by frame
+with np.correlate. Praat is used as a second reference when
+praat-parselmouth is installed (it is not a project dependency).
+
+Prints time per clip, real-time factor, and both implementations' measures.
+Run from backend/:  python -m benchmarks.bench_voice_quality
+"""
+import time
+
+import numpy as np
+
+from services.audio_features import pitch_track
+from services.voice_quality import voice_quality, FMIN, FMAX, HOP_SECONDS, MAX_PERIOD_FACTOR
+
+SAMPLE_RATE = 16000
+CLIP_SECONDS = [10, 60]
+# (jitter, shimmer, noise) of the synthetic voices
+VOICES = [(0.0, 0.0, 0.005), (0.005, 0.03, 0.005), (0.01, 0.05, 0.01), (0.02, 0.10, 0.02)]
+
+
+def synth_voice(seconds: float, jitter: float, shimmer: float, noise: float, f0: float = 130.0,
+                seed: int = 0) -> np.ndarray:
+    """Harmonic voice whose cycle lengths and amplitudes vary by the given relative std, plus white noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    n_cycles = int(seconds * f0 * 1.5)
+    periods = (1 / f0) * (1 + jitter * rng.standard_normal(n_cycles))
+    amplitudes = 1 + shimmer * rng.standard_normal(n_cycles)
+    edges = np.concatenate(([0.0], np.cumsum(periods)))
+    cycle = np.searchsorted(edges, t, side="right") - 1
+    phase = cycle + (t - edges[cycle]) / periods[cycle]
+    voice = sum(np.sin(2 * np.pi * k * phase) / k ** 1.5 for k in range(1, 8)) * amplitudes[cycle]
+    voice = 0.5 * voice / np.abs(voice).max()
+    return (voice + noise * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def reference_voice_quality(samples: np.ndarray, sample_rate: int) -> dict:
+    """Loop-based jitter, shimmer and HNR (same pitch track, same smoothing)."""
+    hop = int(sample_rate * HOP_SECONDS)
+    frame_length = int(2.5 * sample_rate / FMIN)
+    f0, voiced, _, _ = pitch_track(samples, sample_rate, hop, frame_length, FMIN, FMAX)
+    kernel = np.hanning(max(3, int(sample_rate * 0.0015)) | 1)
+    x = np.convolve(samples, kernel / kernel.sum(), mode="same")
+
+    # Walk cycle by cycle through each voiced run
+    periods, amplitudes = [], []
+    frame = 0
+    while frame < len(f0):
+        if not voiced[frame]:
+            frame += 1
+            continue
+        end = frame
+        while end < len(f0) and voiced[end]:
+            end += 1
+        start_sample = frame * hop + frame_length // 2
+        stop_sample = min((end - 1) * hop + frame_length // 2, len(x) - 1)
+        period = sample_rate / f0[frame]
+        position = start_sample + int(np.argmax(x[start_sample:start_sample + int(period)]))
+        run_periods, run_amplitudes = [], [x[position]]
+        while True:
+            local = sample_rate / f0[min(int((position - frame_length / 2) / hop), len(f0) - 1)]
+            if np.isnan(local):
+                break
+            lo, hi = position + int(0.6 * local), position + int(1.4 * local)
+            if hi >= stop_sample:
+                break
+            peak = lo + int(np.argmax(x[lo:hi]))
+            left, mid, right = x[peak - 1], x[peak], x[peak + 1]
+            denom = left - 2 * mid + right
+            offset = 0.5 * (left - right) / denom if abs(denom) > 1e-12 else 0.0
+            offset = max(-0.5, min(0.5, offset))
+            previous = position if not run_periods else previous_exact
+            previous_exact = peak + offset
+            run_periods.append((previous_exact - previous) / sample_rate)
+            run_amplitudes.append(mid - 0.25 * (left - right) * offset)
+            position = peak
+        periods.append(run_periods[1:])
+        amplitudes.append(run_amplitudes[1:])
+        frame = end
+
+    diffs, all_periods, amp_diffs, amp_means = [], [], [], []
+    for run_periods, run_amplitudes in zip(periods, amplitudes):
+        all_periods.extend(run_periods)
+        for a, b in zip(run_periods, run_periods[1:]):
+            if 1 / MAX_PERIOD_FACTOR <= b / a <= MAX_PERIOD_FACTOR:
+                diffs.append(abs(b - a))
+        for a, b in zip(run_amplitudes, run_amplitudes[1:]):
+            amp_diffs.append(abs(b - a))
+            amp_means.append((a + b) / 2)
+
+    # HNR per voiced frame from the normalized autocorrelation at the pitch lag
+    hnr = []
+    window = np.hanning(frame_length)
+    window_acf = np.correlate(window, window, "full")[frame_length - 1:]
+    for i in np.flatnonzero(voiced):
+        frame_samples = samples[i * hop:i * hop + frame_length]
+        if len(frame_samples) < frame_length:
+            break
+        frame_samples = (frame_samples - frame_samples.mean()) * window
+        acf = np.correlate(frame_samples, frame_samples, "full")[frame_length - 1:]
+        acf = acf / max(acf[0], 1e-12) / np.maximum(window_acf / window_acf[0], 1e-6)
+        lag = int(round(sample_rate / f0[i]))
+        r = min(max(acf[lag - 1:lag + 2].max(), 1e-4), 0.999)
+        hnr.append(10 * np.log10(r / (1 - r)))
+
+    mean_period = np.mean(all_periods)
+    return {
+        "jitter_local_percent": round(100 * np.mean(diffs) / mean_period, 3),
+        "shimmer_local_percent": round(100 * np.mean(amp_diffs) / np.mean(amp_means), 3),
+        "hnr_db": round(float(np.mean(hnr)), 2),
+    }
+
+
+def praat_voice_quality(samples: np.ndarray, sample_rate: int):
+    try:
+        import parselmouth
+        from parselmouth.praat import call
+    except ImportError:
+        return None
+    sound = parselmouth.Sound(samples.astype(np.float64), sample_rate)
+    pulses = call(sound, "To PointProcess (periodic, cc)", FMIN, FMAX)
+    harmonicity = call(sound, "To Harmonicity (cc)", HOP_SECONDS, FMIN, 0.1, 1.0)
+    return {
+        "jitter_local_percent": round(100 * call(pulses, "Get jitter (local)", 0, 0, 0.0001, 0.02, 1.3), 3),
+        "shimmer_local_percent": round(
+            100 * call([sound, pulses], "Get shimmer (local)", 0, 0, 0.0001, 0.02, 1.3, 1.6), 3
+        ),
+        "hnr_db": round(call(harmonicity, "Get mean", 0, 0), 2),
+    }
+
+
+def main():
+    keys = ("jitter_local_percent", "shimmer_local_percent", "hnr_db")
+    print(f"{'clip (s)':>8} {'jitter':>7} {'shimmer':>8} {'noise':>6} {'impl':>10} {'ms':>8} {'RTF':>7}  "
+          f"{'jitter %':>9} {'shimmer %':>10} {'HNR dB':>7}")
+    for seconds in CLIP_SECONDS:
+        for jitter, shimmer, noise in VOICES:
+            samples = synth_voice(seconds, jitter, shimmer, noise)
+            runs = [("vectorized", voice_quality), ("reference", reference_voice_quality),
+                    ("praat", praat_voice_quality)]
+            for name, fn in runs:
+                start = time.perf_counter()
+                result = fn(samples, SAMPLE_RATE)
+                elapsed = time.perf_counter() - start
+                if result is None:
+                    continue
+                values = " ".join(f"{result.get(key, float('nan')):>{w}.3f}" for key, w in zip(keys, (9, 10, 7)))
+                print(f"{seconds:>8} {jitter:>7.3f} {shimmer:>8.2f} {noise:>6.3f} {name:>10} "
+                      f"{elapsed * 1000:>8.1f} {elapsed / seconds:>7.4f}  {values}")
+
+
+if __name__ == "__main__":
+    main()
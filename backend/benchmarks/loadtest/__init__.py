@@ -0,0 +1,6 @@
+"""
+Offline load test: boots the API against local stand-ins for Gemini,
+ElevenLabs and Firestore and reports latency percentiles and RPS per endpoint.
+
+Run from backend/:  python -m benchmarks.loadtest [--duration 30 --concurrency 32]
+"""
@@ -0,0 +1,237 @@
+# backend/benchmarks/loadtest/__main__.py
+"""
+Drive a weighted traffic mix against the app served with local stand-ins
+and report p50/p95/p99 latency and RPS per endpoint.
+
+Run from backend/:
+    python -m benchmarks.loadtest                          # print results
+    python -m benchmarks.loadtest --compare baseline.json  # diff against a baseline
+    python -m benchmarks.loadtest --output benchmarks/loadtest/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SAMPLE_SPEECHES = [
+    "Today I want to talk about why practice matters more than talent.",
+    "Um, so basically our quarterly numbers are, like, better than we expected and I think we should, you know, keep going.",
+    "Good morning everyone. Thank you for coming. I'd like to walk you through three ideas that changed how our team works. "
+    "First, we stopped guessing and started measuring. Second, we shipped smaller changes more often. "
+    "Third, we made feedback a habit instead of an event.",
+    "I'm nervous about my presentation tomorrow because I always rush through the slides.",
+    " ".join(["Our mission is to help every speaker find a clear and confident voice."] * 20),
+]
+
+CONVERSATION_MESSAGES = [
+    "Hello Alex, how are you today?",
+    "I get really nervous when everyone looks at me",
+    "I use too many filler words like um and uh",
+    "Can you help me structure a five minute talk about renewable energy?",
+    "What should I do with my hands while presenting?",
+    "I want to sound more persuasive in sales meetings",
+]
+
+SPEECH_IDS = ["ted_001", "ted_002", "political_001", "business_001"]
+
+
+def _analyze(rng):
+    return "POST", "/api/analyze", {"json": {"text": rng.choice(SAMPLE_SPEECHES)}}
+
+
+def _conversation(rng):
+    history = [{"speaker": "user" if i % 2 == 0 else "coach", "text": rng.choice(CONVERSATION_MESSAGES)}
+               for i in range(rng.randint(0, 8))]
+    return "POST", "/api/conversation/respond", {"json": {"message": rng.choice(CONVERSATION_MESSAGES), "history": history}}
+
+
+def _compare(rng):
+    return "GET", f"/api/compare/{rng.choice(SPEECH_IDS)}", {"params": {"text": rng.choice(SAMPLE_SPEECHES)}}
+
+
+def _text_to_speech(rng):
+    return "POST", "/api/text-to-speech", {"json": {"text": rng.choice(CONVERSATION_MESSAGES)}}
+
+
+def _create_session(rng):
+    return "POST", "/api/sessions", {"json": {"title": "Load test session", "duration": rng.randint(30, 600)}}
+
+
+def _list_sessions(rng):
+    return "GET", "/api/sessions", {"params": {"limit": 10}}
+
+
+# (label, weight, request builder); weights approximate a practice-heavy day
+TRAFFIC_MIX = [
+    ("POST /api/analyze", 25, _analyze),
+    ("POST /api/conversation/respond", 30, _conversation),
+    ("GET /api/compare/{id}", 10, _compare),
+    ("POST /api/text-to-speech", 15, _text_to_speech),
+    ("POST /api/sessions", 10, _create_session),
+    ("GET /api/sessions", 10, _list_sessions),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, args) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "benchmarks.loadtest.server",
+        "--port", str(port),
+        "--gemini-latency-ms", str(args.gemini_latency_ms),
+        "--gemini-error-rate", str(args.gemini_error_rate),
+        "--tts-latency-ms", str(args.tts_latency_ms),
+        "--firestore-latency-ms", str(args.firestore_latency_ms),
+        "--seed", str(args.seed),
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR)
+
+
+async def wait_healthy(client: httpx.AsyncClient, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError("Load test server did not become healthy")
+
+
+async def run_load(client: httpx.AsyncClient, duration: float, concurrency: int, seed: int) -> dict:
+    labels = [label for label, _, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight, _ in TRAFFIC_MIX]
+    builders = {label: builder for label, _, builder in TRAFFIC_MIX}
+    latencies = {label: [] for label in labels}
+    errors = {label: 0 for label in labels}
+    deadline = time.perf_counter() + duration
+
+    async def user(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            label = rng.choices(labels, weights)[0]
+            method, path, kwargs = builders[label](rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.status_code < 500
+            except httpx.HTTPError:
+                ok = False
+            latencies[label].append(time.perf_counter() - start)
+            if not ok:
+                errors[label] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return summarize(latencies, errors, elapsed)
+
+
+def summarize(latencies: dict, errors: dict, elapsed: float) -> dict:
+    endpoints = {}
+    for label, samples in latencies.items():
+        if not samples:
+            continue
+        ms = np.asarray(samples) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        endpoints[label] = {
+            "requests": len(samples),
+            "errors": errors[label],
+            "rps": round(len(samples) / elapsed, 2),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+        }
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "total_requests": total,
+        "total_rps": round(total / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'endpoint':34} {'reqs':>6} {'err':>4} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for label, row in results["endpoints"].items():
+        line = (f"{label:34} {row['requests']:>6} {row['errors']:>4} {row['rps']:>7.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+        base_row = (baseline or {}).get("endpoints", {}).get(label)
+        if base_row:
+            line += f" {(row['p95_ms'] / base_row['p95_ms'] - 1) * 100:>+11.0f}%"
+        print(line)
+    print(f"total: {results['total_requests']} requests in {results['elapsed_seconds']}s "
+          f"({results['total_rps']} rps)")
+
+
+async def main_async(args) -> dict:
+    port = free_port()
+    server = start_server(port, args)
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+            await wait_healthy(client)
+            if args.warmup > 0:
+                await run_load(client, args.warmup, args.concurrency, args.seed + 1)
+            return await run_load(client, args.duration, args.concurrency, args.seed)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent virtual users")
+    parser.add_argument("--gemini-latency-ms", type=float, default=400.0)
+    parser.add_argument("--gemini-error-rate", type=float, default=0.02)
+    parser.add_argument("--tts-latency-ms", type=float, default=150.0)
+    parser.add_argument("--firestore-latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results (e.g. a new baseline) to this JSON file")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="baseline JSON to compare p95 against")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    results["config"] = {
+        key: getattr(args, key)
+        for key in ("duration", "concurrency", "gemini_latency_ms", "gemini_error_rate",
+                    "tts_latency_ms", "firestore_latency_ms", "seed")
+    }
+    results["machine"] = {"python": platform.python_version(), "cpus": os.cpu_count()}
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
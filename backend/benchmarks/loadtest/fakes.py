@@ -0,0 +1,299 @@
+# backend/benchmarks/loadtest/fakes.py
+"""
+Local stand-ins for the three upstreams:
+
+- FakeGeminiModel: drop-in for GenerativeModel.generate_content_async with
+  log-normal latency and a configurable error rate
+- FakeFirestore: in-memory subset of the firestore client used by FirebaseService
+- ElevenLabsStub: HTTP server answering /voices and /text-to-speech/{voice}
+"""
+import asyncio
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# ---------------------------------------------------------------------------
+# Gemini
+# ---------------------------------------------------------------------------
+# The "Speech {i}:" headers of a batched narrative prompt (GeminiService.narrate_speeches)
+_SPEECH_INDEX = re.compile(r"^\s*Speech (\d+):", re.MULTILINE)
+
+
+class FakeGeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGeminiStream:
+    """What generate_content_async(..., stream=True) returns: chunks arrive over the call's latency."""
+
+    def __init__(self, text: str, latency: float, chunk_words: int = 4):
+        words = text.split(" ")
+        self._chunks = [" ".join(words[i:i + chunk_words]) + " " for i in range(0, len(words), chunk_words)]
+        self._delay = latency / max(len(self._chunks), 1)
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(self._delay)
+            yield FakeGeminiResponse(chunk)
+
+
+class FakeGeminiModel:
+    """
+    Latency is log-normal around `median_ms` (sigma controls the tail);
+    `error_rate` of calls raise like a quota/upstream error would.
+    Response bodies are chosen from the prompt so JSON-parsing callers get
+    the structure they expect.
+    """
+
+    def __init__(self, median_ms: float = 400.0, sigma: float = 0.5, error_rate: float = 0.0, seed: int = None):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    def _latency(self) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        return self._random.lognormvariate(0.0, self.sigma) * self.median_ms / 1000
+
+    async def generate_content_async(self, prompt, stream: bool = False, **kwargs):
+        self.calls += 1
+        latency = self._latency()
+        if stream:
+            # Time to first chunk is a fraction of the full response time
+            await asyncio.sleep(latency * 0.2)
+        else:
+            await asyncio.sleep(latency)
+        if self._random.random() < self.error_rate:
+            raise RuntimeError("429 Resource has been exhausted (fake)")
+        if stream:
+            return FakeGeminiStream(self._respond(str(prompt)), latency * 0.8)
+        return FakeGeminiResponse(self._respond(str(prompt)))
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self._latency())
+        if self._random.random() < self.error_rate:
+            raise RuntimeError("429 Resource has been exhausted (fake)")
+        return FakeGeminiResponse(self._respond(str(prompt)))
+
+    def _respond(self, prompt: str) -> str:
+        if "Analyze these speeches" in prompt:
+            return json.dumps([
+                {
+                    "index": int(index),
+                    "key_feedback": ["Clear structure", "Good opening", "Vary your tone"],
+                    "improvement_suggestions": ["Pause before key points", "Cut filler words"]
+                }
+                for index in _SPEECH_INDEX.findall(prompt)
+            ])
+        if "Analyze this speech text" in prompt:
+            words = max(1, len(prompt.split()) - 80)
+            return json.dumps({
+                "clarity_score": 7,
+                "confidence_score": 6,
+                "filler_words_count": 2,
+                "filler_words_list": ["um", "like"],
+                "pace": "medium",
+                "word_count": words,
+                "key_feedback": ["Clear structure", "Good opening", "Vary your tone"],
+                "improvement_suggestions": ["Pause before key points", "Cut filler words"]
+            })
+        if "speaking patterns" in prompt:
+            return json.dumps({
+                "quick_tip": "Pause after your main point",
+                "strength": "Clear topic sentence",
+                "follow_up_question": "How would you open this for a new audience?",
+                "confidence_score": 7,
+                "clarity_score": 7,
+                "pace_analysis": "medium",
+                "key_observation": "Sentences are well sized"
+            })
+        if "Compare these two speeches" in prompt:
+            return json.dumps({
+                "summary": "Similar structure, less vocal variety",
+                "strengths": ["Clear message", "Good energy"],
+                "areas_to_improve": ["Pauses", "Opening", "Pacing"],
+                "specific_advice": "Slow down on the key sentence"
+            })
+        return "That's a great start! Try emphasizing your key point with a short pause. What part feels hardest?"
+
+
+# ---------------------------------------------------------------------------
+# Firestore
+# ---------------------------------------------------------------------------
+class _Snapshot:
+    def __init__(self, doc_id: str, data):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _DocumentRef:
+    def __init__(self, db, collection: str, doc_id: str):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+
+    def set(self, data: dict):
+        self._db._delay()
+        with self._db._lock:
+            self._db._collections.setdefault(self._collection, {})[self.id] = dict(data)
+
+    def update(self, data: dict):
+        self._db._delay()
+        with self._db._lock:
+            documents = self._db._collections.setdefault(self._collection, {})
+            if self.id not in documents:
+                raise KeyError(f"No document to update: {self._collection}/{self.id}")
+            documents[self.id].update(data)
+
+    def get(self):
+        self._db._delay()
+        with self._db._lock:
+            return _Snapshot(self.id, self._db._collections.get(self._collection, {}).get(self.id))
+
+
+class _Query:
+    def __init__(self, db, collection: str, order_field=None, descending=False, limit=None):
+        self._db = db
+        self._collection = collection
+        self._order_field = order_field
+        self._descending = descending
+        self._limit = limit
+
+    def order_by(self, field: str, direction=None):
+        descending = str(direction).upper().endswith("DESCENDING")
+        return _Query(self._db, self._collection, field, descending, self._limit)
+
+    def limit(self, count: int):
+        return _Query(self._db, self._collection, self._order_field, self._descending, count)
+
+    def stream(self):
+        self._db._delay()
+        with self._db._lock:
+            items = list(self._db._collections.get(self._collection, {}).items())
+        if self._order_field:
+            items.sort(key=lambda item: item[1].get(self._order_field, ""), reverse=self._descending)
+        for doc_id, data in itertools.islice(items, self._limit):
+            yield _Snapshot(doc_id, data)
+
+
+class _CollectionRef(_Query):
+    def document(self, doc_id: str = None):
+        return _DocumentRef(self._db, self._collection, doc_id or uuid.uuid4().hex)
+
+
+class _WriteBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, doc_ref, data: dict):
+        self._writes.append((doc_ref, data))
+
+    def commit(self):
+        self._db._delay()
+        with self._db._lock:
+            for doc_ref, data in self._writes:
+                self._db._collections.setdefault(doc_ref._collection, {})[doc_ref.id] = dict(data)
+
+
+class FakeFirestore:
+    """In-memory Firestore client; each round trip sleeps `latency_ms`."""
+
+    def __init__(self, latency_ms: float = 5.0):
+        self.latency_ms = latency_ms
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def _delay(self):
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    def collection(self, name: str):
+        return _CollectionRef(self, name)
+
+    def batch(self):
+        return _WriteBatch(self)
+
+
+# ---------------------------------------------------------------------------
+# ElevenLabs
+# ---------------------------------------------------------------------------
+class ElevenLabsStub:
+    """
+    Threaded HTTP server mimicking the ElevenLabs endpoints the app calls.
+    TTS returns `audio_kb` of fake MPEG bytes after `latency_ms`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 150.0, audio_kb: int = 32):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/").endswith("/voices"):
+                    voices = [{
+                        "voice_id": f"voice_{i}",
+                        "name": f"Stub Voice {i}",
+                        "category": "premade",
+                        "labels": {},
+                        "preview_url": None,
+                        "description": "Local stand-in voice"
+                    } for i in range(8)]
+                    self._send(200, json.dumps({"voices": voices}).encode(), "application/json")
+                else:
+                    self._send(404, b'{"detail": "not found"}', "application/json")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self.rfile.read(length)
+                if "/text-to-speech/" in self.path:
+                    time.sleep(stub.latency_ms / 1000)
+                    self._send(200, stub.audio, "audio/mpeg")
+                else:
+                    self._send(404, b'{"detail": "not found"}', "application/json")
+
+        self.latency_ms = latency_ms
+        self.audio = b"\xff\xfb\x90\x00" * (audio_kb * 256)
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="elevenlabs-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,62 @@
+# backend/benchmarks/loadtest/server.py
+"""
+Serve the real app with Gemini, ElevenLabs and Firestore replaced by the
+local stand-ins in fakes.py. Started as a subprocess by the load driver,
+but usable on its own for manual testing:
+
+    python -m benchmarks.loadtest.server --port 8100 --gemini-latency-ms 400
+"""
+import argparse
+import os
+
+from benchmarks.loadtest.fakes import ElevenLabsStub, FakeFirestore, FakeGeminiModel
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--gemini-latency-ms", type=float, default=400.0, help="median Gemini latency")
+    parser.add_argument("--gemini-sigma", type=float, default=0.5, help="log-normal spread of Gemini latency")
+    parser.add_argument("--gemini-error-rate", type=float, default=0.02)
+    parser.add_argument("--tts-latency-ms", type=float, default=150.0)
+    parser.add_argument("--firestore-latency-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    elevenlabs = ElevenLabsStub(latency_ms=args.tts_latency_ms).start()
+    # Settings are read at import time, so point the app at the stub first
+    os.environ["ELEVENLABS_BASE_URL"] = elevenlabs.base_url
+    os.environ["ELEVENLABS_API_KEY"] = "loadtest"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    import uvicorn
+    import main as app_module
+    from services.gemini_service import GeminiService, get_gemini_service
+    from services.firebase_service import FirebaseService, get_firebase_service
+
+    gemini = GeminiService()
+    gemini.model = FakeGeminiModel(
+        median_ms=args.gemini_latency_ms,
+        sigma=args.gemini_sigma,
+        error_rate=args.gemini_error_rate,
+        seed=args.seed
+    )
+    get_gemini_service.override(gemini)
+
+    firebase = FirebaseService()
+    firebase.db = FakeFirestore(latency_ms=args.firestore_latency_ms)
+    get_firebase_service.override(firebase)
+
+    try:
+        uvicorn.run(app_module.app, host=args.host, port=args.port, log_level="warning")
+    finally:
+        elevenlabs.stop()
+
+
+if __name__ == "__main__":
+    main()
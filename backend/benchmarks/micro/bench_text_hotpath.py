@@ -0,0 +1,64 @@
+# backend/benchmarks/micro/bench_text_hotpath.py
+"""Per-request text processing: feedback extraction, tips, heuristic analysis and scoring."""
+import pytest
+
+from benchmarks.micro.transcripts import make_transcript
+from data.professional_speeches import get_all_speeches
+from services.comparison_service import ComparisonService
+from services.conversation_service import ConversationService
+from services.gemini_service import GeminiService, get_gemini_service
+from services.speech_scorer import SpeechScorer
+
+
+@pytest.fixture(scope="module")
+def offline_gemini():
+    # No API key: model is None, so generate() raises and callers take
+    # their local heuristic paths
+    get_gemini_service.override(GeminiService())
+    yield get_gemini_service()
+    get_gemini_service.reset()
+
+
+def bench_extract_speaking_feedback(benchmark, record_allocations, transcript):
+    from main import extract_speaking_feedback
+
+    ai_response = make_transcript(len(transcript.split()) // 2 + 10, seed=1)
+    record_allocations(extract_speaking_feedback, ai_response, transcript)
+    benchmark(extract_speaking_feedback, ai_response, transcript)
+
+
+def bench_extract_coaching_tips(benchmark, record_allocations, transcript):
+    service = ConversationService()
+    record_allocations(service._extract_coaching_tips, transcript)
+    benchmark(service._extract_coaching_tips, transcript)
+
+
+def bench_analyze_speaking_pattern_heuristic(benchmark, record_allocations, transcript, offline_gemini, event_loop_runner):
+    service = ConversationService()
+
+    def run(text):
+        return event_loop_runner(service.analyze_speaking_pattern(text))
+
+    record_allocations(run, transcript)
+    benchmark(run, transcript)
+
+
+def bench_local_speech_score(benchmark, record_allocations, transcript):
+    scorer = SpeechScorer()
+    record_allocations(scorer.score, transcript, 60.0)
+    benchmark(scorer.score, transcript, 60.0)
+
+
+def bench_local_speech_score_batch_of_32(benchmark, record_allocations, transcript):
+    scorer = SpeechScorer()
+    batch = [transcript] * 32
+    record_allocations(scorer.score_batch, batch)
+    benchmark(scorer.score_batch, batch)
+
+
+def bench_calculate_similarity_scores(benchmark, record_allocations, transcript):
+    service = ComparisonService()
+    user_analysis = SpeechScorer().score(transcript)
+    pro_metrics = get_all_speeches()[0]["metrics"]
+    record_allocations(service._calculate_similarity_scores, user_analysis, pro_metrics)
+    benchmark(service._calculate_similarity_scores, user_analysis, pro_metrics)
@@ -0,0 +1,51 @@
+# backend/benchmarks/micro/compare_allocations.py
+"""
+Flag allocation regressions between two pytest-benchmark JSON files
+(--benchmark-json or --benchmark-autosave output).
+
+    python -m benchmarks.micro.compare_allocations old.json new.json [--threshold 20]
+
+Exits non-zero if any benchmark's peak allocation grew by more than the
+threshold percentage.
+"""
+import argparse
+import json
+import sys
+
+
+def load_peaks(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    return {
+        bench["fullname"]: bench["extra_info"]["alloc_peak_kib"]
+        for bench in data["benchmarks"]
+        if "alloc_peak_kib" in bench.get("extra_info", {})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=20.0, help="allowed peak growth in percent")
+    args = parser.parse_args()
+
+    baseline = load_peaks(args.baseline)
+    current = load_peaks(args.current)
+    regressions = 0
+    for name in sorted(current):
+        if name not in baseline:
+            continue
+        old, new = baseline[name], current[name]
+        change = (new / old - 1) * 100 if old else 0.0
+        flag = ""
+        if change > args.threshold and new - old > 1.0:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:80} {old:>10.1f} -> {new:>10.1f} KiB ({change:+.0f}%){flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
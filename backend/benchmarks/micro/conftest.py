@@ -0,0 +1,43 @@
+# backend/benchmarks/micro/conftest.py
+"""
+Shared fixtures: synthetic transcripts from 10 to 5,000 words and an
+allocation probe that stores tracemalloc figures alongside the timings
+(visible in --benchmark-json / --benchmark-autosave output).
+
+Compare against a saved run to catch regressions:
+    python -m pytest benchmarks/micro -c benchmarks/micro/pytest.ini --benchmark-autosave
+    python -m pytest benchmarks/micro -c benchmarks/micro/pytest.ini --benchmark-compare --benchmark-compare-fail=median:15%
+"""
+import asyncio
+import tracemalloc
+
+import pytest
+
+from benchmarks.micro.transcripts import TRANSCRIPT_WORDS, make_transcript
+
+
+@pytest.fixture(params=TRANSCRIPT_WORDS, ids=lambda n: f"{n}w")
+def transcript(request) -> str:
+    return make_transcript(request.param)
+
+
+@pytest.fixture
+def record_allocations(benchmark):
+    """Run the callable once under tracemalloc and attach peak/net KiB to the benchmark."""
+    def probe(func, *args):
+        tracemalloc.start()
+        try:
+            func(*args)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["alloc_peak_kib"] = round(peak / 1024, 1)
+        benchmark.extra_info["alloc_net_kib"] = round(current / 1024, 1)
+    return probe
+
+
+@pytest.fixture
+def event_loop_runner():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
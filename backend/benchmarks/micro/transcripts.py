@@ -0,0 +1,28 @@
+# backend/benchmarks/micro/transcripts.py
+"""Synthetic speech transcripts for the microbenchmarks."""
+import random
+
+TRANSCRIPT_WORDS = [10, 100, 1000, 5000]
+
+_VOCABULARY = (
+    "today I want to talk about how our team improved the way we present ideas "
+    "to customers and why practice and feedback matter more than talent when "
+    "you speak in front of people the key point is clarity confidence and pace "
+    "so we measured every talk recorded it and reviewed it together"
+).split()
+_FILLERS = ["um", "uh", "like", "so", "actually", "basically", "you know", "well"]
+
+
+def make_transcript(words: int, seed: int = 0) -> str:
+    """Speech-like text: 8-20 word sentences with ~6% filler words."""
+    rng = random.Random(seed)
+    out = []
+    sentence_left = rng.randint(8, 20)
+    for _ in range(words):
+        out.append(rng.choice(_FILLERS) if rng.random() < 0.06 else rng.choice(_VOCABULARY))
+        sentence_left -= 1
+        if sentence_left == 0:
+            out[-1] += rng.choice([".", ".", ".", "?", "!"])
+            sentence_left = rng.randint(8, 20)
+    out[-1] = out[-1].rstrip(".?!") + "."
+    return " ".join(out)
@@ -1,5 +1,6 @@
 # backend/config/settings.py
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,6 +16,7 @@ class Settings:
     
     # ElevenLabs
     ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
+    ELEVENLABS_BASE_URL = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io/v1")
     
     # Firebase
     FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "vocal-health-companion")
@@ -24,6 +26,140 @@ class Settings:
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
     FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
     
+    # Conversation sessions (server-side history): Redis when REDIS_URL is set,
+    # else a SQLite file shared by all workers (empty path: per-process memory)
+    REDIS_URL = os.getenv("REDIS_URL")
+    SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.sqlite3")
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", 3600))
+    SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", 10000))
+    SESSION_HISTORY_TURNS = int(os.getenv("SESSION_HISTORY_TURNS", 40))
+    
+    # Prompt context: recent turns verbatim up to CONTEXT_TOKEN_BUDGET, older
+    # turns compacted into a summary of at most CONTEXT_SUMMARY_TOKENS
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", 400))
+    CONTEXT_SUMMARY_TOKENS = int(os.getenv("CONTEXT_SUMMARY_TOKENS", 200))
+    
+    # Prompt prefixes at least this large use Gemini context caching
+    PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", 1024))
+    PROMPT_CACHE_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", 3600))
+    
+    # Local intent classifier: turns below the confidence threshold go to Gemini
+    # unless a keyword rule matches an intent the classifier gives at least
+    # INTENT_KEYWORD_MIN_PROBA
+    INTENT_MODEL_PATH = os.getenv(
+        "INTENT_MODEL_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "models", "intent_classifier.npz")
+    )
+    INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", 0.6))
+    INTENT_KEYWORD_MIN_PROBA = float(os.getenv("INTENT_KEYWORD_MIN_PROBA", 0.15))
+    
+    # Speech analysis: local scores are returned at once; the Gemini narrative
+    # runs as an analysis job (poll/SSE) unless ready within the wait
+    ANALYSIS_NARRATIVE = os.getenv("ANALYSIS_NARRATIVE", "true").lower() == "true"
+    ANALYSIS_NARRATIVE_WAIT_SECONDS = float(os.getenv("ANALYSIS_NARRATIVE_WAIT_SECONDS", 0))
+    ANALYSIS_NARRATIVE_CACHE_SIZE = int(os.getenv("ANALYSIS_NARRATIVE_CACHE_SIZE", 1024))
+    ANALYSIS_NARRATIVE_TTL_SECONDS = int(os.getenv("ANALYSIS_NARRATIVE_TTL_SECONDS", 3600))
+    ANALYSIS_JOB_TTL_SECONDS = int(os.getenv("ANALYSIS_JOB_TTL_SECONDS", 3600))
+    ANALYSIS_JOB_POLL_SECONDS = float(os.getenv("ANALYSIS_JOB_POLL_SECONDS", 0.5))
+    ANALYSIS_JOB_SSE_TIMEOUT_SECONDS = float(os.getenv("ANALYSIS_JOB_SSE_TIMEOUT_SECONDS", 60))
+    # Batch analysis: transcripts per Gemini call, and Gemini calls in flight per batch
+    ANALYSIS_BATCH_MAX_ITEMS = int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", 500))
+    ANALYSIS_BATCH_UPLOAD_MAX_BYTES = int(os.getenv("ANALYSIS_BATCH_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+    ANALYSIS_BATCH_UPSTREAM_SIZE = int(os.getenv("ANALYSIS_BATCH_UPSTREAM_SIZE", 5))
+    ANALYSIS_BATCH_CONCURRENCY = int(os.getenv("ANALYSIS_BATCH_CONCURRENCY", 4))
+    
+    # Uploaded recordings: larger or longer ones are rejected with 413; whole
+    # multipart bodies are capped before parsing (a take plus its reference)
+    UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 200 * 1024 * 1024))
+    UPLOAD_MAX_SECONDS = float(os.getenv("UPLOAD_MAX_SECONDS", 1200))
+    UPLOAD_MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", 2 * UPLOAD_MAX_BYTES + 1024 * 1024))
+    
+    # Resumable uploads (/api/uploads): chunk store, largest chunk per PUT,
+    # and how long an untouched upload is kept
+    UPLOAD_CHUNK_DIR = os.getenv("UPLOAD_CHUNK_DIR", "upload_chunks")
+    UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", 4 * 1024 * 1024))
+    UPLOAD_SESSION_TTL_SECONDS = int(os.getenv("UPLOAD_SESSION_TTL_SECONDS", 86400))
+    
+    # Transcripts and audio features cached by recording content hash
+    STT_CACHE_SIZE = int(os.getenv("STT_CACHE_SIZE", 1024))
+    STT_CACHE_TTL_SECONDS = int(os.getenv("STT_CACHE_TTL_SECONDS", 21600))
+    PROSODY_CONTOUR_CACHE_SIZE = int(os.getenv("PROSODY_CONTOUR_CACHE_SIZE", 64))
+    
+    # Coach voice used when a request does not pick one
+    TTS_VOICE_ID = os.getenv("TTS_VOICE_ID", "EXAVITQu4vr4xnSDxMaL")
+    
+    # Speculative TTS: coach replies are synthesized as soon as they exist and
+    # kept briefly under the returned audio_token
+    TTS_SPECULATIVE = os.getenv("TTS_SPECULATIVE", "true").lower() == "true"
+    TTS_SPECULATIVE_TTL_SECONDS = int(os.getenv("TTS_SPECULATIVE_TTL_SECONDS", 120))
+    TTS_SPECULATIVE_CACHE_SIZE = int(os.getenv("TTS_SPECULATIVE_CACHE_SIZE", 256))
+    TTS_SPECULATIVE_WAIT_SECONDS = float(os.getenv("TTS_SPECULATIVE_WAIT_SECONDS", 10))
+    
+    # Voice turns (/api/voice-turn): coach audio is synthesized per sentence,
+    # this many sentences at once
+    VOICE_TURN_TTS_CONCURRENCY = int(os.getenv("VOICE_TURN_TTS_CONCURRENCY", 2))
+    
+    # Background jobs: SQLite queue plus a pool of worker processes
+    # (JOB_WORKERS=0 when workers run separately via `python -m services.job_worker`)
+    JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "jobs.sqlite3")
+    JOB_SPOOL_DIR = os.getenv("JOB_SPOOL_DIR", "job_spool")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_BACKOFF_SECONDS = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", 2))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", 300))
+    # Running jobs renew their lease this often, so only a dead worker loses it
+    JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", JOB_LEASE_SECONDS / 3))
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 0.5))
+    JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", 86400))
+    
+    # Recording archive: session recordings kept as low-bitrate Opus (via ffmpeg),
+    # content-addressed on disk with a SQLite index; per-user quota and retention
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "recording_archive")
+    ARCHIVE_INDEX_PATH = os.getenv("ARCHIVE_INDEX_PATH", "archive.sqlite3")
+    ARCHIVE_FFMPEG = os.getenv("ARCHIVE_FFMPEG", "ffmpeg")
+    ARCHIVE_OPUS_BITRATE = os.getenv("ARCHIVE_OPUS_BITRATE", "24k")
+    # Kill a hung transcode well before the job lease would run out
+    ARCHIVE_TRANSCODE_TIMEOUT_SECONDS = float(os.getenv("ARCHIVE_TRANSCODE_TIMEOUT_SECONDS", 120))
+    ARCHIVE_USER_QUOTA_BYTES = int(os.getenv("ARCHIVE_USER_QUOTA_BYTES", 500 * 1024 * 1024))
+    ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", 90))
+    
+    # Voice load: per-user hourly rollups of vocal dose (SQLite), for windowed totals and alerts
+    VOICE_LOAD_PATH = os.getenv("VOICE_LOAD_PATH", "voice_load.sqlite3")
+    VOICE_LOAD_RETENTION_DAYS = int(os.getenv("VOICE_LOAD_RETENTION_DAYS", 90))
+    
+    # Pre-processing of practice recordings before STT and analysis:
+    # resample to mono 16 kHz, spectral-gating noise reduction, loudness normalization
+    PREPROCESS_ENABLED = os.getenv("PREPROCESS_ENABLED", "true").lower() == "true"
+    PREPROCESS_SAMPLE_RATE = int(os.getenv("PREPROCESS_SAMPLE_RATE", 16000))
+    PREPROCESS_TARGET_DBFS = float(os.getenv("PREPROCESS_TARGET_DBFS", -23.0))
+    PREPROCESS_NOISE_REDUCTION_DB = float(os.getenv("PREPROCESS_NOISE_REDUCTION_DB", 12.0))
+    PREPROCESS_GATE_DB = float(os.getenv("PREPROCESS_GATE_DB", 6.0))
+    # Non-WAV recordings (browser webm/mp4) are decoded to PCM with ffmpeg
+    PREPROCESS_FFMPEG = os.getenv("PREPROCESS_FFMPEG", ARCHIVE_FFMPEG)
+    PREPROCESS_DECODE_TIMEOUT_SECONDS = float(os.getenv("PREPROCESS_DECODE_TIMEOUT_SECONDS", 60))
+    
+    # Recording analysis (pre-processing, voice quality, fillers) runs in a pool of
+    # spawned processes per API worker; 0 = in the request's worker thread
+    AUDIO_POOL_WORKERS = int(os.getenv("AUDIO_POOL_WORKERS", 2))
+    
+    # Startup: build service clients in the background right after boot
+    WARM_UP_SERVICES = os.getenv("WARM_UP_SERVICES", "true").lower() == "true"
+    
+    # Production server (gunicorn + uvicorn workers)
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 0))  # 0 = one worker per core
+    SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", 10))
+    
+    # Observability: LOG_LEVEL=WARNING silences per-request logs under load
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text | json
+    
+    # Tracing: spans exported to a local file or an OTLP/HTTP collector
+    TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none")  # none | file | console | otlp
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", 0.1))
+    TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+    OTLP_ENDPOINT = os.getenv("OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", "X-Debug-Timing")
+    
     # Check which auth method is available
     @property
     def google_auth_method(self):
@@ -42,8 +178,9 @@ class Settings:
             missing.append("GOOGLE_API_KEY or GOOGLE_APPLICATION_CREDENTIALS")
         
         if missing:
-            print(f"⚠️  Missing: {', '.join(missing)}")
-            print("Will use mock data for missing services")
+            logger = logging.getLogger(__name__)
+            logger.warning("Missing: %s", ", ".join(missing))
+            logger.warning("Will use mock data for missing services")
         return True
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,214 @@
+# backend/data/coaching_content.py
+"""
+Read-only coaching tables shared by the API and services.
+
+Kept as module-level constants so they are built once, in the master process
+when the app is preloaded, and shared copy-on-write by forked workers.
+"""
+
+CONVERSATION_TOPICS = [
+    {
+        "id": "introduction", 
+        "name": "Introduce yourself", 
+        "prompt": "Tell me about yourself in 30 seconds",
+        "difficulty": "beginner",
+        "estimated_time": "1-2 minutes",
+        "skills": ["clarity", "conciseness", "confidence"]
+    },
+    {
+        "id": "elevator_pitch", 
+        "name": "Practice elevator pitch", 
+        "prompt": "Pitch your favorite project or idea in 60 seconds",
+        "difficulty": "intermediate",
+        "estimated_time": "2-3 minutes",
+        "skills": ["persuasion", "storytelling", "enthusiasm"]
+    },
+    {
+        "id": "difficult_topic", 
+        "name": "Explain a complex topic", 
+        "prompt": "Explain AI or another complex topic to a 10-year-old",
+        "difficulty": "advanced",
+        "estimated_time": "3-4 minutes",
+        "skills": ["simplification", "analogies", "clarity"]
+    },
+    {
+        "id": "storytelling", 
+        "name": "Tell a personal story", 
+        "prompt": "Share a story about a challenge you overcame",
+        "difficulty": "intermediate",
+        "estimated_time": "2-3 minutes",
+        "skills": ["emotion", "pacing", "engagement"]
+    },
+    {
+        "id": "opinion_piece", 
+        "name": "Share an opinion", 
+        "prompt": "Share your opinion on a topic you're passionate about",
+        "difficulty": "intermediate",
+        "estimated_time": "2-3 minutes",
+        "skills": ["conviction", "structure", "persuasion"]
+    },
+    {
+        "id": "job_interview", 
+        "name": "Job interview practice", 
+        "prompt": "Why should we hire you for your dream job?",
+        "difficulty": "advanced",
+        "estimated_time": "3-4 minutes",
+        "skills": ["professionalism", "confidence", "specificity"]
+    }
+]
+
+VIRTUAL_MEETING_TEMPLATES = [
+    {
+        "id": "team_meeting",
+        "title": "Weekly Team Sync",
+        "platform": "Zoom",
+        "duration": "30 min",
+        "participants": 8,
+        "scenario": "Presenting project updates to your team"
+    },
+    {
+        "id": "client_presentation",
+        "title": "Client Presentation",
+        "platform": "Microsoft Teams",
+        "duration": "45 min",
+        "participants": 15,
+        "scenario": "Pitching new ideas to clients"
+    },
+    {
+        "id": "all_hands",
+        "title": "All-Hands Meeting",
+        "platform": "Google Meet",
+        "duration": "60 min",
+        "participants": 50,
+        "scenario": "Company-wide announcements"
+    },
+    {
+        "id": "job_interview",
+        "title": "Virtual Job Interview",
+        "platform": "Zoom",
+        "duration": "45 min",
+        "participants": 3,
+        "scenario": "Technical interview with panel"
+    }
+]
+
+MEETING_PRACTICE_TEMPLATES = [
+    {
+        "id": "team_meeting",
+        "title": "Weekly Team Sync",
+        "platform": "Zoom",
+        "duration": "30 min",
+        "participants": 8,
+        "scenario": "Presenting project updates to your team",
+        "prompts": [
+            "Good morning team, let's start with updates...",
+            "My project is on track, this week we completed...",
+            "The main challenge we're facing is...",
+            "For next week, we'll focus on..."
+        ]
+    },
+    {
+        "id": "client_presentation",
+        "title": "Client Quarterly Review",
+        "platform": "Teams",
+        "duration": "45 min",
+        "participants": 12,
+        "scenario": "Presenting quarterly results to important clients",
+        "prompts": [
+            "Thank you for joining today's review...",
+            "This quarter, we achieved 120% of our targets...",
+            "Our key metrics show improvement in...",
+            "Looking ahead to next quarter, we plan to..."
+        ]
+    },
+    {
+        "id": "job_interview",
+        "title": "Virtual Job Interview",
+        "platform": "Zoom",
+        "duration": "60 min",
+        "participants": 3,
+        "scenario": "Final round interview with company executives",
+        "prompts": [
+            "Thank you for this opportunity...",
+            "In my previous role, I successfully...",
+            "What excites me about this position is...",
+            "My approach to challenges is..."
+        ]
+    },
+    {
+        "id": "conference_talk",
+        "title": "Virtual Conference Presentation",
+        "platform": "Both",
+        "duration": "20 min",
+        "participants": 50,
+        "scenario": "Presenting at an industry conference",
+        "prompts": [
+            "Hello everyone, thank you for joining...",
+            "Today I'll be discussing an important trend...",
+            "Let me share a case study that illustrates...",
+            "In conclusion, I want to leave you with..."
+        ]
+    }
+]
+
+PROFESSIONAL_TIPS = {
+    "Steve Jobs": [
+        "Use dramatic pauses for emphasis",
+        "Tell personal stories to connect",
+        "Repeat key phrases for impact"
+    ],
+    "Simon Sinek": [
+        "Start with 'Why' before 'What'",
+        "Use simple, powerful visuals",
+        "Speak slowly to emphasize points"
+    ],
+    "Martin Luther King Jr.": [
+        "Use rhythmic repetition",
+        "Build to emotional climax",
+        "Speak with conviction and passion"
+    ],
+    "Brené Brown": [
+        "Be vulnerable and authentic",
+        "Use personal anecdotes",
+        "Maintain conversational tone"
+    ]
+}
+
+DEFAULT_PROFESSIONAL_TIPS = [
+    "Practice deliberate pauses",
+    "Record and review yourself",
+    "Focus on one improvement at a time"
+]
+
+PLATFORM_TIPS = {
+    "Zoom": [
+        "Use Zoom's 'pin video' to focus on key participants",
+        "Enable 'touch up my appearance' for better video quality",
+        "Use virtual background to minimize distractions",
+        "Mute when not speaking to avoid background noise"
+    ],
+    "Teams": [
+        "Use 'Together Mode' for more engaging meetings",
+        "Enable live captions for accessibility",
+        "Use 'Raise Hand' feature for structured discussions",
+        "Share specific windows instead of entire screen"
+    ],
+    "Both": [
+        "Look at the camera, not your own video",
+        "Use good lighting - face a window or use a lamp",
+        "Position camera at eye level",
+        "Use a headset for better audio quality"
+    ]
+}
+
+COACHING_TIP_KEYWORDS = {
+    "breath": ["Remember to breathe deeply", "Practice breathing exercises"],
+    "pause": ["Use pauses for emphasis", "Don't rush your pauses"],
+    "slow": ["Speak at a measured pace", "Don't rush your words"],
+    "fast": ["Consider slowing down slightly", "Pace yourself"],
+    "confident": ["Project confidence in your voice", "Stand tall and speak boldly"],
+    "clear": ["Enunciate your words clearly", "Focus on articulation"],
+    "practice": ["Practice regularly for improvement", "Consistent practice is key"],
+    "eye contact": ["Maintain good eye contact", "Connect with your audience visually"],
+    "volume": ["Adjust your volume appropriately", "Project your voice"]
+}
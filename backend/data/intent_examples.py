@@ -0,0 +1,211 @@
+# backend/data/intent_examples.py
+"""
+Labelled coaching turns for the local intent classifier
+(scripts/train_intent_classifier.py). Logged conversation turns exported as
+JSONL ({"text": ..., "intent": ...}) can be added at training time.
+
+Intents map to ConversationService's canned handlers; "other" means the
+turn needs the LLM.
+"""
+
+INTENTS = ["greeting", "nervousness", "filler_words", "pacing", "practice", "confidence", "clarity", "other"]
+
+# Substring rules used when no trained model is available, checked in order.
+# Also added to the training data as one-word examples.
+INTENT_KEYWORDS = {
+    "greeting": ["hi", "hello", "hey", "how are you"],
+    "nervousness": ["nervous", "anxious", "scared", "afraid", "fear", "worried", "stage fright"],
+    "filler_words": ["filler", "um", "uh", "like", "you know", "actually", "basically"],
+    "pacing": ["fast", "slow", "speed", "pace", "rate", "quick", "rushed"],
+    "practice": ["practice", "exercise", "drill", "train", "rehearse", "prepare"],
+    "confidence": ["confidence", "confident", "bold", "assertive"],
+    "clarity": ["clear", "clarity", "understand", "audible", "mumble"],
+}
+
+INTENT_EXAMPLES = [
+    # greeting
+    ("hi", "greeting"),
+    ("hello", "greeting"),
+    ("hey alex", "greeting"),
+    ("hello alex, how are you today?", "greeting"),
+    ("hi coach", "greeting"),
+    ("hey there", "greeting"),
+    ("good morning alex", "greeting"),
+    ("good evening coach", "greeting"),
+    ("how are you doing?", "greeting"),
+    ("hi, nice to meet you", "greeting"),
+    ("hello! i'm new here", "greeting"),
+    ("hey coach, what's up", "greeting"),
+    ("hi alex, i'm back", "greeting"),
+    ("hello, is anyone there?", "greeting"),
+    ("good afternoon", "greeting"),
+    ("hey, how's it going", "greeting"),
+    ("hi there coach, how have you been", "greeting"),
+    ("hello again", "greeting"),
+    ("hiya", "greeting"),
+    ("greetings alex", "greeting"),
+
+    # nervousness
+    ("i'm feeling really nervous about my speech tomorrow", "nervousness"),
+    ("public speaking makes me very anxious", "nervousness"),
+    ("i get scared when everyone looks at me", "nervousness"),
+    ("my hands shake when i present", "nervousness"),
+    ("i have terrible stage fright", "nervousness"),
+    ("i'm afraid i'll freeze on stage", "nervousness"),
+    ("my heart races before every presentation", "nervousness"),
+    ("i'm worried about my wedding toast", "nervousness"),
+    ("how do i stop panicking before a talk", "nervousness"),
+    ("i feel sick before presenting to my boss", "nervousness"),
+    ("my voice trembles when i'm in front of a crowd", "nervousness"),
+    ("i'm terrified of speaking at the conference", "nervousness"),
+    ("i blank out because of anxiety", "nervousness"),
+    ("what do i do about the butterflies in my stomach", "nervousness"),
+    ("i get so tense during meetings that i can't talk", "nervousness"),
+    ("fear of public speaking is ruining my career", "nervousness"),
+    ("i sweat a lot and get jittery when presenting", "nervousness"),
+    ("how can i calm my nerves before an interview", "nervousness"),
+    ("i dread giving the team update every monday", "nervousness"),
+    ("being on camera makes me anxious", "nervousness"),
+
+    # filler_words
+    ("i use too many filler words like um and uh", "filler_words"),
+    ("my problem is saying you know too much", "filler_words"),
+    ("i need help reducing filler words in my speech", "filler_words"),
+    ("i say um constantly", "filler_words"),
+    ("how do i stop saying like all the time", "filler_words"),
+    ("people told me i say basically in every sentence", "filler_words"),
+    ("i keep saying uh between sentences", "filler_words"),
+    ("how can i get rid of ums and ahs", "filler_words"),
+    ("i fill every silence with so and actually", "filler_words"),
+    ("my recording had twenty ums in two minutes", "filler_words"),
+    ("i overuse the word like", "filler_words"),
+    ("how do i avoid verbal crutches", "filler_words"),
+    ("i start every answer with so", "filler_words"),
+    ("what can i say instead of um", "filler_words"),
+    ("my manager counted my filler words", "filler_words"),
+    ("i say kind of and sort of too often", "filler_words"),
+    ("too many uhs when i think", "filler_words"),
+    ("i can't stop using fillers when i'm thinking", "filler_words"),
+    ("help me cut down on i mean and you know", "filler_words"),
+    ("how do professionals avoid filler words", "filler_words"),
+
+    # pacing
+    ("i speak too fast during presentations", "pacing"),
+    ("people say i talk very quickly when nervous", "pacing"),
+    ("how can i slow down my speaking pace", "pacing"),
+    ("i rush through my slides", "pacing"),
+    ("my talks always run short because i go too fast", "pacing"),
+    ("i talk too slowly and people get bored", "pacing"),
+    ("what is a good speaking rate", "pacing"),
+    ("how many words per minute should i speak", "pacing"),
+    ("i race through the conclusion", "pacing"),
+    ("my speed goes up when i get excited", "pacing"),
+    ("how do i use pauses better", "pacing"),
+    ("i never pause between points", "pacing"),
+    ("i speak in one long rushed stream", "pacing"),
+    ("my tempo is all over the place", "pacing"),
+    ("am i speaking too quick", "pacing"),
+    ("i sound rushed on calls", "pacing"),
+    ("how do i control my pace in a timed talk", "pacing"),
+    ("i drag on and speak too slow", "pacing"),
+    ("listeners can't keep up with me", "pacing"),
+    ("how long should a dramatic pause be", "pacing"),
+
+    # practice
+    ("can we practice elevator pitches", "practice"),
+    ("give me an exercise to do today", "practice"),
+    ("i want to rehearse my presentation", "practice"),
+    ("what drills can i do at home", "practice"),
+    ("help me prepare for my talk", "practice"),
+    ("let's do a practice round", "practice"),
+    ("can you give me a speaking exercise", "practice"),
+    ("i want to train every day", "practice"),
+    ("what should i practice this week", "practice"),
+    ("give me a daily routine to improve", "practice"),
+    ("can we do an impromptu speaking drill", "practice"),
+    ("suggest a warm up before i speak", "practice"),
+    ("i'd like to rehearse my toast with you", "practice"),
+    ("what's a good exercise for storytelling", "practice"),
+    ("let's practice answering questions", "practice"),
+    ("give me a random topic to talk about", "practice"),
+    ("how should i prepare the night before", "practice"),
+    ("i need a practice plan for my keynote", "practice"),
+    ("can you quiz me with practice prompts", "practice"),
+    ("what homework should i do for speaking", "practice"),
+
+    # confidence
+    ("how can i sound more confident", "confidence"),
+    ("i want to be more assertive in meetings", "confidence"),
+    ("i lack confidence when i speak", "confidence"),
+    ("how do i project authority", "confidence"),
+    ("i sound unsure of myself", "confidence"),
+    ("how can i be bolder when presenting", "confidence"),
+    ("people interrupt me because i'm too soft", "confidence"),
+    ("i want to own the room", "confidence"),
+    ("how do i stop doubting myself on stage", "confidence"),
+    ("i feel like an impostor when i present", "confidence"),
+    ("my voice sounds weak and timid", "confidence"),
+    ("how do leaders sound so self assured", "confidence"),
+    ("i want more presence when i speak", "confidence"),
+    ("how do i stop apologizing in every sentence", "confidence"),
+    ("i undersell my ideas", "confidence"),
+    ("how can i speak with conviction", "confidence"),
+    ("i want to sound more convincing", "confidence"),
+    ("body language tips to look confident", "confidence"),
+    ("i hesitate to speak up in big meetings", "confidence"),
+    ("how can i trust myself more when speaking", "confidence"),
+
+    # clarity
+    ("people say i mumble", "clarity"),
+    ("how can i speak more clearly", "clarity"),
+    ("my words run together", "clarity"),
+    ("people can't understand me on calls", "clarity"),
+    ("i need better articulation", "clarity"),
+    ("how do i enunciate better", "clarity"),
+    ("my pronunciation is unclear", "clarity"),
+    ("i'm too quiet and nobody can hear me", "clarity"),
+    ("how do i improve my diction", "clarity"),
+    ("i swallow the ends of my words", "clarity"),
+    ("people keep asking me to repeat myself", "clarity"),
+    ("my accent makes me hard to understand", "clarity"),
+    ("how do i make my speech crisper", "clarity"),
+    ("i slur words when i'm tired", "clarity"),
+    ("i need to be more audible in big rooms", "clarity"),
+    ("my voice gets lost at the back of the room", "clarity"),
+    ("how can i make my explanations easier to follow", "clarity"),
+    ("i ramble and lose my point", "clarity"),
+    ("my sentences are too long and confusing", "clarity"),
+    ("tips for clear speech", "clarity"),
+
+    # other (needs the LLM)
+    ("can you help me structure a five minute talk about renewable energy", "other"),
+    ("what should i do with my hands while presenting", "other"),
+    ("i want to sound more persuasive in sales meetings", "other"),
+    ("today i'd like to talk about climate change initiatives", "other"),
+    ("our company's quarterly results show a positive trend", "other"),
+    ("the key points of my presentation are threefold", "other"),
+    ("can you give me feedback on my body language", "other"),
+    ("what techniques can i use to engage the audience", "other"),
+    ("i want to improve my storytelling skills", "other"),
+    ("help me with my job interview preparation", "other"),
+    ("how do i open a keynote with a story", "other"),
+    ("could you check my opening sentence for tomorrow's budget meeting", "other"),
+    ("what's the best way to end a presentation", "other"),
+    ("how do i handle hostile questions", "other"),
+    ("can you rewrite this sentence to be punchier", "other"),
+    ("what makes a great ted talk", "other"),
+    ("how should i introduce myself at a networking event", "other"),
+    ("my team doesn't engage during updates, any ideas", "other"),
+    ("how do i explain a technical topic to executives", "other"),
+    ("what do you think of this line: innovation is our north star", "other"),
+    ("i have to give a eulogy next week, where do i start", "other"),
+    ("how do i use humor without offending anyone", "other"),
+    ("tell me about the rule of three", "other"),
+    ("how can i make my slides less boring", "other"),
+    ("i'm presenting a product demo to investors", "other"),
+    ("what questions should i ask the audience", "other"),
+    ("how long should my best man speech be", "other"),
+    ("can you summarize what we covered so far", "other"),
+    ("what did you think of my last answer", "other"),
+    ("thanks, that's really helpful", "other"),
+]
@@ -0,0 +1,50 @@
+# backend/data/speech_lexicon.py
+"""
+Word lists and feedback lines for the local speech scorer
+(services/speech_scorer.py). Multi-word entries are matched as phrases.
+"""
+
+FILLER_TERMS = [
+    "um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm",
+    "like", "so", "actually", "basically", "literally", "well",
+    "you know", "i mean", "you see",
+]
+
+HEDGE_TERMS = [
+    "maybe", "perhaps", "probably", "possibly", "somewhat", "hopefully",
+    "i think", "i guess", "i feel like", "i suppose", "i believe",
+    "sort of", "kind of", "a bit", "a little", "more or less",
+    "might", "could be", "not sure", "just",
+]
+
+# Comfortable delivery rate for presentations, words per minute
+PACE_WPM = (110, 170)
+
+# Clarity: sentences longer than this (words) get hard to follow when spoken
+LONG_SENTENCE_WORDS = 25
+
+FEEDBACK = {
+    "clear_structure": "Your sentences are easy to follow",
+    "long_sentences": "Some sentences run long, which makes them hard to follow when spoken",
+    "monotone_rhythm": "Sentence lengths are very uniform, so the rhythm can feel flat",
+    "varied_rhythm": "Good mix of short and long sentences",
+    "rich_vocabulary": "Varied vocabulary keeps the message engaging",
+    "repetitive_vocabulary": "Several words repeat often; try varying your word choice",
+    "few_fillers": "Very few filler words",
+    "many_fillers": "Filler words are interrupting your flow",
+    "assertive": "Direct, assertive phrasing",
+    "hedging": "Hedging phrases soften your key points",
+    "too_short": "Speak a little longer so there is more to assess",
+}
+
+SUGGESTIONS = {
+    "long_sentences": "Split long sentences into one idea each",
+    "monotone_rhythm": "Follow a long sentence with a short, punchy one",
+    "repetitive_vocabulary": "Swap repeated words for more specific ones",
+    "many_fillers": "Replace filler words with a brief pause",
+    "hedging": "State your main points without 'I think' or 'maybe'",
+    "slow": "Pick up the pace slightly to keep energy up",
+    "fast": "Slow down and pause after key points",
+    "too_short": "Try a 30-60 second answer next time",
+    "default": "Practice pausing for emphasis before your key point",
+}
@@ -0,0 +1,59 @@
+# backend/data/voice_norms.py
+"""
+Reference limits and feedback for the voice-quality measures
+(services/voice_quality.py).
+
+Clinical cut-offs (MDVP/Praat: jitter 1.04 %, shimmer 3.81 %, HNR 20 dB)
+are defined for sustained vowels; connected speech runs noisier, so the
+limits below are loosened to flag only clearly strained recordings.
+"""
+
+# measure -> (direction, limit): "above" flags values over the limit, "below" under it
+STRAIN_LIMITS = {
+    "jitter_local_percent": ("above", 2.0),
+    "shimmer_local_percent": ("above", 8.0),
+    "hnr_db": ("below", 10.0),
+    "spectral_tilt_db_per_octave": ("below", -14.0),
+    "voice_break_percent": ("above", 5.0),
+}
+
+STRAIN_FEEDBACK = {
+    "jitter_local_percent": "Pitch is unsteady from cycle to cycle, a sign of vocal fatigue or tension",
+    "shimmer_local_percent": "Loudness wavers from cycle to cycle; support the voice with steady breath",
+    "hnr_db": "The voice sounds breathy or hoarse; rest it and stay hydrated",
+    "spectral_tilt_db_per_octave": "The voice lacks brightness, which often comes with breathiness or strain",
+    "voice_break_percent": "Voicing breaks off mid-phrase; slow down and avoid pushing at the end of breaths",
+}
+
+# Number of flagged measures -> overall strain level
+STRAIN_LEVELS = ((0, "low"), (1, "moderate"), (3, "high"))
+
+# Vocal dose (services/voice_quality.py voice_dose, tracked over time by
+# services/voice_load.py). Levels are uncalibrated, relative to full scale:
+# voiced frames louder than LOUD_SPEECH_DBFS count as loud; pitch counts as
+# high more than HIGH_PITCH_SEMITONES above the speaker's median in that
+# recording (no absolute limit fits every voice).
+LOUD_SPEECH_DBFS = -12.0
+HIGH_PITCH_SEMITONES = 6.0
+
+# (measure, window in hours, limit). Loosely after occupational voice-use
+# studies: teachers phonate roughly 1.5-2 h over a working day, and an hour
+# of continuous phonation is a common rest point.
+VOICE_LOAD_LIMITS = (
+    ("phonation_seconds", 1, 30 * 60),
+    ("phonation_seconds", 24, 2 * 3600),
+    ("cycle_dose", 24, 1_000_000),
+    ("loud_seconds", 1, 10 * 60),
+    ("loud_seconds", 24, 45 * 60),
+    ("high_pitch_seconds", 24, 30 * 60),
+)
+
+# Share of a limit at which a warning is raised before the limit itself
+VOICE_LOAD_WARNING_FRACTION = 0.8
+
+VOICE_LOAD_FEEDBACK = {
+    "phonation_seconds": "You have been speaking a lot; take a voice rest before practicing more",
+    "cycle_dose": "Your vocal folds have done a day's worth of work; rest your voice until tomorrow",
+    "loud_seconds": "Much of your speaking has been loud; lower your volume and let the microphone do the work",
+    "high_pitch_seconds": "You have spent a long time speaking high in your range; come back to your natural pitch",
+}
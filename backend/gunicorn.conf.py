@@ -0,0 +1,83 @@
+# backend/gunicorn.conf.py
+"""
+Production server: gunicorn master with uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master (preload_app) so the read-only
+speech catalog and coaching tables are shared copy-on-write by every worker.
+Service clients (Gemini, Firestore gRPC) are lazy and only built after fork.
+"""
+import gc
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+
+# Per-worker metric files aggregated by /metrics; must be set before the app
+# (and prometheus_client) is imported by preload_app
+if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+# The master supervises the background job workers, not each app worker
+os.environ["JOB_POOL_SUPERVISED"] = "1"
+
+from config.settings import settings
+
+bind = f"0.0.0.0:{settings.PORT}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+preload_app = True
+
+# Give workers time to drain queued Firestore writes on SIGTERM
+graceful_timeout = int(settings.SHUTDOWN_DRAIN_SECONDS) + 20
+timeout = 120
+keepalive = 5
+
+accesslog = "-" if os.getenv("GUNICORN_ACCESS_LOG") else None
+errorlog = "-"
+
+
+def on_starting(server):
+    # No GC passes while the app is loading, so preloaded objects are not
+    # touched (and their pages not copied) by collections after fork
+    gc.disable()
+
+
+def when_ready(server):
+    from main import preload_shared_assets
+
+    loaded = preload_shared_assets()
+    server.log.info(f"Preloaded shared assets: {loaded}")
+    # Move everything loaded so far into the permanent generation
+    gc.freeze()
+    server.log.info(f"Starting {workers} workers")
+
+    if settings.JOB_WORKERS > 0:
+        # A separate supervisor process: the master reaps every child it has
+        # (waitpid(-1)), which would hide pool workers from multiprocessing
+        server.job_pool = subprocess.Popen(
+            [sys.executable, "-m", "services.job_worker", "--workers", str(settings.JOB_WORKERS)],
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        server.log.info(f"Started {settings.JOB_WORKERS} background job workers (pid {server.job_pool.pid})")
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def on_exit(server):
+    pool = getattr(server, "job_pool", None)
+    if pool is not None:
+        pool.terminate()
+        try:
+            pool.wait(settings.SHUTDOWN_DRAIN_SECONDS + 5)
+        except subprocess.TimeoutExpired:
+            pool.kill()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
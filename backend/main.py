@@ -2,22 +2,73 @@
 import os
 import json
 import time
-from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Form
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Form, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse, JSONResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import Optional
 import uvicorn
+import asyncio
 from datetime import datetime
 
 from config.settings import settings
-from services.gemini_service import gemini_service
-from services.elevenlabs_service import elevenlabs_service
-from services.firebase_service import firebase_service
-from services.comparison_service import comparison_service
-from services.virtual_meeting_service import virtual_meeting_service
-from services.conversation_service import conversation_service
-from services.practice_stt_service import practice_stt_service  # NEW IMPORT
+from config.logging_config import configure_logging
+from data.professional_speeches import get_all_speeches, get_speech_by_id
+from data.coaching_content import CONVERSATION_TOPICS, VIRTUAL_MEETING_TEMPLATES
+from data.coach_prompts import SYSTEM_PROMPTS, CONVERSATION_TURN
+from services.providers import warm_up, readiness
+from services.metrics_service import REQUEST_LATENCY, record_fallback, metrics_payload
+from services.tracing_service import configure_tracing, span, request_span, start_request_timing, finish_request_timing
+from services.gemini_service import GeminiService, get_gemini_service
+from services.elevenlabs_service import ElevenLabsService, get_elevenlabs_service
+from services.firebase_service import FirebaseService, get_firebase_service
+from services.comparison_service import ComparisonService, get_comparison_service
+from services.virtual_meeting_service import VirtualMeetingService, get_virtual_meeting_service
+from services.conversation_service import ConversationService, get_conversation_service
+from services.practice_stt_service import PracticeSTTService, get_practice_stt_service
+from services.session_store import SessionStore, get_session_store
+from services.context_manager import ConversationContextManager, get_context_manager
+from services.analysis_service import AnalysisService, get_analysis_service, parse_duration
+from services.voice_turn_service import VoiceTurnService, get_voice_turn_service
+from services.speculative_tts import SpeculativeTTS, get_speculative_tts, audio_token
+from services.stt_cache import TranscriptCache, get_transcript_cache
+from services.uploads import UploadSizeLimit, read_upload
+from services.chunked_uploads import ChunkedUploadStore, get_chunked_upload_store, OffsetMismatch, UploadTooLarge
+from services.job_queue import JobQueue, get_job_queue, PRIORITIES
+from services.job_worker import JOB_HANDLERS, UPLOAD_KINDS, INTERNAL_KINDS
+from services.recording_archive import RecordingArchive, get_recording_archive, QuotaExceeded
+from services.voice_load import VoiceLoadStore, get_voice_load_store
+from services.audio_pool import get_audio_pool
+
+configure_logging()
+logger = logging.getLogger("main")
+
+# Services are built on first use; listed here for background warm-up and /health
+SERVICE_PROVIDERS = [
+    get_gemini_service,
+    get_elevenlabs_service,
+    get_firebase_service,
+    get_comparison_service,
+    get_virtual_meeting_service,
+    get_conversation_service,
+    get_practice_stt_service,
+    get_session_store,
+    get_context_manager,
+    get_analysis_service,
+    get_voice_turn_service,
+    get_speculative_tts,
+    get_transcript_cache,
+    get_job_queue,
+    get_chunked_upload_store,
+    get_recording_archive,
+    get_voice_load_store,
+    get_audio_pool,
+]
 
 # ---------------------------------------------------------
 # Pydantic Models
@@ -34,7 +85,56 @@ class ConversationRequest(BaseModel):
 # ---------------------------------------------------------
 # FastAPI App
 # ---------------------------------------------------------
-app = FastAPI(title="Vocal Health Companion API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Per worker: span export runs on a background thread
+    configure_tracing()
+    # Warm service clients concurrently in the background so the worker
+    # starts accepting requests (and passing /health) immediately.
+    warm_up_task = None
+    if settings.WARM_UP_SERVICES:
+        warm_up_task = asyncio.create_task(warm_up(SERVICE_PROVIDERS))
+    app.state.warm_up_task = warm_up_task
+    # Single-process runs own the job worker pool; under gunicorn the master does
+    job_pool = None
+    if settings.JOB_WORKERS > 0 and not os.environ.get("JOB_POOL_SUPERVISED"):
+        from services.job_worker import JobWorkerPool
+
+        job_pool = JobWorkerPool()
+        await asyncio.to_thread(job_pool.start)
+    yield
+    if job_pool is not None:
+        await asyncio.to_thread(job_pool.stop)
+    if get_audio_pool.is_ready:
+        await asyncio.to_thread(get_audio_pool().shutdown)
+    # Graceful shutdown: flush queued Firestore writes before the worker exits
+    if get_firebase_service.is_ready:
+        await asyncio.to_thread(get_firebase_service().drain, settings.SHUTDOWN_DRAIN_SECONDS)
+
+def preload_shared_assets() -> dict:
+    """
+    Touch the read-only catalogs and tables so they are loaded in the
+    gunicorn master before fork and shared copy-on-write by all workers.
+    """
+    from data import coaching_content
+    from services.intent_classifier import load_intent_classifier
+    
+    classifier = load_intent_classifier()
+    return {
+        "professional_speeches": len(get_all_speeches()),
+        "conversation_topics": len(coaching_content.CONVERSATION_TOPICS),
+        "meeting_templates": len(coaching_content.MEETING_PRACTICE_TEMPLATES),
+        "professional_tips": len(coaching_content.PROFESSIONAL_TIPS),
+        "platform_tips": len(coaching_content.PLATFORM_TIPS),
+        "coaching_tip_keywords": len(coaching_content.COACHING_TIP_KEYWORDS),
+        "intent_classifier_terms": len(classifier.vocabulary) if classifier else 0
+    }
+
+app = FastAPI(title="Vocal Health Companion API", lifespan=lifespan)
+
+# Oversized multipart uploads are refused before they are parsed and spooled
+# (innermost, so CORS headers and request metrics still apply to the 413)
+app.add_middleware(UploadSizeLimit)
 
 # ---------------------------------------------------------
 # CORS Settings
@@ -58,6 +158,50 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Observe request latency per route template (not per raw path)"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        REQUEST_LATENCY.labels(
+            request.method,
+            route.path if route is not None else "unmatched",
+            str(status)
+        ).observe(time.perf_counter() - start)
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """
+    Root span per request. Clients sending the debug header get a
+    Server-Timing breakdown of the stages traced while handling it.
+    """
+    timing_token = None
+    if request.headers.get(settings.SERVER_TIMING_HEADER):
+        timing_token = start_request_timing()
+    start = time.perf_counter()
+    
+    with request_span(request.method, request.url.path) as current:
+        try:
+            response = await call_next(request)
+        finally:
+            route = request.scope.get("route")
+            if route is not None:
+                current.update_name(f"{request.method} {route.path}")
+                current.set_attribute("http.route", route.path)
+        current.set_attribute("http.status_code", response.status_code)
+    
+    if timing_token is not None:
+        response.headers["Server-Timing"] = finish_request_timing(
+            timing_token, (time.perf_counter() - start) * 1000
+        )
+    return response
+
 @app.options("/{path:path}")
 async def options_handler(path: str):
     """Handle CORS preflight requests"""
@@ -77,11 +221,15 @@ def read_root():
             "debug_gemini": "/debug/gemini",
             "test_elevenlabs": "/test/elevenlabs",
             "analyze": "/api/analyze/{text}",
+            "analyze_batch": "/api/analyze/batch",
+            "analysis_jobs": "/api/analysis-jobs/{job_id}",
             "conversation": "/api/conversation",
             "conversation_start": "/api/conversation/start",
             "conversation_respond": "/api/conversation/respond",
             "conversation_topics": "/api/conversation/topics",
+            "voice_turn": "/api/voice-turn",
             "compare": "/api/compare-with-pro",
+            "compare_prosody": "/api/compare-prosody",
             "professional_speeches": "/api/professional-speeches",
             "speech_to_text": "/api/speech-to-text",
             "speech_to_text_conversation": "/api/speech-to-text-conversation",
@@ -99,14 +247,21 @@ def health_check():
         "status": "healthy",
         "service": "backend",
         "environment": settings.ENVIRONMENT,
-        "project": settings.GOOGLE_CLOUD_PROJECT
+        "project": settings.GOOGLE_CLOUD_PROJECT,
+        "services_ready": readiness(SERVICE_PROVIDERS)
     }
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint"""
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
 # ---------------------------------------------------------
 # Gemini Test Endpoints
 # ---------------------------------------------------------
 @app.get("/test/gemini")
-async def test_gemini():
+async def test_gemini(gemini_service: GeminiService = Depends(get_gemini_service)):
     try:
         result = await gemini_service.simple_test()
         return {
@@ -147,39 +302,174 @@ async def debug_gemini():
 # Analyze Speech Endpoints
 # ---------------------------------------------------------
 @app.get("/api/analyze/{text}")
-async def analyze_text(text: str):
+async def analyze_text(text: str, analysis_service: AnalysisService = Depends(get_analysis_service)):
     if len(text) < 10:
         raise HTTPException(status_code=400, detail="Text too short. Minimum 10 characters.")
 
-    feedback = await gemini_service.analyze_speech(text)
+    with span("analysis.analyze_speech", chars=len(text)):
+        result = await analysis_service.analyze(text)
     return {
         "text": text,
-        "feedback": feedback,
+        "feedback": result["feedback"],
+        "job_id": result["job_id"],
         "analysis_type": "speech_coaching"
     }
 
 @app.post("/api/analyze")
-async def analyze_text_post(data: dict):
+async def analyze_text_post(data: dict, analysis_service: AnalysisService = Depends(get_analysis_service)):
     text = data.get("text", "")
 
     if not text or len(text) < 10:
         raise HTTPException(status_code=400, detail="Text too short. Minimum 10 characters.")
+    try:
+        duration_seconds = parse_duration(data.get("duration_seconds"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    filled_pauses = data.get("filled_pauses")
+    if filled_pauses is not None and (type(filled_pauses) is not int or filled_pauses < 0):
+        raise HTTPException(status_code=400, detail="filled_pauses must be a non-negative integer")
 
-    feedback = await gemini_service.analyze_speech(text)
+    # Optional: recording length enables pace scoring; filled_pauses (the
+    # acoustic count from recording_quality.fillers) raises the filler count
+    # STT missed; narrative=false skips Gemini; session_id gets the finished
+    # narrative saved to that session
+    with span("analysis.analyze_speech", chars=len(text)):
+        result = await analysis_service.analyze(
+            text,
+            duration_seconds=duration_seconds,
+            narrative=data.get("narrative"),
+            session_id=data.get("session_id"),
+            filled_pauses=filled_pauses
+        )
     return {
         "text": text,
-        "feedback": feedback,
+        "feedback": result["feedback"],
+        "job_id": result["job_id"],
         "analysis_type": "speech_coaching"
     }
 
+def _batch_items(entries) -> list:
+    """Normalize batch input: each entry is a transcript string or {"text", "id", "duration_seconds"}"""
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=400, detail="Provide a non-empty list of items")
+    if len(entries) > settings.ANALYSIS_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.ANALYSIS_BATCH_MAX_ITEMS} items per batch")
+    items = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"text": entry}
+        elif not isinstance(entry, dict):
+            entry = {"text": None}
+        items.append(entry)
+    return items
+
+def _ndjson_response(results, background: BackgroundTask = None) -> StreamingResponse:
+    async def lines():
+        async for result in results:
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers={"Cache-Control": "no-cache"},
+                             background=background)
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(data: dict, analysis_service: AnalysisService = Depends(get_analysis_service)):
+    """
+    Analyze many transcripts at once: {"items": [{"text", "id"?, "duration_seconds"?}, ...]}
+    (or "texts": [...]). Streams one NDJSON line per item as it completes, then a summary line.
+    """
+    items = _batch_items(data.get("items", data.get("texts")))
+    return _ndjson_response(analysis_service.analyze_batch(items, narrative=data.get("narrative")))
+
+@app.post("/api/analyze/batch/upload")
+async def analyze_batch_upload(
+    file: UploadFile = File(...),
+    narrative: Optional[bool] = Form(None),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Same as /api/analyze/batch, from a JSON-lines file (one transcript string or item object per line)"""
+    max_bytes = settings.ANALYSIS_BATCH_UPLOAD_MAX_BYTES
+    size = file.size if file.size is not None else await run_in_threadpool(file.file.seek, 0, 2)
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Batch file exceeds the {max_bytes / (1 << 20):.1f} MB limit")
+    try:
+        entries = await run_in_threadpool(_read_batch_lines, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _ndjson_response(analysis_service.analyze_batch(_batch_items(entries), narrative=narrative))
+
+def _read_batch_lines(source) -> list:
+    """Parse a JSON-lines upload line by line from its spooled file, stopping past the batch item limit"""
+    source.seek(0)
+    entries = []
+    for number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line.decode("utf-8", errors="replace")))
+        except json.JSONDecodeError:
+            raise ValueError(f"Line {number} is not valid JSON")
+        if len(entries) > settings.ANALYSIS_BATCH_MAX_ITEMS:
+            # _batch_items reports the limit; no need to parse the rest
+            break
+    return entries
+
+@app.get("/api/analysis-jobs/{job_id}")
+async def get_analysis_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll: seconds to wait for the narrative"),
+    analysis_service: AnalysisService = Depends(get_analysis_service)
+):
+    """Status of an analysis job; feedback includes the AI narrative once status is done"""
+    job = await analysis_service.wait_for_job(job_id, wait) if wait else await analysis_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found or expired")
+    return job
+
+@app.get("/api/analysis-jobs/{job_id}/events")
+async def analysis_job_events(job_id: str, analysis_service: AnalysisService = Depends(get_analysis_service)):
+    """Server-sent events: `status` now, then `done`, `failed` or `timeout`"""
+    job = await analysis_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found or expired")
+
+    async def events():
+        current = job
+        yield f"event: status\ndata: {json.dumps(current)}\n\n"
+        deadline = time.monotonic() + settings.ANALYSIS_JOB_SSE_TIMEOUT_SECONDS
+        while current["status"] == "pending":
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                yield f"event: timeout\ndata: {json.dumps({'job_id': job_id})}\n\n"
+                return
+            current = await analysis_service.wait_for_job(job_id, min(remaining, 15.0))
+            if current is None:
+                return
+            if current["status"] == "pending":
+                # Keep proxies from closing an idle stream
+                yield ": keepalive\n\n"
+        yield f"event: {current['status']}\ndata: {json.dumps(current)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 # ---------------------------------------------------------
 # Conversation Endpoints
 # ---------------------------------------------------------
 
 # Original conversation endpoint
 @app.post("/api/conversation")
-async def conversation_endpoint(data: dict):
-    """Conversational AI endpoint using Gemini for speaking practice"""
+async def conversation_endpoint(
+    data: dict,
+    gemini_service: GeminiService = Depends(get_gemini_service),
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    session_store: SessionStore = Depends(get_session_store),
+    context_manager: ConversationContextManager = Depends(get_context_manager),
+    speculative_tts: SpeculativeTTS = Depends(get_speculative_tts)
+):
+    """
+    Conversational AI endpoint using Gemini for speaking practice.
+    With a `session_id` the history is kept server-side and only `message`
+    needs to be sent; otherwise the client-sent `history` is used.
+    """
     try:
         user_message = data.get("message", "")
         history = data.get("history", [])
@@ -188,68 +478,44 @@ async def conversation_endpoint(data: dict):
         if not user_message:
             raise HTTPException(status_code=400, detail="Message is required")
         
-        # Prepare conversation context
-        conversation_context = ""
-        if history:
-            # Get last 6 messages (3 exchanges) for context
-            recent_history = history[-6:] if len(history) > 6 else history
-            for msg in recent_history:
-                speaker = "User" if msg.get("speaker") == "user" else "Coach"
-                conversation_context += f"{speaker}: {msg.get('text', '')}\n"
-        
-        # Different prompts based on mode
-        if mode == "speaking_practice":
-            system_prompt = """You are Alex, a friendly and encouraging speaking coach. 
-            You help people improve their public speaking, presentation skills, and communication.
-            
-            Your style:
-            - Always positive and supportive
-            - Give specific, actionable feedback
-            - Ask follow-up questions to encourage practice
-            - Use examples and metaphors
-            - Focus on one improvement at a time
-            
-            When analyzing speech:
-            1. First, acknowledge what they did well
-            2. Then suggest one specific improvement
-            3. Ask a question to continue the conversation
-            
-            Keep responses conversational and under 3 sentences."""
-        elif mode == "interview_practice":
-            system_prompt = """You are Alex, an interview coach specializing in job interviews.
-            You help people practice common interview questions and improve their answers.
-            
-            Your approach:
-            - Simulate real interview scenarios
-            - Provide feedback on STAR method responses
-            - Suggest improvements to answer structure
-            - Give tips on confidence and delivery
-            
-            Ask interview questions and provide constructive feedback."""
-        else:
-            system_prompt = """You are Alex, a communication coach helping with various speaking situations."""
+        session = None
+        if data.get("session_id"):
+            session = await run_in_threadpool(session_store.get_or_create, data["session_id"], mode, history)
+            history = session.history
         
-        # Build the full prompt
-        full_prompt = f"""{system_prompt}
-
-        Conversation History:
-        {conversation_context}
-
-        User: {user_message}
-
-        Coach Alex:"""
+        # Prepare conversation context: recent turns within the token budget,
+        # older ones as a rolling summary
+        with span("conversation.build_context", history_length=len(history)):
+            if session is not None:
+                context = context_manager.build_for_session(session, session_store)
+            else:
+                context = context_manager.build_for_history(history)
+            conversation_context = context.render("User", "Coach")
+        
+        # Static system prompt per mode is a registered prefix; only the
+        # turn itself is assembled here
+        prefix = mode if mode in SYSTEM_PROMPTS else "general"
+        turn_prompt = CONVERSATION_TURN.substitute(context=conversation_context, message=user_message)
         
         # Get response from Gemini
         try:
-            response = await gemini_service.model.generate_content_async(full_prompt)
+            response = await gemini_service.generate(turn_prompt, "conversation", prefix=prefix)
             ai_response = response.text.strip()
         except Exception as e:
             # Fallback response if Gemini fails
-            print(f"Gemini conversation error: {e}")
+            logger.warning("Gemini conversation error: %s", e)
+            record_fallback("conversation_endpoint", "upstream_error")
             ai_response = "I appreciate you sharing that! As your speaking coach, I'd love to hear more about your speaking goals. What specific area would you like to improve today?"
         
         # Extract speaking feedback if applicable
-        speaking_feedback = extract_speaking_feedback(ai_response, user_message)
+        with span("conversation.extract_feedback"):
+            speaking_feedback = extract_speaking_feedback(ai_response, user_message)
+        
+        if session is not None:
+            session = await run_in_threadpool(
+                session_store.append_turns, session.session_id, [("user", user_message), ("ai", ai_response)],
+                mode, data.get("history")
+            )
         
         # Save conversation to database if long enough
         if len(user_message) > 5:
@@ -262,33 +528,44 @@ async def conversation_endpoint(data: dict):
                     "timestamp": datetime.now().isoformat(),
                     "feedback_notes": speaking_feedback
                 }
-                firebase_service.save_conversation(conversation_data)
+                with span("firestore.enqueue", collection="conversations"):
+                    firebase_service.save_conversation(conversation_data)
             except Exception as e:
-                print(f"Failed to save conversation: {e}")
+                logger.error("Failed to save conversation: %s", e)
         
         return {
             "text": ai_response,
             "feedback": speaking_feedback,
             "is_coaching": True,
             "mode": mode,
+            "session_id": session.session_id if session is not None else None,
+            # Synthesis is already running; fetch it from /api/text-to-speech/{audio_token}
+            "audio_token": speculative_tts.start(ai_response, data.get("voice_id")),
             "timestamp": datetime.now().isoformat()
         }
         
     except Exception as e:
-        print(f"Conversation endpoint error: {e}")
+        logger.error("Conversation endpoint error: %s", e)
         raise HTTPException(status_code=500, detail=f"Conversation error: {str(e)}")
 
 # New conversation endpoints
 @app.post("/api/conversation/start")
-async def start_conversation():
+async def start_conversation(
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    session_store: SessionStore = Depends(get_session_store)
+):
     """Start a new conversation with the AI coach"""
     try:
         welcome_message = "Hello! I'm Alex, your speaking coach. What would you like to practice today?"
         
+        # Server-side history; later turns only need to send the session_id
+        session = await run_in_threadpool(session_store.create)
+        session = await run_in_threadpool(session_store.append_turns, session.session_id, [("ai", welcome_message)])
+        
         # Create initial conversation record
         conversation_data = {
             "user_id": "demo_user",
-            "session_id": f"session_{int(time.time())}",
+            "session_id": session.session_id,
             "start_time": datetime.now().isoformat(),
             "coach_name": "Alex",
             "welcome_message": welcome_message
@@ -309,7 +586,8 @@ async def start_conversation():
             "timestamp": conversation_data["start_time"]
         }
     except Exception as e:
-        print(f"Start conversation error: {e}")
+        logger.error("Start conversation error: %s", e)
+        record_fallback("conversation_start", "error")
         # Fallback response
         return {
             "message": "Hello! I'm Alex, your speaking coach. Ready to practice your speaking skills?",
@@ -321,11 +599,28 @@ async def start_conversation():
         }
 
 @app.post("/api/conversation/respond")
-async def conversation_respond(data: dict):
-    """Get AI coach response to user message"""
+async def conversation_respond(
+    data: dict,
+    conversation_service: ConversationService = Depends(get_conversation_service),
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    session_store: SessionStore = Depends(get_session_store),
+    context_manager: ConversationContextManager = Depends(get_context_manager),
+    speculative_tts: SpeculativeTTS = Depends(get_speculative_tts)
+):
+    """
+    Get AI coach response to user message.
+    Send `session_id` (from /api/conversation/start) and only the new
+    `message`; the client-resent `history` is still accepted without one.
+    """
     try:
         user_message = data.get("message", "")
         history = data.get("history", [])
+        session = None
+        context = None
+        if data.get("session_id"):
+            session = await run_in_threadpool(session_store.get_or_create, data["session_id"], history=history)
+            history = session.history
+            context = context_manager.build_for_session(session, session_store)
         
         if not user_message or len(user_message) < 3:
             return {
@@ -338,9 +633,11 @@ async def conversation_respond(data: dict):
         
         # Get coaching response from conversation service
         try:
-            response = await conversation_service.get_coaching_response(user_message, history)
+            with span("conversation.coaching_response", history_length=len(history)):
+                response = await conversation_service.get_coaching_response(user_message, history, context)
         except Exception as e:
-            print(f"Conversation service error, using fallback: {e}")
+            logger.error("Conversation service error, using fallback: %s", e)
+            record_fallback("conversation_respond", "service_error")
             # Fallback response
             response = {
                 "text": f"Thanks for sharing that! '{user_message[:50]}...' - Let's practice making your points more impactful. Try saying that again with more emphasis on the key words.",
@@ -349,12 +646,17 @@ async def conversation_respond(data: dict):
                 "requires_response": True
             }
         
+        # Start the coach audio now, while the quick analysis runs
+        response["audio_token"] = speculative_tts.start(response.get("text", ""), data.get("voice_id"))
+        
         # Get quick analysis using conversation service
         try:
-            analysis = await conversation_service.analyze_speaking_pattern(user_message)
+            with span("conversation.pattern_analysis"):
+                analysis = await conversation_service.analyze_speaking_pattern(user_message)
             response["quick_analysis"] = analysis
         except Exception as e:
-            print(f"Analysis error: {e}")
+            logger.error("Analysis error: %s", e)
+            record_fallback("quick_analysis", "error")
             # Fallback analysis
             response["quick_analysis"] = {
                 "confidence_score": 7,
@@ -365,6 +667,7 @@ async def conversation_respond(data: dict):
         
         # Save conversation to history
         conversation_entry = {
+            "session_id": data.get("session_id"),
             "user_message": user_message,
             "ai_response": response.get("text", ""),
             "timestamp": datetime.now().isoformat(),
@@ -372,69 +675,55 @@ async def conversation_respond(data: dict):
         }
         
         try:
-            firebase_service.save_conversation_entry(conversation_entry)
+            with span("firestore.enqueue", collection="conversation_entries"):
+                firebase_service.save_conversation_entry(conversation_entry)
         except:
             pass  # Continue even if save fails
         
+        if session is not None:
+            session = await run_in_threadpool(
+                session_store.append_turns, session.session_id,
+                [("user", user_message), ("ai", response.get("text", ""))], history=data.get("history")
+            )
+            response["session_id"] = session.session_id
+        
         return response
         
     except Exception as e:
-        print(f"Conversation respond error: {e}")
+        logger.error("Conversation respond error: %s", e)
         raise HTTPException(status_code=500, detail=f"Conversation error: {str(e)}")
 
+@app.post("/api/voice-turn")
+async def voice_turn(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = Form(None),
+    voice_id: Optional[str] = Form(None),
+    history: Optional[str] = Form(None),
+    voice_turn_service: VoiceTurnService = Depends(get_voice_turn_service)
+):
+    """
+    One spoken coaching turn in a single request: speech-to-text, coach reply
+    and per-sentence coach audio, streamed back as NDJSON events (see
+    services/voice_turn_service.py). `history` is a JSON list, used without a session.
+    """
+    try:
+        turns = json.loads(history) if history else []
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="history must be a JSON list")
+    audio = await read_upload(file)
+    if not audio.size:
+        raise HTTPException(status_code=400, detail="Audio file is empty")
+
+    # The recording buffer is released once the stream has been sent
+    return _ndjson_response(
+        voice_turn_service.run(audio.data, audio.digest, session_id=session_id, history=turns, voice_id=voice_id),
+        background=BackgroundTask(audio.close)
+    )
+
 @app.get("/api/conversation/topics")
 async def get_conversation_topics():
     """Get suggested conversation topics"""
-    topics = [
-        {
-            "id": "introduction", 
-            "name": "Introduce yourself", 
-            "prompt": "Tell me about yourself in 30 seconds",
-            "difficulty": "beginner",
-            "estimated_time": "1-2 minutes",
-            "skills": ["clarity", "conciseness", "confidence"]
-        },
-        {
-            "id": "elevator_pitch", 
-            "name": "Practice elevator pitch", 
-            "prompt": "Pitch your favorite project or idea in 60 seconds",
-            "difficulty": "intermediate",
-            "estimated_time": "2-3 minutes",
-            "skills": ["persuasion", "storytelling", "enthusiasm"]
-        },
-        {
-            "id": "difficult_topic", 
-            "name": "Explain a complex topic", 
-            "prompt": "Explain AI or another complex topic to a 10-year-old",
-            "difficulty": "advanced",
-            "estimated_time": "3-4 minutes",
-            "skills": ["simplification", "analogies", "clarity"]
-        },
-        {
-            "id": "storytelling", 
-            "name": "Tell a personal story", 
-            "prompt": "Share a story about a challenge you overcame",
-            "difficulty": "intermediate",
-            "estimated_time": "2-3 minutes",
-            "skills": ["emotion", "pacing", "engagement"]
-        },
-        {
-            "id": "opinion_piece", 
-            "name": "Share an opinion", 
-            "prompt": "Share your opinion on a topic you're passionate about",
-            "difficulty": "intermediate",
-            "estimated_time": "2-3 minutes",
-            "skills": ["conviction", "structure", "persuasion"]
-        },
-        {
-            "id": "job_interview", 
-            "name": "Job interview practice", 
-            "prompt": "Why should we hire you for your dream job?",
-            "difficulty": "advanced",
-            "estimated_time": "3-4 minutes",
-            "skills": ["professionalism", "confidence", "specificity"]
-        }
-    ]
+    topics = CONVERSATION_TOPICS
     return {
         "topics": topics,
         "total": len(topics),
@@ -476,21 +765,27 @@ def extract_speaking_feedback(ai_response: str, user_message: str) -> str:
 # ElevenLabs Endpoints
 # ---------------------------------------------------------
 @app.get("/test/elevenlabs")
-async def test_elevenlabs():
+async def test_elevenlabs(elevenlabs_service: ElevenLabsService = Depends(get_elevenlabs_service)):
     """Test ElevenLabs API connection"""
     result = elevenlabs_service.test_connection()
     return result
 
 @app.post("/api/text-to-speech")
-async def text_to_speech(data: dict):
-    """Convert text to speech audio"""
+async def text_to_speech(
+    data: dict,
+    elevenlabs_service: ElevenLabsService = Depends(get_elevenlabs_service),
+    speculative_tts: SpeculativeTTS = Depends(get_speculative_tts)
+):
+    """Convert text to speech audio (instant when the coach reply was already synthesized)"""
     text = data.get("text", "")
-    voice_id = data.get("voice_id", "EXAVITQu4vr4xnSDxMaL")
+    voice_id = data.get("voice_id", settings.TTS_VOICE_ID)
     
-    if not text:
+    if not text and not data.get("audio_token"):
         raise HTTPException(status_code=400, detail="Text is required")
     
-    audio_bytes = elevenlabs_service.text_to_speech(text, voice_id)
+    audio_bytes = await speculative_tts.get(data.get("audio_token") or audio_token(text, voice_id))
+    if audio_bytes is None and text:
+        audio_bytes = await run_in_threadpool(elevenlabs_service.text_to_speech, text, voice_id)
     
     if audio_bytes:
         return Response(
@@ -501,45 +796,100 @@ async def text_to_speech(data: dict):
     else:
         raise HTTPException(status_code=500, detail="Failed to generate speech")
 
+@app.get("/api/text-to-speech/{token}")
+async def speculative_speech(token: str, speculative_tts: SpeculativeTTS = Depends(get_speculative_tts)):
+    """Coach reply audio by the audio_token returned with the reply (usable as an <audio> src)"""
+    audio_bytes = await speculative_tts.get(token)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Audio not available; request it with the text instead")
+    return Response(content=audio_bytes, media_type="audio/mpeg", headers={"Cache-Control": "private, max-age=60"})
+
+async def _attach_voice_quality(firebase_service: FirebaseService, voice_load: VoiceLoadStore, session_id: str,
+                                user_id: str, digest: str, quality: dict) -> list:
+    """Save voice quality on the session and add the recording's dose to the user's voice load; returns load alerts"""
+    voice = (quality or {}).get("voice_quality") or {}
+    if voice.get("available"):
+        await run_in_threadpool(firebase_service.save_voice_quality, session_id, voice)
+    if not voice.get("dose"):
+        return []
+    await run_in_threadpool(voice_load.record, user_id, voice["dose"], f"{session_id}:{digest}")
+    return await run_in_threadpool(voice_load.alerts, user_id)
+
 # NEW ENDPOINT: Speech-to-text for PRACTICE sessions
 @app.post("/api/speech-to-text")
-async def speech_to_text(file: UploadFile = File(...)):
-    """Convert speech audio to text FOR PRACTICE SESSIONS"""
+async def speech_to_text(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = Form(None),
+    user_id: str = Form("demo_user"),
+    practice_stt_service: PracticeSTTService = Depends(get_practice_stt_service),
+    transcript_cache: TranscriptCache = Depends(get_transcript_cache),
+    archive: RecordingArchive = Depends(get_recording_archive),
+    job_queue: JobQueue = Depends(get_job_queue),
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    voice_load: VoiceLoadStore = Depends(get_voice_load_store)
+):
+    """
+    Convert speech audio to text FOR PRACTICE SESSIONS. With a session_id the
+    recording is archived for playback, the transcript becomes the session's
+    text, its voice-quality measures are attached to the session and its
+    vocal dose counts toward the user's voice load.
+    """
+    # Size/duration-capped, spooled upload (mapped, not copied) plus its content hash
+    audio = await read_upload(file)
     try:
-        # Read audio file
-        audio_bytes = await file.read()
+        recording = None
+        load_alerts = []
+        if session_id:
+            recording = await _archive_recording(archive, job_queue, audio, session_id, user_id, file.filename)
         
-        # Use PRACTICE-specific STT (not conversation mock)
-        text = practice_stt_service.transcribe_practice_speech(audio_bytes)
+        # Use PRACTICE-specific STT (not conversation mock); a re-uploaded
+        # recording reuses its transcript
+        text = await transcript_cache.get_or_compute(
+            audio.digest, "practice", practice_stt_service.transcribe_practice_speech, audio.data
+        )
         
-        # Get recording quality info
-        quality = practice_stt_service.analyze_recording_quality(audio_bytes)
+        # Get recording quality info, including voice-quality (strain) measures
+        quality = await transcript_cache.get_or_compute(
+            audio.digest, "quality", practice_stt_service.analyze_recording_quality, audio
+        )
+        if session_id:
+            await run_in_threadpool(firebase_service.save_transcript, session_id, text)
+            load_alerts = await _attach_voice_quality(
+                firebase_service, voice_load, session_id, user_id, audio.digest, quality
+            )
         
         return {
             "text": text,
             "is_mock": True,  # Still mock, but better mock
             "recording_quality": quality,
+            "recording": recording,
+            "voice_load_alerts": load_alerts,
             "note": "Practice STT service - returns realistic practice speeches"
         }
     except Exception as e:
-        print(f"❌ Practice STT error: {e}")
+        logger.error("Practice STT error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
+    finally:
+        audio.close()
 
 # ORIGINAL ENDPOINT: Speech-to-text for conversation mode (kept for compatibility)
 @app.post("/api/speech-to-text-conversation")
 async def speech_to_text_conversation(
     file: UploadFile = File(...), 
-    mode: str = Form("conversation")
+    mode: str = Form("conversation"),
+    elevenlabs_service: ElevenLabsService = Depends(get_elevenlabs_service),
+    transcript_cache: TranscriptCache = Depends(get_transcript_cache)
 ):
     """Convert speech audio to text for CONVERSATION mode"""
+    audio = await read_upload(file)
     try:
-        audio_bytes = await file.read()
-        
         # Log file information
-        print(f"🎤 Conversation STT: {file.filename}, size: {len(audio_bytes)} bytes, mode: {mode}")
+        logger.debug("Conversation STT", extra={"upload_name": file.filename, "bytes": audio.size, "mode": mode})
         
         # Use original ElevenLabs service for conversation
-        text = elevenlabs_service.speech_to_text(audio_bytes, mode)
+        text = await transcript_cache.get_or_compute(
+            audio.digest, f"conversation:{mode}", elevenlabs_service.speech_to_text, audio.data, mode
+        )
         
         return {
             "text": text,
@@ -548,11 +898,13 @@ async def speech_to_text_conversation(
             "note": f"Using mock STT in {mode} mode for conversation"
         }
     except Exception as e:
-        print(f"❌ Conversation STT error: {e}")
+        logger.error("Conversation STT error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing audio: {str(e)}")
+    finally:
+        audio.close()
 
 @app.get("/api/voices")
-async def get_voices():
+async def get_voices(elevenlabs_service: ElevenLabsService = Depends(get_elevenlabs_service)):
     """Get available ElevenLabs voices"""
     voices = elevenlabs_service.get_available_voices()
     return {
@@ -584,7 +936,7 @@ async def get_latest_analysis():
 # Database Endpoints
 # ---------------------------------------------------------
 @app.post("/api/sessions")
-async def create_session(session_data: dict):
+async def create_session(session_data: dict, firebase_service: FirebaseService = Depends(get_firebase_service)):
     """Create a new practice session"""
     try:
         session_data["user_id"] = "demo_user"
@@ -602,7 +954,7 @@ async def create_session(session_data: dict):
         raise HTTPException(status_code=500, detail=f"Error creating session: {str(e)}")
 
 @app.get("/api/sessions/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, firebase_service: FirebaseService = Depends(get_firebase_service)):
     """Get a specific session"""
     session = firebase_service.get_session(session_id)
     
@@ -612,7 +964,7 @@ async def get_session(session_id: str):
         raise HTTPException(status_code=404, detail="Session not found")
 
 @app.get("/api/sessions")
-async def get_recent_sessions(limit: int = 5):
+async def get_recent_sessions(limit: int = 5, firebase_service: FirebaseService = Depends(get_firebase_service)):
     """Get recent sessions"""
     sessions = firebase_service.get_user_sessions("demo_user", limit)
     return {
@@ -621,7 +973,11 @@ async def get_recent_sessions(limit: int = 5):
     }
 
 @app.post("/api/sessions/{session_id}/analysis")
-async def save_session_analysis(session_id: str, analysis_data: dict):
+async def save_session_analysis(
+    session_id: str,
+    analysis_data: dict,
+    firebase_service: FirebaseService = Depends(get_firebase_service)
+):
     """Save analysis for a session"""
     success = firebase_service.save_analysis(session_id, analysis_data)
     
@@ -631,11 +987,47 @@ async def save_session_analysis(session_id: str, analysis_data: dict):
         raise HTTPException(status_code=500, detail="Failed to save analysis")
 
 @app.get("/api/statistics")
-async def get_statistics():
-    """Get user statistics"""
+async def get_statistics(
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    voice_load: VoiceLoadStore = Depends(get_voice_load_store)
+):
+    """Get user statistics, with the last 24 h of voice load from the hourly rollups"""
     stats = firebase_service.get_statistics("demo_user")
+    stats["voice_load_24h"] = await run_in_threadpool(voice_load.window, "demo_user", 24)
     return stats
 
+# ---------------------------------------------------------
+# Voice Load Endpoints
+# ---------------------------------------------------------
+@app.get("/api/voice-load")
+async def get_voice_load(
+    user_id: str = "demo_user",
+    hours: int = Query(24, ge=1, le=24 * 90),
+    voice_load: VoiceLoadStore = Depends(get_voice_load_store)
+):
+    """Voice load over the last `hours` (phonation time, cycle dose, loud and high-pitch time) and alerts"""
+    totals = await run_in_threadpool(voice_load.window, user_id, hours)
+    alerts = await run_in_threadpool(voice_load.alerts, user_id)
+    return {"user_id": user_id, "totals": totals, "alerts": alerts}
+
+@app.get("/api/voice-load/history")
+async def get_voice_load_history(
+    user_id: str = "demo_user",
+    days: int = Query(7, ge=1, le=90),
+    bucket: str = Query("day", pattern="^(hour|day)$"),
+    voice_load: VoiceLoadStore = Depends(get_voice_load_store)
+):
+    """Hourly or daily (UTC) voice-load totals for charts; buckets without speaking are omitted"""
+    series = await run_in_threadpool(
+        voice_load.series, user_id, days * 24, 24 if bucket == "day" else 1
+    )
+    return {"user_id": user_id, "bucket": bucket, "days": days, "series": series}
+
+@app.get("/api/voice-load/alerts")
+async def get_voice_load_alerts(user_id: str = "demo_user", voice_load: VoiceLoadStore = Depends(get_voice_load_store)):
+    alerts = await run_in_threadpool(voice_load.alerts, user_id)
+    return {"user_id": user_id, "alerts": alerts, "count": len(alerts)}
+
 # ---------------------------------------------------------
 # API Test Endpoint
 # ---------------------------------------------------------
@@ -650,7 +1042,6 @@ async def api_test():
 async def get_professional_speeches():
     """Get list of professional speeches for comparison"""
     try:
-        from data.professional_speeches import get_all_speeches
         speeches = get_all_speeches()
         
         simplified_speeches = []
@@ -684,10 +1075,8 @@ async def compare_with_professional(data: dict):
         
         # Get professional speech
         if professional_id:
-            from data.professional_speeches import get_speech_by_id
             professional = get_speech_by_id(professional_id)
         else:
-            from data.professional_speeches import get_all_speeches
             professional = get_all_speeches()[0] if get_all_speeches() else None
         
         if not professional:
@@ -775,11 +1164,12 @@ async def compare_with_professional(data: dict):
 @app.get("/api/compare/{speech_id}")
 async def compare_with_specific_professional(
     speech_id: str, 
-    text: str = Query(..., min_length=10, description="Your speech text to compare")
+    text: str = Query(..., min_length=10, description="Your speech text to compare"),
+    comparison_service: ComparisonService = Depends(get_comparison_service)
 ):
     """Compare with specific professional speech"""
     try:
-        print(f"🔍 Compare with {speech_id}: {text[:50]}...")
+        logger.debug("Compare with %s: %.50s", speech_id, text)
         
         comparison_result = await comparison_service.compare_with_professional(
             text, 
@@ -791,6 +1181,361 @@ async def compare_with_specific_professional(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Comparison error: {str(e)}")
     
+@app.post("/api/compare-prosody")
+async def compare_prosody(
+    file: UploadFile = File(...),
+    reference: UploadFile = File(...),
+    background: bool = Query(False, description="Queue as a background job and return its id"),
+    comparison_service: ComparisonService = Depends(get_comparison_service),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """Align the user's pitch/energy contours with a reference recording (PCM WAV)"""
+    with await read_upload(file) as user_audio, await read_upload(reference) as reference_audio:
+        if background:
+            job = await run_in_threadpool(
+                _enqueue_upload, job_queue, "prosody_comparison", [user_audio.data, reference_audio.data]
+            )
+            return JSONResponse(job, status_code=202)
+        
+        try:
+            # DTW alignment is CPU-bound; keep it off the event loop
+            return await run_in_threadpool(
+                comparison_service.compare_prosody, user_audio.data, reference_audio.data,
+                user_audio.digest, reference_audio.digest
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prosody comparison error: {str(e)}")
+    
+# ---------------------------------------------------------
+# Background Job Endpoints
+# ---------------------------------------------------------
+def _enqueue_upload(job_queue: JobQueue, kind: str, uploads: list, priority: str = "interactive",
+                    idempotency_key: str = None) -> dict:
+    paths = [job_queue.spool(data, ".audio") for data in uploads]
+    job = job_queue.enqueue(kind, {"files": paths}, priority, idempotency_key)
+    if job.get("duplicate"):
+        # Replayed idempotency key: the original job has its own copies
+        job_queue.discard_files(paths)
+    return job
+
+@app.post("/api/jobs", status_code=202)
+async def enqueue_job(
+    data: dict,
+    idempotency_key: Optional[str] = Header(None),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a text job: {"kind": "comparison" | "speech_report", "payload": {...},
+    "priority": "interactive" | "batch"}. Retrying with the same
+    Idempotency-Key header returns the original job.
+    """
+    kind = data.get("kind")
+    if kind not in JOB_HANDLERS or kind in UPLOAD_KINDS or kind in INTERNAL_KINDS:
+        text_kinds = sorted(set(JOB_HANDLERS) - set(UPLOAD_KINDS) - INTERNAL_KINDS)
+        raise HTTPException(status_code=400, detail=f"Unknown job kind; use one of {text_kinds} (audio jobs: /api/jobs/upload)")
+    if data.get("priority", "interactive") not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown priority; use one of {sorted(PRIORITIES)}")
+    payload = data.get("payload") or {}
+    if len(payload.get("text", "")) < 10:
+        raise HTTPException(status_code=400, detail="Text too short. Minimum 10 characters.")
+    
+    return await run_in_threadpool(
+        job_queue.enqueue, kind, payload, data.get("priority", "interactive"),
+        idempotency_key or data.get("idempotency_key")
+    )
+
+@app.post("/api/jobs/upload", status_code=202)
+async def enqueue_upload_job(
+    kind: str = Form(...),
+    file: UploadFile = File(...),
+    reference: Optional[UploadFile] = File(None),
+    priority: str = Form("interactive"),
+    idempotency_key: Optional[str] = Header(None),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """Queue an audio job: kind=transcription (file) or prosody_comparison (file + reference)"""
+    fields = UPLOAD_KINDS.get(kind)
+    if fields is None:
+        raise HTTPException(status_code=400, detail=f"Unknown audio job kind; use one of {sorted(UPLOAD_KINDS)}")
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"Unknown priority; use one of {sorted(PRIORITIES)}")
+    if "reference" in fields and reference is None:
+        raise HTTPException(status_code=400, detail=f"{kind} needs a reference recording")
+    
+    uploads = [await read_upload(file)]
+    if "reference" in fields:
+        uploads.append(await read_upload(reference))
+    try:
+        return await run_in_threadpool(
+            _enqueue_upload, job_queue, kind, [upload.data for upload in uploads], priority, idempotency_key
+        )
+    finally:
+        for upload in uploads:
+            upload.close()
+
+@app.get("/api/jobs")
+async def list_jobs(
+    status: Optional[str] = Query(None, description="queued | running | done | failed"),
+    limit: int = Query(50, ge=1, le=500),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """Recent jobs plus queue depth by status"""
+    jobs = await run_in_threadpool(job_queue.list, status, limit)
+    counts = await run_in_threadpool(job_queue.counts)
+    return {"jobs": jobs, "counts": counts}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    job = await run_in_threadpool(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str, job_queue: JobQueue = Depends(get_job_queue)):
+    """The job's result once done (202 while queued or running)"""
+    job = await run_in_threadpool(job_queue.get, job_id, True)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in ("queued", "running"):
+        return JSONResponse(job, status_code=202)
+    return job
+
+# ---------------------------------------------------------
+# Resumable Upload Endpoints
+# ---------------------------------------------------------
+def _upload_error(e: Exception) -> HTTPException:
+    if isinstance(e, KeyError):
+        return HTTPException(status_code=404, detail="Upload not found")
+    if isinstance(e, OffsetMismatch):
+        # The client resumes from Upload-Offset
+        return HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)})
+    if isinstance(e, UploadTooLarge):
+        return HTTPException(status_code=413, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+async def _prefetch_upload_transcript(
+    upload_id: str,
+    store: ChunkedUploadStore,
+    practice_stt_service: PracticeSTTService,
+    transcript_cache: TranscriptCache
+):
+    """Transcribe a fully received upload right away so finalize finds the result cached"""
+    try:
+        digest = await run_in_threadpool(store.digest, upload_id)
+        if digest is None:
+            return
+        with await run_in_threadpool(store.open, upload_id, digest) as audio:
+            await transcript_cache.get_or_compute(
+                digest, "practice", practice_stt_service.transcribe_practice_speech, audio.data
+            )
+            await transcript_cache.get_or_compute(
+                digest, "quality", practice_stt_service.analyze_recording_quality, audio
+            )
+    except Exception as e:
+        logger.warning("Upload transcript prefetch failed: %s", e)
+
+@app.post("/api/uploads", status_code=201)
+async def create_upload(data: dict, store: ChunkedUploadStore = Depends(get_chunked_upload_store)):
+    """
+    Start a resumable upload: {"filename", "size"} (size in bytes, optional
+    but lets the upload complete itself). PUT the bytes in chunks of at
+    most chunk_size to /api/uploads/{upload_id}?offset=N, then finalize.
+    """
+    size = data.get("size")
+    if size is not None and (not isinstance(size, int) or size <= 0):
+        raise HTTPException(status_code=400, detail="size must be a positive number of bytes")
+    try:
+        return await run_in_threadpool(store.create, data.get("filename"), size)
+    except ValueError as e:
+        raise _upload_error(e)
+
+@app.put("/api/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk; must equal the upload's current offset"),
+    store: ChunkedUploadStore = Depends(get_chunked_upload_store),
+    practice_stt_service: PracticeSTTService = Depends(get_practice_stt_service),
+    transcript_cache: TranscriptCache = Depends(get_transcript_cache)
+):
+    """Append one chunk (raw request body); it is analyzed before the response is sent"""
+    too_large = HTTPException(status_code=413, detail=f"Chunks are limited to {store.chunk_size} bytes")
+    if int(request.headers.get("content-length") or 0) > store.chunk_size:
+        raise too_large
+    # At most one chunk is held in memory
+    chunk = bytearray()
+    async for piece in request.stream():
+        chunk += piece
+        if len(chunk) > store.chunk_size:
+            raise too_large
+    if not chunk:
+        raise HTTPException(status_code=400, detail="Empty chunk")
+    
+    try:
+        upload = await run_in_threadpool(store.append, upload_id, offset, chunk)
+    except (KeyError, ValueError) as e:
+        raise _upload_error(e)
+    
+    background = None
+    if upload["status"] == "complete":
+        background = BackgroundTask(
+            _prefetch_upload_transcript, upload_id, store, practice_stt_service, transcript_cache
+        )
+    return JSONResponse(upload, headers={"Upload-Offset": str(upload["offset"])}, background=background)
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload(upload_id: str, store: ChunkedUploadStore = Depends(get_chunked_upload_store)):
+    """Upload progress (resume from "offset") and the analysis so far"""
+    upload = await run_in_threadpool(store.get, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return JSONResponse(upload, headers={"Upload-Offset": str(upload["offset"])})
+
+@app.post("/api/uploads/{upload_id}/finalize")
+async def finalize_upload(
+    upload_id: str,
+    session_id: Optional[str] = Query(None, description="Archive the recording under this session"),
+    user_id: str = Query("demo_user"),
+    store: ChunkedUploadStore = Depends(get_chunked_upload_store),
+    practice_stt_service: PracticeSTTService = Depends(get_practice_stt_service),
+    transcript_cache: TranscriptCache = Depends(get_transcript_cache),
+    archive: RecordingArchive = Depends(get_recording_archive),
+    job_queue: JobQueue = Depends(get_job_queue),
+    firebase_service: FirebaseService = Depends(get_firebase_service),
+    voice_load: VoiceLoadStore = Depends(get_voice_load_store)
+):
+    """Transcript, recording quality and the full incremental analysis (speech segments, levels)"""
+    try:
+        upload = await run_in_threadpool(store.finish, upload_id)
+    except (KeyError, ValueError) as e:
+        raise _upload_error(e)
+    
+    with await run_in_threadpool(store.open, upload_id, upload["digest"]) as audio:
+        # Usually already cached by the prefetch after the last chunk
+        text = await transcript_cache.get_or_compute(
+            audio.digest, "practice", practice_stt_service.transcribe_practice_speech, audio.data
+        )
+        quality = await transcript_cache.get_or_compute(
+            audio.digest, "quality", practice_stt_service.analyze_recording_quality, audio
+        )
+        recording = None
+        load_alerts = []
+        if session_id:
+            recording = await _archive_recording(
+                archive, job_queue, audio, session_id, user_id, upload.get("filename")
+            )
+            await run_in_threadpool(firebase_service.save_transcript, session_id, text)
+            load_alerts = await _attach_voice_quality(
+                firebase_service, voice_load, session_id, user_id, audio.digest, quality
+            )
+    
+    return {
+        "text": text,
+        "is_mock": True,
+        "recording_quality": quality,
+        "recording": recording,
+        "voice_load_alerts": load_alerts,
+        "analysis": store.analysis(upload),
+        "upload": {"upload_id": upload_id, "size": upload["offset"], "digest": upload["digest"]}
+    }
+
+@app.delete("/api/uploads/{upload_id}")
+async def delete_upload(upload_id: str, store: ChunkedUploadStore = Depends(get_chunked_upload_store)):
+    if not await run_in_threadpool(store.delete, upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return {"deleted": True, "upload_id": upload_id}
+
+# ---------------------------------------------------------
+# Recording Archive Endpoints
+# ---------------------------------------------------------
+def _queue_archive(archive: RecordingArchive, job_queue: JobQueue, data, digest: str, session_id: str,
+                   user_id: str, filename: str = None) -> dict:
+    recording = archive.register(session_id, user_id, digest, len(data), filename)
+    if recording["status"] == "pending":
+        # One job per recording; a retried upload finds the job already queued
+        path = job_queue.spool(data, ".audio")
+        job = job_queue.enqueue("archive", {"files": [path], "recording_id": recording["id"]}, "batch",
+                                f"archive:{recording['id']}")
+        if job.get("duplicate"):
+            job_queue.discard_files([path])
+    return recording
+
+async def _archive_recording(archive: RecordingArchive, job_queue: JobQueue, audio, session_id: str,
+                             user_id: str, filename: str = None) -> Optional[dict]:
+    """Archive an uploaded recording alongside another request; failures only cost the archive copy"""
+    try:
+        return await run_in_threadpool(
+            _queue_archive, archive, job_queue, audio.data, audio.digest, session_id, user_id, filename
+        )
+    except QuotaExceeded as e:
+        logger.info("Recording not archived for %s: %s", user_id, e)
+    except Exception as e:
+        logger.error("Failed to archive recording: %s", e)
+        record_fallback("archive", "error")
+    return None
+
+@app.post("/api/archive/recordings", status_code=202)
+async def archive_recording(
+    file: UploadFile = File(...),
+    session_id: str = Form(...),
+    user_id: str = Form("demo_user"),
+    archive: RecordingArchive = Depends(get_recording_archive),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """Keep a recording for playback; it is transcoded in the background ("pending" until then)"""
+    with await read_upload(file) as audio:
+        try:
+            return await run_in_threadpool(
+                _queue_archive, archive, job_queue, audio.data, audio.digest, session_id, user_id, file.filename
+            )
+        except QuotaExceeded as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+@app.get("/api/archive/recordings")
+async def list_archived_recordings(
+    session_id: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    archive: RecordingArchive = Depends(get_recording_archive)
+):
+    recordings = await run_in_threadpool(archive.list, session_id, user_id, limit)
+    return {"recordings": recordings, "total": len(recordings)}
+
+@app.get("/api/archive/usage")
+async def get_archive_usage(
+    user_id: str = Query("demo_user"),
+    archive: RecordingArchive = Depends(get_recording_archive)
+):
+    return await run_in_threadpool(archive.usage, user_id)
+
+@app.get("/api/archive/recordings/{recording_id}")
+async def get_archived_recording(recording_id: str, archive: RecordingArchive = Depends(get_recording_archive)):
+    recording = await run_in_threadpool(archive.get, recording_id)
+    if recording is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return recording
+
+@app.get("/api/archive/recordings/{recording_id}/audio")
+async def get_archived_audio(recording_id: str, archive: RecordingArchive = Depends(get_recording_archive)):
+    """The stored audio (usable as an <audio> src); Range requests are answered with 206 for scrubbing"""
+    stored = await run_in_threadpool(archive.audio, recording_id)
+    if stored is None:
+        recording = await run_in_threadpool(archive.get, recording_id)
+        if recording is None:
+            raise HTTPException(status_code=404, detail="Recording not found")
+        raise HTTPException(status_code=409, detail=f"Recording is {recording['status']}")
+    path, media_type = stored
+    return FileResponse(path, media_type=media_type, headers={"Cache-Control": "private, max-age=86400"})
+
+@app.delete("/api/archive/recordings/{recording_id}")
+async def delete_archived_recording(recording_id: str, archive: RecordingArchive = Depends(get_recording_archive)):
+    if not await run_in_threadpool(archive.delete, recording_id):
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return {"deleted": True, "recording_id": recording_id}
+
 # ---------------------------------------------------------
 # Virtual Meeting Coaching Endpoints
 # ---------------------------------------------------------
@@ -799,41 +1544,8 @@ async def compare_with_specific_professional(
 async def get_virtual_meeting_templates():
     """Get virtual meeting practice templates"""
     return {
-        "templates": [
-            {
-                "id": "team_meeting",
-                "title": "Weekly Team Sync",
-                "platform": "Zoom",
-                "duration": "30 min",
-                "participants": 8,
-                "scenario": "Presenting project updates to your team"
-            },
-            {
-                "id": "client_presentation",
-                "title": "Client Presentation",
-                "platform": "Microsoft Teams",
-                "duration": "45 min",
-                "participants": 15,
-                "scenario": "Pitching new ideas to clients"
-            },
-            {
-                "id": "all_hands",
-                "title": "All-Hands Meeting",
-                "platform": "Google Meet",
-                "duration": "60 min",
-                "participants": 50,
-                "scenario": "Company-wide announcements"
-            },
-            {
-                "id": "job_interview",
-                "title": "Virtual Job Interview",
-                "platform": "Zoom",
-                "duration": "45 min",
-                "participants": 3,
-                "scenario": "Technical interview with panel"
-            }
-        ],
-        "total": 4
+        "templates": VIRTUAL_MEETING_TEMPLATES,
+        "total": len(VIRTUAL_MEETING_TEMPLATES)
     }
 
 @app.post("/api/analyze-meeting-performance")
@@ -853,7 +1565,7 @@ async def analyze_meeting_performance(data: dict):
     }
 
 @app.post("/api/schedule-practice-session")
-async def schedule_practice_session(data: dict):
+async def schedule_practice_session(data: dict, virtual_meeting_service: VirtualMeetingService = Depends(get_virtual_meeting_service)):
     """Schedule a virtual practice session"""
     try:
         meeting_type = data.get("meeting_type")
@@ -870,7 +1582,7 @@ async def schedule_practice_session(data: dict):
         raise HTTPException(status_code=500, detail=f"Scheduling error: {str(e)}")
 
 @app.get("/api/meeting-tips/{platform}")
-async def get_meeting_tips(platform: str):
+async def get_meeting_tips(platform: str, virtual_meeting_service: VirtualMeetingService = Depends(get_virtual_meeting_service)):
     """Get platform-specific virtual meeting tips"""
     tips = virtual_meeting_service._get_platform_tips(platform)
     return {
@@ -885,11 +1597,14 @@ async def get_meeting_tips(platform: str):
 if __name__ == "__main__":
     try:
         settings.validate()
-        print("✅ All environment variables are set")
+        logger.info("Environment variables checked")
     except ValueError as e:
-        print(f"⚠️ Warning: {e}")
-        print("Continuing with mock data...")
+        logger.warning("%s - continuing with mock data", e)
 
+    if settings.ENVIRONMENT == "production":
+        # Multi-worker mode: gunicorn preloads the app, then forks uvicorn workers
+        os.execvp("gunicorn", ["gunicorn", "-c", "gunicorn.conf.py", "main:app"])
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
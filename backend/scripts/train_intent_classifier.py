@@ -0,0 +1,85 @@
+# backend/scripts/train_intent_classifier.py
+"""
+Train the local intent classifier used by ConversationService.
+
+Run from backend/:
+    python -m scripts.train_intent_classifier [--logged turns.jsonl ...] [--output PATH]
+
+Training data is data/intent_examples.py (examples and keyword lists) plus
+any logged turns given as JSONL lines {"text": ..., "intent": ...}.
+Prints 5-fold cross-validated
+accuracy and how many turns would be answered locally at the configured
+confidence threshold, then fits on everything and writes the model.
+"""
+import argparse
+import json
+import random
+
+import numpy as np
+
+from config.settings import settings
+from data.intent_examples import INTENT_EXAMPLES, INTENT_KEYWORDS, INTENTS
+from services.intent_classifier import IntentClassifier
+
+
+def load_logged_turns(paths: list) -> list:
+    examples = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("intent") in INTENTS:
+                        examples.append((record["text"], record["intent"]))
+    return examples
+
+
+def keyword_examples() -> list:
+    return [(keyword, intent) for intent, keywords in INTENT_KEYWORDS.items() for keyword in keywords]
+
+
+def cross_validate(examples: list, threshold: float, folds: int = 5, seed: int = 0) -> dict:
+    shuffled = examples[:]
+    random.Random(seed).shuffle(shuffled)
+    correct = local = misrouted = 0
+    for fold in range(folds):
+        test = shuffled[fold::folds]
+        train = [example for i, example in enumerate(shuffled) if i % folds != fold] + keyword_examples()
+        model = IntentClassifier.train([t for t, _ in train], [label for _, label in train])
+        for text, label in test:
+            intent, confidence = model.predict(text)
+            correct += intent == label
+            if intent != "other" and confidence >= threshold:
+                local += 1
+                misrouted += intent != label
+    total = len(examples)
+    return {
+        "accuracy": correct / total,
+        "answered_locally": local / total,
+        "misrouted": misrouted / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logged", nargs="*", default=[], help="JSONL files of labelled logged turns")
+    parser.add_argument("--output", default=settings.INTENT_MODEL_PATH)
+    parser.add_argument("--threshold", type=float, default=settings.INTENT_CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    examples = list(INTENT_EXAMPLES) + load_logged_turns(args.logged)
+    counts = {intent: sum(1 for _, label in examples if label == intent) for intent in INTENTS}
+    print(f"{len(examples)} examples: {counts}")
+
+    scores = cross_validate(examples, args.threshold)
+    print(f"5-fold CV: accuracy {scores['accuracy']:.1%}, answered locally {scores['answered_locally']:.1%}, "
+          f"misrouted {scores['misrouted']:.1%} (threshold {args.threshold})")
+
+    training = examples + keyword_examples()
+    model = IntentClassifier.train([t for t, _ in training], [label for _, label in training])
+    model.save(args.output)
+    print(f"Wrote {args.output} ({len(model.vocabulary)} terms, {np.asarray(model.weights).nbytes // 1024} KiB weights)")
+
+
+if __name__ == "__main__":
+    main()
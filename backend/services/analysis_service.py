@@ -0,0 +1,372 @@
+# backend/services/analysis_service.py
+"""
+Two-phase speech analysis: instant local metrics, deferred AI narrative.
+
+Every analysis is scored locally (services/speech_scorer.py), which takes
+well under a millisecond and never depends on Gemini. The Gemini coaching
+narrative is generated in the background as an analysis job: clients get
+a job id with the local metrics and pick the narrative up by polling
+/api/analysis-jobs/{id}, over SSE, or from the session document, which the
+job updates via save_analysis when it finishes.
+
+Narratives are also cached by transcript, so re-analysing the same text
+(and concurrent requests for it) share one Gemini call.
+
+Batches (analyze_batch) dedupe identical transcripts, score them all in one
+vectorized pass, and request narratives several transcripts per Gemini call
+with a bounded number of calls in flight. Results are yielded as each one
+finishes; anything Gemini fails on keeps its local scores.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+from config.settings import settings
+from services.cache import TTLCache
+from services.firebase_service import get_firebase_service
+from services.gemini_service import get_gemini_service
+from services.metrics_service import record_cache
+from services.providers import LazyService
+from services.speech_scorer import get_speech_scorer
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_jobs (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analysis_jobs_expiry ON analysis_jobs (expires_at);
+"""
+
+
+def transcript_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_duration(value):
+    """A recording length in seconds (None if absent); ValueError unless a positive number."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("duration_seconds must be a positive number")
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError("duration_seconds must be a positive number")
+    if not math.isfinite(seconds) or seconds <= 0:
+        raise ValueError("duration_seconds must be a positive number")
+    return seconds
+
+
+class AnalysisJobStore:
+    """
+    Job records in Redis when REDIS_URL is set, else in a table of the job
+    queue's SQLite database; either way every worker can serve any job's
+    polls and event stream.
+    """
+
+    def __init__(self, path: str = None):
+        self.ttl = settings.ANALYSIS_JOB_TTL_SECONDS
+        self.path = path or settings.JOB_QUEUE_PATH
+        self._redis = None
+
+        if settings.REDIS_URL:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+                self._redis.ping()
+            except Exception as e:
+                logger.error("Redis unavailable (%s); using SQLite analysis jobs", e)
+                self._redis = None
+
+        if self._redis is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, job_id: str):
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._key(job_id))
+                return json.loads(raw) if raw else None
+            except Exception as e:
+                logger.error("Error loading analysis job %s: %s", job_id, e)
+                return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM analysis_jobs WHERE id = ? AND expires_at >= ?", (job_id, time.time())
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def save(self, job: dict):
+        if self._redis is not None:
+            try:
+                self._redis.set(self._key(job["job_id"]), json.dumps(job), ex=self.ttl)
+            except Exception as e:
+                logger.error("Error saving analysis job %s: %s", job["job_id"], e)
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM analysis_jobs WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT INTO analysis_jobs (id, data, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+                (job["job_id"], json.dumps(job), now + self.ttl)
+            )
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"analysis_job:{job_id}"
+
+
+class AnalysisService:
+    def __init__(self):
+        self.scorer = get_speech_scorer()
+        self.jobs = AnalysisJobStore()
+        self._narratives = TTLCache(maxsize=settings.ANALYSIS_NARRATIVE_CACHE_SIZE, ttl=settings.ANALYSIS_NARRATIVE_TTL_SECONDS)
+        self._inflight = {}  # transcript key -> narrative task
+        self._job_tasks = {}  # job id -> completion task (this process only)
+
+    async def analyze(self, text: str, duration_seconds: float = None, narrative: bool = None,
+                      session_id: str = None, wait: float = None, filled_pauses: int = None) -> dict:
+        """
+        Score `text` locally and start the narrative job. Returns
+        {"feedback", "job_id"}; feedback["narrative_status"] is
+        attached | pending | unavailable | skipped, and job_id is set
+        whenever a narrative job was started. `filled_pauses` is the
+        recording's acoustic filler count, when known.
+        """
+        feedback = self.scorer.score(text, duration_seconds, filled_pauses)
+        if narrative is None:
+            narrative = settings.ANALYSIS_NARRATIVE
+        if not narrative:
+            feedback["narrative_status"] = "skipped"
+            return {"feedback": feedback, "job_id": None}
+
+        key = transcript_key(text)
+        cached = self._narratives.get(key)
+        record_cache("analysis_narratives", cached is not None)
+        if cached is not None:
+            self._attach(feedback, cached)
+            return {"feedback": feedback, "job_id": None}
+        if not get_gemini_service().model:
+            feedback["narrative_status"] = "unavailable"
+            return {"feedback": feedback, "job_id": None}
+
+        feedback["narrative_status"] = "pending"
+        job = {
+            "job_id": f"analysis_{uuid.uuid4().hex}",
+            "status": "pending",
+            "session_id": session_id,
+            "feedback": feedback,
+            "created_at": time.time(),
+            "completed_at": None
+        }
+        await asyncio.to_thread(self.jobs.save, job)
+        task = asyncio.create_task(self._complete_job(job["job_id"], self._narrative_task(key, text, feedback), text))
+        self._job_tasks[job["job_id"]] = task
+        task.add_done_callback(lambda _: self._job_tasks.pop(job["job_id"], None))
+
+        if wait is None:
+            wait = settings.ANALYSIS_NARRATIVE_WAIT_SECONDS
+        if wait > 0:
+            finished = await self.wait_for_job(job["job_id"], wait)
+            if finished and finished["status"] != "pending":
+                feedback = finished["feedback"]
+        return {"feedback": feedback, "job_id": job["job_id"]}
+
+    async def analyze_batch(self, items: list, narrative: bool = None, concurrency: int = None):
+        """
+        Analyze `items` ({"text", "id"?, "duration_seconds"?}), yielding
+        {"index", "id", "feedback"} per item in completion order (or
+        {"index", "id", "error"} for unusable items), then a summary
+        {"done": True, ...}. Duplicates carry "duplicate_of": the index of
+        the first identical item.
+        """
+        start = time.perf_counter()
+        if narrative is None:
+            narrative = settings.ANALYSIS_NARRATIVE
+        groups = {}  # (transcript key, duration) -> input indexes
+        for index, item in enumerate(items):
+            text = item.get("text")
+            if not isinstance(text, str) or len(text) < 10:
+                yield {"index": index, "id": item.get("id"), "error": "Text too short. Minimum 10 characters."}
+                continue
+            try:
+                item["duration_seconds"] = parse_duration(item.get("duration_seconds"))
+            except ValueError as e:
+                yield {"index": index, "id": item.get("id"), "error": str(e)}
+                continue
+            groups.setdefault((transcript_key(text), item["duration_seconds"]), []).append(index)
+
+        firsts = [indexes[0] for indexes in groups.values()]
+        durations = [items[i]["duration_seconds"] for i in firsts]
+        scores = self.scorer.score_batch(
+            [items[i]["text"] for i in firsts],
+            durations if any(d is not None for d in durations) else None
+        )
+        stats = {"narrated": 0, "local_only": 0}
+
+        def results(group: list, feedback: dict):
+            stats["narrated" if feedback["narrative_status"] == "attached" else "local_only"] += len(group)
+            for index in group:
+                result = {"index": index, "id": items[index].get("id"), "feedback": feedback}
+                if index != group[0]:
+                    result["duplicate_of"] = group[0]
+                yield result
+
+        # Per group: the same transcript at another duration scores (and is narrated) differently
+        pending = {}  # (transcript key, duration) -> (group, feedback)
+        prompts = {}  # (transcript key, duration) -> (text, scores) sent to Gemini
+        model_ready = narrative and get_gemini_service().model is not None
+        for ((key, duration), group), feedback in zip(groups.items(), scores):
+            if not narrative:
+                feedback["narrative_status"] = "skipped"
+            else:
+                cached = self._narratives.get(key)
+                record_cache("analysis_narratives", cached is not None)
+                if cached is not None:
+                    self._attach(feedback, cached)
+                elif model_ready:
+                    pending[key, duration] = (group, feedback)
+                    prompts[key, duration] = (items[group[0]]["text"], dict(feedback))
+                    continue
+                else:
+                    feedback["narrative_status"] = "unavailable"
+            for result in results(group, feedback):
+                yield result
+
+        # Several transcripts per Gemini call, a bounded number of calls at once
+        keys = list(pending)
+        size = settings.ANALYSIS_BATCH_UPSTREAM_SIZE
+        limit = asyncio.Semaphore(concurrency or settings.ANALYSIS_BATCH_CONCURRENCY)
+
+        async def narrate_chunk(chunk: list):
+            async with limit:
+                try:
+                    narratives = await get_gemini_service().narrate_speeches([prompts[group_key] for group_key in chunk])
+                except Exception as e:
+                    logger.error("Batch narrative call failed: %s", e)
+                    narratives = [None] * len(chunk)
+            return chunk, narratives
+
+        tasks = [asyncio.create_task(narrate_chunk(keys[i:i + size])) for i in range(0, len(keys), size)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                chunk, narratives = await next_done
+                for group_key, narrative_result in zip(chunk, narratives):
+                    group, feedback = pending[group_key]
+                    if narrative_result:
+                        self._narratives.set(group_key[0], narrative_result)
+                        self._attach(feedback, narrative_result)
+                    else:
+                        # Partial failure: this item keeps its local scores
+                        feedback["narrative_status"] = "unavailable"
+                    for result in results(group, feedback):
+                        yield result
+        finally:
+            # Client went away mid-stream: stop the remaining upstream calls
+            for task in tasks:
+                task.cancel()
+
+        yield {
+            "done": True,
+            "items": len(items),
+            "unique": len(groups),
+            "upstream_calls": len(tasks),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            **stats
+        }
+
+    async def get_job(self, job_id: str):
+        return await asyncio.to_thread(self.jobs.get, job_id)
+
+    async def wait_for_job(self, job_id: str, timeout: float):
+        """Return the job once it is no longer pending, or as it stands after `timeout` seconds."""
+        task = self._job_tasks.get(job_id)
+        if task is not None:
+            try:
+                # shield: a timed-out waiter must not cancel the job
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return await self.get_job(job_id)
+
+        # Started by another worker: poll the shared store
+        deadline = time.monotonic() + timeout
+        while True:
+            job = await self.get_job(job_id)
+            if job is None or job["status"] != "pending" or time.monotonic() >= deadline:
+                return job
+            await asyncio.sleep(min(settings.ANALYSIS_JOB_POLL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+    def _narrative_task(self, key: str, text: str, scores: dict) -> asyncio.Task:
+        """One Gemini call per transcript, shared by concurrent jobs."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._narrate(key, text, dict(scores)))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _narrate(self, key: str, text: str, scores: dict):
+        narrative = await get_gemini_service().narrate_speech(text, scores)
+        if narrative:
+            self._narratives.set(key, narrative)
+        return narrative
+
+    async def _complete_job(self, job_id: str, narrative_task: asyncio.Task, text: str):
+        try:
+            narrative = await asyncio.shield(narrative_task)
+        except Exception as e:
+            logger.error("Analysis narrative failed for %s: %s", job_id, e)
+            narrative = None
+
+        job = await self.get_job(job_id)
+        if job is None:
+            return
+        if narrative:
+            self._attach(job["feedback"], narrative)
+            job["status"] = "done"
+        else:
+            job["feedback"]["narrative_status"] = "unavailable"
+            job["status"] = "failed"
+        job["completed_at"] = time.time()
+        await asyncio.to_thread(self.jobs.save, job)
+
+        if narrative and job.get("session_id"):
+            await asyncio.to_thread(get_firebase_service().save_analysis, job["session_id"], {
+                "text": text,
+                "feedback": job["feedback"],
+                "analysis_type": "speech_coaching"
+            })
+
+    @staticmethod
+    def _attach(feedback: dict, narrative: dict):
+        feedback.update(narrative)
+        feedback["is_real_ai"] = True
+        feedback["narrative_status"] = "attached"
+
+
+# Lazily-built singleton instance
+get_analysis_service = LazyService("analysis_service", AnalysisService)
@@ -0,0 +1,81 @@
+# backend/services/audio_features.py
+import numpy as np
+
+# Frames are processed in blocks so the FFT working set stays small
+# even for long recordings.
+FRAME_BLOCK = 512
+
+
+def frame_signal(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """Return a read-only (n_frames, frame_length) strided view over the samples."""
+    samples = np.ascontiguousarray(samples)
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    n_frames = 1 + (len(samples) - frame_length) // hop_length
+    return np.lib.stride_tricks.as_strided(
+        samples,
+        shape=(n_frames, frame_length),
+        strides=(samples.strides[0] * hop_length, samples.strides[0]),
+        writeable=False
+    )
+
+
+def frame_energy_db(frames: np.ndarray) -> np.ndarray:
+    """RMS energy per frame in dBFS."""
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+
+def pitch_track(samples: np.ndarray, sample_rate: int, hop_length: int,
+                frame_length: int = None, fmin: float = 70.0, fmax: float = 400.0,
+                voicing_threshold: float = 0.45, silence_db: float = -45.0) -> tuple:
+    """
+    Autocorrelation pitch tracker.
+    Returns (f0_hz, voiced_mask, periodicity, energy_db) per frame; f0 is NaN
+    where the frame is unvoiced.
+    """
+    if frame_length is None:
+        # At least two periods of the lowest pitch
+        frame_length = int(2.5 * sample_rate / fmin)
+    frames = frame_signal(samples, frame_length, hop_length)
+    n_frames = frames.shape[0]
+
+    min_lag = max(1, int(sample_rate / fmax))
+    max_lag = min(frame_length - 1, int(np.ceil(sample_rate / fmin)))
+    # Linear (not circular) correlation only needs frame_length + max_lag points
+    n_fft = 1 << int(np.ceil(np.log2(frame_length + max_lag + 1)))
+    window = np.hanning(frame_length)
+    # Autocorrelation of the window itself, used to unbias the frame estimate
+    window_acf = np.fft.irfft(np.abs(np.fft.rfft(window, n_fft)) ** 2, n_fft)[:max_lag + 2]
+    window_acf = window_acf / window_acf[0]
+
+    f0 = np.full(n_frames, np.nan)
+    periodicity = np.zeros(n_frames)
+    energy_db = frame_energy_db(frames)
+    lags = np.arange(min_lag, max_lag + 1)
+
+    for start in range(0, n_frames, FRAME_BLOCK):
+        block = frames[start:start + FRAME_BLOCK]
+        block = (block - block.mean(axis=1, keepdims=True)) * window
+        spectrum = np.fft.rfft(block, n_fft, axis=1)
+        acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n_fft, axis=1)[:, :max_lag + 2]
+        acf = acf / np.maximum(acf[:, :1], 1e-12) / np.maximum(window_acf, 1e-6)
+
+        search = acf[:, min_lag:max_lag + 1]
+        best = np.argmax(search, axis=1)
+        peak = search[np.arange(len(best)), best]
+
+        # Parabolic interpolation around the peak for sub-sample lag precision
+        lag = lags[best].astype(np.float64)
+        left = acf[np.arange(len(best)), lags[best] - 1]
+        right = acf[np.arange(len(best)), lags[best] + 1]
+        denom = left - 2 * peak + right
+        offset = np.where(np.abs(denom) > 1e-9, 0.5 * (left - right) / denom, 0.0)
+        lag = lag + np.clip(offset, -0.5, 0.5)
+
+        periodicity[start:start + len(best)] = np.clip(peak, 0.0, 1.0)
+        f0[start:start + len(best)] = sample_rate / lag
+
+    voiced = (periodicity >= voicing_threshold) & (energy_db > silence_db)
+    f0[~voiced] = np.nan
+    return f0, voiced, periodicity, energy_db
@@ -0,0 +1,148 @@
+# backend/services/audio_io.py
+import io
+import struct
+import subprocess
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+
+
+_PCM, _FLOAT, _EXTENSIBLE = 1, 3, 0xFFFE
+
+
+@dataclass
+class WavInfo:
+    channels: int
+    sample_width: int    # bytes per sample
+    sample_rate: int
+    data_offset: int     # byte offset of the sample data
+    data_bytes: int
+    is_float: bool
+
+    @property
+    def duration(self) -> float:
+        return self.data_bytes / (self.sample_rate * self.channels * self.sample_width)
+
+
+def wav_info(audio) -> WavInfo:
+    """
+    Parse the RIFF/WAVE header of `audio` (any bytes-like object) without
+    copying the sample data. Raises ValueError for non-WAV input.
+    """
+    view = memoryview(audio).cast("B")
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise ValueError("Unsupported audio format (expected PCM WAV)")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from("<I", view, offset + 4)[0]
+        body = offset + 8
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            fmt = struct.unpack_from("<HHIIHH", view, body)
+            if fmt[0] == _EXTENSIBLE and chunk_size >= 40:
+                # The real format is the first two bytes of the subformat GUID
+                fmt = (struct.unpack_from("<H", view, body + 24)[0],) + fmt[1:]
+        elif chunk_id == b"data":
+            if fmt is None:
+                break
+            format_tag, channels, sample_rate, _, _, bits = fmt
+            if format_tag not in (_PCM, _FLOAT) or not channels or not sample_rate or bits % 8:
+                raise ValueError("Unsupported audio format (expected PCM WAV)")
+            # Streamed WAVs may leave the size unset or too large; trust the buffer
+            return WavInfo(
+                channels=channels,
+                sample_width=bits // 8,
+                sample_rate=sample_rate,
+                data_offset=body,
+                data_bytes=min(chunk_size, len(view) - body),
+                is_float=format_tag == _FLOAT
+            )
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("Unsupported audio format (expected PCM WAV)")
+
+
+def decode_wav(audio_bytes) -> tuple:
+    """
+    Decode PCM WAV (bytes, memoryview or mmap) into mono float32 samples in
+    [-1, 1]. Returns (samples, sample_rate). Raises ValueError for non-WAV input.
+
+    Samples are read in place with np.frombuffer; the only copy made is the
+    mono float32 result.
+    """
+    info = wav_info(audio_bytes)
+    data = memoryview(audio_bytes).cast("B")[info.data_offset:info.data_offset + info.data_bytes]
+    return decode_pcm(data, info), info.sample_rate
+
+
+def decode_audio(audio, ffmpeg: str = "ffmpeg", sample_rate: int = 16000, timeout: float = None) -> tuple:
+    """
+    Decode a recording in any container/codec into mono float32 samples.
+    PCM WAV is read directly (decode_wav, native rate); anything else
+    (browser MediaRecorder webm/Opus, mp4/AAC, ...) is piped through
+    `ffmpeg` and comes back at `sample_rate`. Returns (samples, sample_rate).
+    Raises ValueError if the audio cannot be decoded and FileNotFoundError
+    if ffmpeg is not installed.
+    """
+    try:
+        return decode_wav(audio)
+    except ValueError:
+        pass
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-nostdin", "-v", "error", "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(sample_rate),
+             "-f", "f32le", "pipe:1"],
+            input=audio, capture_output=True, check=True, timeout=timeout
+        )
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", "replace").strip().splitlines()
+        raise ValueError(f"Could not decode recording: {message[-1] if message else e}")
+    except subprocess.TimeoutExpired:
+        raise ValueError("Could not decode recording: ffmpeg timed out")
+    if len(result.stdout) < 4:
+        raise ValueError("Could not decode recording: no audio stream")
+    return np.frombuffer(result.stdout, dtype="<f4", count=len(result.stdout) // 4), sample_rate
+
+
+def decode_pcm(pcm, info: WavInfo) -> np.ndarray:
+    """Mono float32 samples from raw PCM frames laid out as `info` describes (partial frames are dropped)."""
+    channels, width = info.channels, info.sample_width
+    count = len(pcm) // (channels * width) * channels
+
+    if width == 3:
+        raw = np.frombuffer(pcm, dtype=np.uint8, count=count * 3).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32)
+                | (raw[:, 1].astype(np.int32) << 8)
+                | (raw[:, 2].astype(np.int32) << 16))
+        samples = np.where(ints & 0x800000, ints - 0x1000000, ints)
+    else:
+        dtypes = {(1, False): np.uint8, (2, False): "<i2", (4, False): "<i4", (4, True): "<f4"}
+        dtype = dtypes.get((width, info.is_float))
+        if dtype is None:
+            raise ValueError(f"Unsupported sample width: {width} bytes")
+        samples = np.frombuffer(pcm, dtype=dtype, count=count)
+
+    # Downmix straight from the PCM view so no multichannel float copy is made
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+    else:
+        samples = samples.astype(np.float32)
+    if not info.is_float:
+        if width == 1:
+            samples -= 128.0
+        samples /= float(1 << (8 * width - 1))
+    return samples
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    """Encode mono float samples in [-1, 1] as 16-bit PCM WAV bytes."""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,135 @@
+# backend/services/audio_pool.py
+"""
+Process pool for CPU-bound recording analysis (pre-processing, voice
+quality, filler detection), so a long recording never holds the GIL of the
+API worker that received it.
+
+Each API worker owns AUDIO_POOL_WORKERS processes, spawned (not forked,
+like the job workers) on first use. Callers block in a worker thread
+(TranscriptCache runs its computations in one) while the analysis runs in
+the pool; functions and arguments must be picklable. With
+AUDIO_POOL_WORKERS=0, or inside a process that is itself a pool or job
+worker, work runs in the calling thread instead.
+
+Recordings are not pickled (run_audio): a file-backed upload (chunked
+upload, job spool) goes over as its path and is memory-mapped again in the
+pool process; an anonymous spooled upload is copied once into shared
+memory; only small in-memory uploads are sent as bytes.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+from config.settings import settings
+from services.metrics_service import record_fallback
+from services.providers import LazyService
+from services.uploads import IN_MEMORY_BYTES, map_file
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    from config.logging_config import configure_logging
+
+    configure_logging()
+
+
+def _call_on_file(fn, path: str, *args):
+    """fn(buffer, *args) on a recording file, memory-mapped in this (pool) process."""
+    with map_file(path, digest="") as audio:
+        return fn(audio.data, *args)
+
+
+def _call_on_shared(fn, name: str, size: int, *args):
+    """fn(buffer, *args) on a recording the caller put in shared memory (and unlinks)."""
+    block = shared_memory.SharedMemory(name=name)
+    data = block.buf[:size]
+    try:
+        return fn(data, *args)
+    finally:
+        try:
+            data.release()
+            block.close()
+        except BufferError:
+            # An array still views the block; it is unmapped once that is freed
+            pass
+
+
+class AudioProcessPool:
+    def __init__(self, workers: int = None):
+        workers = settings.AUDIO_POOL_WORKERS if workers is None else workers
+        # No pools inside pools: job and pool workers run their analysis inline
+        self.workers = 0 if multiprocessing.parent_process() is not None else workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            return self._executor
+
+    def submit(self, fn, *args) -> Future:
+        if not self.workers:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        return self._pool().submit(fn, *args)
+
+    def run(self, fn, *args):
+        """fn(*args) in a pool process; a crashed pool is rebuilt once, then the work runs inline."""
+        if not self.workers:
+            return fn(*args)
+        for attempt in range(2):
+            executor = self._pool()
+            try:
+                return executor.submit(fn, *args).result()
+            except BrokenProcessPool:
+                logger.error("Audio process pool broke (attempt %d); rebuilding", attempt + 1)
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                executor.shutdown(wait=False)
+        record_fallback("audio_pool", "broken")
+        return fn(*args)
+
+    def run_audio(self, fn, audio, *args):
+        """
+        fn(buffer, *args) for a recording (SpooledAudio or bytes-like) in a
+        pool process, without pickling its bytes (see the module docstring).
+        """
+        data = getattr(audio, "data", audio)
+        if not self.workers:
+            return fn(data, *args)
+        path = getattr(audio, "path", None)
+        if path:
+            return self.run(_call_on_file, fn, path, *args)
+        if len(data) <= IN_MEMORY_BYTES:
+            return self.run(fn, bytes(data), *args)
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        try:
+            block.buf[:len(data)] = data
+            return self.run(_call_on_shared, fn, block.name, len(data), *args)
+        finally:
+            block.close()
+            block.unlink()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Lazily-built singleton instance
+get_audio_pool = LazyService("audio_pool", AudioProcessPool)
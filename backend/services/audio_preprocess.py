@@ -0,0 +1,246 @@
+# backend/services/audio_preprocess.py
+"""
+Pre-processing for recorded speech, run before STT and analysis
+(services/practice_stt_service.py):
+
+1. Decoding (services.audio_io.decode_audio: WAV directly, browser
+   webm/mp4 through ffmpeg) and resampling to PREPROCESS_SAMPLE_RATE
+   (16 kHz) mono with a polyphase filter (scipy.signal.resample_poly);
+   the decoders already downmix.
+2. Spectral gating noise reduction (SpectralGate): STFT with a sqrt-Hann
+   window at 50 % overlap, a per-bin noise profile tracked from the
+   quietest frames, and a gain of 1 on bins more than PREPROCESS_GATE_DB
+   over the noise and -PREPROCESS_NOISE_REDUCTION_DB elsewhere, widened
+   over frequency and released slowly over time so speech edges are kept
+   and the residual noise does not "sparkle".
+   Works on streaming blocks (state carries across process() calls) with
+   a fixed latency of one hop; all frames of a block are done at once.
+3. Loudness normalization of speech to PREPROCESS_TARGET_DBFS, measured as
+   in ITU-R BS.1770 (400 ms blocks, -70 dBFS absolute and -10 dB relative
+   gates; no K-weighting, speech has little low end), with the gain capped
+   so peaks stay under -1 dBFS.
+
+A minute of 44.1 kHz audio takes about 0.15 s on one core
+(benchmarks/bench_preprocess.py).
+"""
+from math import gcd
+
+import numpy as np
+from scipy import ndimage, signal
+
+from config.settings import settings
+from services.audio_features import frame_energy_db, frame_signal
+from services.audio_io import decode_audio
+from services.providers import LazyService
+from services.tracing_service import span
+
+FRAME = 512    # 32 ms at 16 kHz
+HOP = FRAME // 2
+# Noise profile: this percentile of frame power per bin, over blocks of at
+# least NOISE_MIN_FRAMES frames; it follows drops at once and rises by
+# NOISE_RISE of the difference per block
+NOISE_PERCENTILE = 10
+NOISE_MIN_FRAMES = 16
+NOISE_RISE = 0.1
+# Noise power per bin is exponentially distributed: its mean is the
+# percentile divided by -ln(1 - p)
+NOISE_BIAS = -np.log(1 - NOISE_PERCENTILE / 100)
+# ... and its percentile-to-median ratio about 0.15; bins whose ratio is
+# above this hold a steady tone instead
+TONAL_RATIO = 0.5
+# Mask smoothing: width in bins (about 90 Hz at 16 kHz) and release time constant in frames
+SMOOTH_BINS = 3
+SMOOTH_FRAMES = 2.0
+BLOCK_SECONDS = 1.0
+# Bins below this are always attenuated: no voice there, only rumble, hum and DC
+LOW_CUT_HZ = 60.0
+# Loudness measurement (BS.1770 gating) and normalization limits
+LOUDNESS_BLOCK_SECONDS = 0.4
+ABSOLUTE_GATE_DBFS = -70.0
+RELATIVE_GATE_DB = -10.0
+MAX_GAIN_DB = 30.0
+PEAK_CEILING_DBFS = -1.0
+NOISE_FLOOR_PERCENTILE = 10
+
+# Periodic Hann, square-rooted: analysis x synthesis windows sum to 1 at 50 % overlap
+_WINDOW = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * np.arange(FRAME) / FRAME)).astype(np.float32)
+
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """Polyphase resampling (anti-aliased) between integer rates."""
+    if sample_rate == target_rate:
+        return samples
+    factor = gcd(int(sample_rate), int(target_rate))
+    return signal.resample_poly(samples, target_rate // factor, sample_rate // factor).astype(np.float32)
+
+
+class SpectralGate:
+    """Streaming spectral-gating noise reducer; feed blocks to process(), then call flush()."""
+
+    def __init__(self, sample_rate: int = 16000, reduction_db: float = None, threshold_db: float = None):
+        reduction_db = settings.PREPROCESS_NOISE_REDUCTION_DB if reduction_db is None else reduction_db
+        threshold_db = settings.PREPROCESS_GATE_DB if threshold_db is None else threshold_db
+        self.floor = 10 ** (-reduction_db / 20)
+        self.threshold = 10 ** (threshold_db / 10)
+        self.noise = None
+        self._low_bins = int(np.ceil(LOW_CUT_HZ * FRAME / sample_rate))
+        # Leading zeros align the first frame; output lags input by HOP samples
+        self._pending = np.zeros(FRAME - HOP, dtype=np.float32)
+        self._overlap = np.zeros(HOP, dtype=np.float32)
+        self._decay = np.exp(-1.0 / SMOOTH_FRAMES)
+        self._mask_state = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Denoised samples for everything that is complete so far (a multiple of HOP)."""
+        buffer = np.concatenate((self._pending, np.asarray(block, dtype=np.float32)))
+        if len(buffer) < FRAME:
+            self._pending = buffer
+            return np.zeros(0, dtype=np.float32)
+        frames = frame_signal(buffer, FRAME, HOP)
+        count = len(frames)
+        self._pending = buffer[count * HOP:]
+
+        spectra = np.fft.rfft(frames * _WINDOW, axis=1)
+        power = spectra.real ** 2 + spectra.imag ** 2
+        self._track_noise(power)
+        spectra *= self._gain(power)
+        shaped = np.fft.irfft(spectra, FRAME, axis=1).astype(np.float32) * _WINDOW
+
+        # Overlap-add: first halves and second halves of consecutive frames line up at HOP offsets
+        out = np.zeros((count + 1) * HOP, dtype=np.float32)
+        out[:count * HOP] += shaped[:, :HOP].ravel()
+        out[HOP:] += shaped[:, HOP:].ravel()
+        out[:HOP] += self._overlap
+        self._overlap = out[count * HOP:]
+        return out[:count * HOP]
+
+    def flush(self) -> np.ndarray:
+        """Push out the samples still held back; the gate can then be discarded."""
+        return self.process(np.zeros(FRAME, dtype=np.float32))
+
+    def _track_noise(self, power: np.ndarray):
+        if self.noise is not None and len(power) < NOISE_MIN_FRAMES:
+            return
+        low, median = np.percentile(power, [NOISE_PERCENTILE, 50], axis=0)
+        estimate = low / NOISE_BIAS
+        # Steady bins (a sustained vowel's harmonics) are not noise; take
+        # their noise from the fluctuating bins around them instead
+        tonal = low > TONAL_RATIO * median
+        if tonal.any() and (~tonal).sum() >= 2:
+            bins = np.arange(len(estimate))
+            estimate[tonal] = np.interp(bins[tonal], bins[~tonal], estimate[~tonal])
+        if self.noise is None:
+            self.noise = estimate
+        else:
+            self.noise = np.where(estimate < self.noise, estimate, self.noise + NOISE_RISE * (estimate - self.noise))
+
+    def _gain(self, power: np.ndarray) -> np.ndarray:
+        # Gate on the SNR averaged over neighbouring bins: single noise bins
+        # fluctuate too much to gate on
+        snr = ndimage.uniform_filter1d(power / (self.noise + 1e-12), SMOOTH_BINS, axis=1, mode="nearest")
+        mask = (snr > self.threshold).astype(np.float32)
+        # Widen over frequency to cover each kept peak's window leakage (a
+        # mean filter would halve isolated harmonics)
+        mask = ndimage.maximum_filter1d(mask, SMOOTH_BINS, axis=1, mode="nearest")
+        mask[:, :self._low_bins] = 0.0
+        # Instant attack, one-pole release over frames (state carried across blocks)
+        if self._mask_state is None:
+            self._mask_state = mask[:1] * self._decay
+        released, self._mask_state = signal.lfilter([1 - self._decay], [1, -self._decay], mask, axis=0,
+                                                    zi=self._mask_state)
+        return self.floor + (1 - self.floor) * np.maximum(mask, released)
+
+
+def denoise(samples: np.ndarray, sample_rate: int, reduction_db: float = None, threshold_db: float = None) -> np.ndarray:
+    """Spectral gating over a whole recording, streamed through SpectralGate in BLOCK_SECONDS blocks."""
+    gate = SpectralGate(sample_rate, reduction_db, threshold_db)
+    block = int(sample_rate * BLOCK_SECONDS)
+    out = [gate.process(samples[start:start + block]) for start in range(0, len(samples), block)]
+    out.append(gate.flush())
+    return np.concatenate(out)[HOP:HOP + len(samples)]
+
+
+def loudness_dbfs(samples: np.ndarray, sample_rate: int):
+    """Gated speech loudness (BS.1770 gating, unweighted) in dBFS; None for silence."""
+    size = int(sample_rate * LOUDNESS_BLOCK_SECONDS)
+    if len(samples) < size:
+        size = len(samples)
+    if not size:
+        return None
+    step = max(1, size // 4)
+    cumulative = np.concatenate(([0.0], np.cumsum(np.square(samples, dtype=np.float64))))
+    starts = np.arange(0, len(samples) - size + 1, step)
+    power = (cumulative[starts + size] - cumulative[starts]) / size
+    power = power[power > 10 ** (ABSOLUTE_GATE_DBFS / 10)]
+    if not len(power):
+        return None
+    power = power[power > power.mean() * 10 ** (RELATIVE_GATE_DB / 10)]
+    return float(10 * np.log10(power.mean()))
+
+
+def normalize(samples: np.ndarray, sample_rate: int, target_dbfs: float = None) -> tuple:
+    """(samples scaled so speech sits at target_dbfs, gain applied in dB)."""
+    target = settings.PREPROCESS_TARGET_DBFS if target_dbfs is None else target_dbfs
+    level = loudness_dbfs(samples, sample_rate)
+    if level is None:
+        return samples, 0.0
+    peak = float(np.abs(samples).max())
+    gain_db = min(target - level, MAX_GAIN_DB, PEAK_CEILING_DBFS - 20 * np.log10(max(peak, 1e-9)))
+    gain_db = max(gain_db, -MAX_GAIN_DB)
+    return (samples * np.float32(10 ** (gain_db / 20))).astype(np.float32), round(float(gain_db), 2)
+
+
+def _noise_floor(samples: np.ndarray) -> float:
+    frames = frame_signal(samples, FRAME, FRAME)
+    if not len(frames):
+        return None
+    return round(float(np.percentile(frame_energy_db(frames), NOISE_FLOOR_PERCENTILE)), 1)
+
+
+def preprocess(samples: np.ndarray, sample_rate: int) -> tuple:
+    """
+    Resample, denoise and normalize mono float samples. Returns (samples,
+    sample_rate, report); the report's levels are of the input, so callers
+    can still judge the recording itself (gain_db undoes normalization).
+    """
+    target_rate = settings.PREPROCESS_SAMPLE_RATE
+    with span("preprocess.resample", rate=sample_rate):
+        samples = resample(np.ascontiguousarray(samples, dtype=np.float32), sample_rate, target_rate)
+    noise_before = _noise_floor(samples)
+    with span("preprocess.denoise"):
+        samples = denoise(samples, target_rate)
+    noise_after = _noise_floor(samples)
+    level = loudness_dbfs(samples, target_rate)
+    with span("preprocess.normalize"):
+        samples, gain_db = normalize(samples, target_rate)
+    return samples, target_rate, {
+        "input_sample_rate": sample_rate,
+        "sample_rate": target_rate,
+        "duration_seconds": round(len(samples) / target_rate, 2),
+        "noise_floor_dbfs": noise_before,
+        "noise_reduction_db": (round(noise_before - noise_after, 1)
+                               if noise_before is not None and noise_after is not None else None),
+        "speech_loudness_dbfs": round(level, 1) if level is not None else None,
+        "gain_db": gain_db,
+    }
+
+
+def decode_recording(audio_bytes) -> tuple:
+    """(samples, sample_rate) of a recording in any format ffmpeg reads; see audio_io.decode_audio."""
+    with span("preprocess.decode"):
+        return decode_audio(audio_bytes, settings.PREPROCESS_FFMPEG, settings.PREPROCESS_SAMPLE_RATE,
+                            settings.PREPROCESS_DECODE_TIMEOUT_SECONDS)
+
+
+class AudioPreprocessor:
+    def process(self, audio_bytes) -> tuple:
+        """
+        (samples, sample_rate, report) for a recording; raises ValueError if it
+        cannot be decoded, FileNotFoundError if that needs ffmpeg and it is missing.
+        """
+        samples, sample_rate = decode_recording(audio_bytes)
+        return preprocess(samples, sample_rate)
+
+
+# Lazily-built singleton instance
+get_audio_preprocessor = LazyService("audio_preprocess", AudioPreprocessor)
@@ -0,0 +1,384 @@
+# backend/services/chunked_uploads.py
+"""
+Resumable chunked uploads for long rehearsal recordings.
+
+Protocol (endpoints in main.py, /api/uploads):
+
+    POST   /api/uploads                    -> {"upload_id", "offset": 0, "chunk_size"}
+    PUT    /api/uploads/{id}?offset=N      raw bytes; N must equal the current offset
+                                           (409 with the current offset otherwise)
+    GET    /api/uploads/{id}               progress and analysis so far (resume from "offset")
+    POST   /api/uploads/{id}/finalize      transcript plus the full analysis
+    DELETE /api/uploads/{id}
+
+A failed chunk costs only that chunk: the client asks for the offset and
+carries on from there. Chunks are appended to one file per upload in a
+local directory; the upload's state lives next to it in meta.json, guarded
+by a file lock, so any API worker can take the next chunk.
+
+Analysis runs as chunks land: once the WAV header has arrived, each PUT
+decodes only the newly completed 30 ms frames and updates voice activity
+(speech segments and pauses) and level statistics, so finalize only has
+the tail left to do. Non-WAV uploads (e.g. browser webm) are stored and
+transcribed but get no incremental analysis.
+
+Uploads untouched for UPLOAD_SESSION_TTL_SECONDS are purged.
+"""
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import struct
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from config.settings import settings
+from services.audio_features import frame_energy_db
+from services.audio_io import WavInfo, wav_info, decode_pcm
+from services.providers import LazyService
+from services.uploads import SpooledAudio, map_file
+
+logger = logging.getLogger(__name__)
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# WAV headers larger than this (long LIST/metadata chunks) are not analyzed
+HEADER_MAX_BYTES = 64 * 1024
+
+# Voice activity: 30 ms frames above VAD_THRESHOLD_DB are speech; speech
+# resumes within VAD_HANGOVER_FRAMES without closing the segment, and
+# segments shorter than VAD_MIN_SPEECH_FRAMES are dropped as clicks
+VAD_FRAME_SECONDS = 0.03
+VAD_THRESHOLD_DB = -45.0
+VAD_HANGOVER_FRAMES = 10
+VAD_MIN_SPEECH_FRAMES = 5
+CLIP_LEVEL = 0.999
+
+
+class OffsetMismatch(ValueError):
+    """A chunk was sent for the wrong offset (or finalize came early); `offset` is where the upload stands."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+class IncrementalAnalysis:
+    """
+    Voice activity and level statistics over a WAV file that is still
+    growing. All state is plain JSON (`state`) so it can be saved between
+    chunks and picked up by another worker.
+    """
+
+    def __init__(self, state: dict = None):
+        self.state = state or {
+            "format": None,          # WavInfo fields plus data_end, once the header is in
+            "unsupported": False,
+            "frames": 0,             # VAD frames analyzed
+            "speech_frames": 0,
+            "segment_start": None,   # open speech segment (VAD frame index)
+            "silence_run": 0,
+            "segments": [],          # closed segments as [start_s, end_s]
+            "samples": 0,
+            "sum_squares": 0.0,
+            "peak": 0.0,
+            "clipped": 0
+        }
+
+    def feed(self, f, received: int, final: bool = False):
+        """Analyze whole VAD frames in `f` (the upload file, `received` bytes long) not seen yet."""
+        state = self.state
+        if state["unsupported"]:
+            return
+        if state["format"] is None and not self._read_header(f, received, final):
+            return
+        info = WavInfo(**{k: v for k, v in state["format"].items() if k != "data_end"})
+        frame_samples = max(1, int(round(VAD_FRAME_SECONDS * info.sample_rate)))
+        block_align = info.channels * info.sample_width
+        frame_bytes = frame_samples * block_align
+
+        start = info.data_offset + state["frames"] * frame_bytes
+        data_end = state["format"]["data_end"]
+        end = received if data_end is None else min(received, data_end)
+        n_frames = max(0, end - start) // frame_bytes
+        if n_frames:
+            f.seek(start)
+            samples = decode_pcm(f.read(n_frames * frame_bytes), info)
+            self._update(samples.reshape(n_frames, frame_samples))
+        if final:
+            # Partial last frame: levels only
+            tail = max(0, end - start - n_frames * frame_bytes) // block_align * block_align
+            if tail:
+                f.seek(start + n_frames * frame_bytes)
+                self._levels(decode_pcm(f.read(tail), info))
+            self._close_segment(state["frames"] - state["silence_run"])
+
+    def _read_header(self, f, received: int, final: bool) -> bool:
+        f.seek(0)
+        header = f.read(min(received, HEADER_MAX_BYTES))
+        try:
+            info = wav_info(header)
+        except ValueError:
+            # Wait for more bytes unless the header can no longer turn up
+            if final or received >= HEADER_MAX_BYTES or (len(header) >= 4 and header[:4] != b"RIFF"):
+                self.state["unsupported"] = True
+            return False
+        declared = struct.unpack_from("<I", header, info.data_offset - 4)[0]
+        self.state["format"] = {
+            "channels": info.channels,
+            "sample_width": info.sample_width,
+            "sample_rate": info.sample_rate,
+            "data_offset": info.data_offset,
+            "data_bytes": 0,
+            "is_float": info.is_float,
+            # Streaming recorders leave the data size unset; then it runs to the end of the file
+            "data_end": info.data_offset + declared if declared not in (0, 0xFFFFFFFF) else None
+        }
+        return True
+
+    def _update(self, frames: np.ndarray):
+        state = self.state
+        self._levels(frames.reshape(-1))
+        speech = frame_energy_db(frames) > VAD_THRESHOLD_DB
+        first = state["frames"]
+        for i, is_speech in enumerate(speech.tolist(), start=first):
+            if is_speech:
+                state["speech_frames"] += 1
+                if state["segment_start"] is None:
+                    state["segment_start"] = i
+                state["silence_run"] = 0
+            elif state["segment_start"] is not None:
+                state["silence_run"] += 1
+                if state["silence_run"] > VAD_HANGOVER_FRAMES:
+                    self._close_segment(i + 1 - state["silence_run"])
+        state["frames"] = first + len(speech)
+
+    def _close_segment(self, end_frame: int):
+        state = self.state
+        begin = state["segment_start"]
+        if begin is not None and end_frame - begin >= VAD_MIN_SPEECH_FRAMES:
+            state["segments"].append([round(begin * VAD_FRAME_SECONDS, 2), round(end_frame * VAD_FRAME_SECONDS, 2)])
+        state["segment_start"] = None
+        state["silence_run"] = 0
+
+    def _levels(self, samples: np.ndarray):
+        state = self.state
+        if not len(samples):
+            return
+        magnitude = np.abs(samples)
+        state["samples"] += int(len(samples))
+        state["sum_squares"] += float(np.square(samples, dtype=np.float64).sum())
+        state["peak"] = max(state["peak"], float(magnitude.max()))
+        state["clipped"] += int(np.count_nonzero(magnitude >= CLIP_LEVEL))
+
+    def summary(self) -> dict:
+        state = self.state
+        if state["unsupported"] or state["format"] is None:
+            return {"available": False}
+        duration = state["samples"] / state["format"]["sample_rate"]
+        segments = state["segments"]
+        pauses = [b[0] - a[1] for a, b in zip(segments, segments[1:])]
+        rms = (state["sum_squares"] / state["samples"]) ** 0.5 if state["samples"] else 0.0
+        speech_seconds = state["speech_frames"] * VAD_FRAME_SECONDS
+        return {
+            "available": True,
+            "analyzed_seconds": round(duration, 2),
+            "speech_seconds": round(speech_seconds, 2),
+            "speech_ratio": round(speech_seconds / duration, 3) if duration else 0.0,
+            "speech_segments": len(segments),
+            "pause_count": len(pauses),
+            "longest_pause_seconds": round(max(pauses), 2) if pauses else 0.0,
+            "rms_dbfs": round(20 * np.log10(max(rms, 1e-6)), 1),
+            "peak_dbfs": round(20 * np.log10(max(state["peak"], 1e-6)), 1),
+            "clipping_ratio": round(state["clipped"] / state["samples"], 5) if state["samples"] else 0.0,
+            "segments": segments
+        }
+
+
+class ChunkedUploadStore:
+    def __init__(self, root: str = None):
+        self.root = root or settings.UPLOAD_CHUNK_DIR
+        self.chunk_size = settings.UPLOAD_CHUNK_BYTES
+        self.ttl = settings.UPLOAD_SESSION_TTL_SECONDS
+        os.makedirs(self.root, exist_ok=True)
+
+    def create(self, filename: str = None, size: int = None) -> dict:
+        if size is not None and size > settings.UPLOAD_MAX_BYTES:
+            raise UploadTooLarge(f"Upload exceeds the {settings.UPLOAD_MAX_BYTES / (1 << 20):.1f} MB limit")
+        self.purge_expired()
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._dir(upload_id))
+        open(self._file(upload_id), "wb").close()
+        now = time.time()
+        meta = {
+            "upload_id": upload_id,
+            "filename": filename or "recording",
+            "size": size,
+            "offset": 0,
+            "status": "uploading",
+            "digest": None,
+            "created_at": now,
+            "updated_at": now,
+            "analysis": IncrementalAnalysis().state
+        }
+        self._save(upload_id, meta)
+        return self._public(meta)
+
+    def get(self, upload_id: str) -> dict:
+        meta = self._load(upload_id)
+        return self._public(meta) if meta else None
+
+    def append(self, upload_id: str, offset: int, chunk: bytes) -> dict:
+        """Write `chunk` at `offset` (which must be the current end) and analyze what it completes."""
+        with self._locked(upload_id) as meta:
+            if meta["status"] != "uploading":
+                raise OffsetMismatch("Upload is already complete", meta["offset"])
+            if offset != meta["offset"]:
+                raise OffsetMismatch(f"Expected offset {meta['offset']}", meta["offset"])
+            end = offset + len(chunk)
+            limit = min(meta["size"] or settings.UPLOAD_MAX_BYTES, settings.UPLOAD_MAX_BYTES)
+            if end > limit:
+                raise UploadTooLarge(f"Chunk ends at byte {end}, past the upload's {limit} bytes")
+
+            with open(self._file(upload_id), "r+b") as f:
+                f.seek(offset)
+                f.write(chunk)
+                # Drop anything left past the end by an earlier rejected chunk
+                f.truncate()
+                f.flush()
+                analysis = IncrementalAnalysis(meta["analysis"])
+                analysis.feed(f, end)
+            self._check_duration(analysis)
+            meta["offset"] = end
+            if meta["size"] is not None and end == meta["size"]:
+                meta["status"] = "complete"
+        return self._public(meta)
+
+    def finish(self, upload_id: str) -> dict:
+        """Close the upload: analyze the tail and record the content digest. Safe to repeat."""
+        with self._locked(upload_id) as meta:
+            if meta["status"] == "finalized":
+                return meta
+            if meta["size"] is not None and meta["offset"] != meta["size"]:
+                raise OffsetMismatch(f"Upload incomplete: {meta['offset']} of {meta['size']} bytes", meta["offset"])
+            if meta["offset"] == 0:
+                raise ValueError("Upload is empty")
+            with open(self._file(upload_id), "rb") as f:
+                analysis = IncrementalAnalysis(meta["analysis"])
+                analysis.feed(f, meta["offset"], final=True)
+            self._check_duration(analysis)
+            if meta["digest"] is None:
+                with self.open(upload_id) as audio:
+                    meta["digest"] = audio.digest
+            meta["status"] = "finalized"
+        return meta
+
+    def digest(self, upload_id: str) -> str:
+        """Content digest of a fully received upload (computed once), or None while chunks are missing."""
+        with self._locked(upload_id) as meta:
+            if meta["status"] == "uploading":
+                return None
+            if meta["digest"] is None:
+                with self.open(upload_id) as audio:
+                    meta["digest"] = audio.digest
+            return meta["digest"]
+
+    def open(self, upload_id: str, digest: str = None) -> SpooledAudio:
+        """The received bytes as a memory-mapped SpooledAudio (hashed unless `digest` is known); close it when done."""
+        return map_file(self._file(upload_id), digest)
+
+    def delete(self, upload_id: str) -> bool:
+        if not _UPLOAD_ID_RE.match(upload_id) or not os.path.isdir(self._dir(upload_id)):
+            return False
+        shutil.rmtree(self._dir(upload_id), ignore_errors=True)
+        return True
+
+    def purge_expired(self) -> int:
+        cutoff = time.time() - self.ttl
+        purged = 0
+        for upload_id in os.listdir(self.root):
+            meta_path = os.path.join(self.root, upload_id, "meta.json")
+            try:
+                if os.path.getmtime(meta_path) < cutoff:
+                    purged += self.delete(upload_id)
+            except OSError:
+                continue
+        if purged:
+            logger.info("Purged %d expired uploads", purged)
+        return purged
+
+    def analysis(self, meta: dict) -> dict:
+        return IncrementalAnalysis(meta["analysis"]).summary()
+
+    @staticmethod
+    def _check_duration(analysis: IncrementalAnalysis):
+        seconds = analysis.state["samples"] / analysis.state["format"]["sample_rate"] if analysis.state["format"] else 0
+        if seconds > settings.UPLOAD_MAX_SECONDS:
+            raise UploadTooLarge(
+                f"Recording is over {seconds:.0f}s long; the limit is {settings.UPLOAD_MAX_SECONDS:.0f}s"
+            )
+
+    def _public(self, meta: dict) -> dict:
+        summary = IncrementalAnalysis(meta["analysis"]).summary()
+        summary.pop("segments", None)
+        return {
+            "upload_id": meta["upload_id"],
+            "filename": meta["filename"],
+            "size": meta["size"],
+            "offset": meta["offset"],
+            "status": meta["status"],
+            "chunk_size": self.chunk_size,
+            "expires_at": meta["updated_at"] + self.ttl,
+            "analysis": summary
+        }
+
+    @contextmanager
+    def _locked(self, upload_id: str):
+        """The upload's meta under an exclusive lock; saved on a clean exit. KeyError if unknown."""
+        if not _UPLOAD_ID_RE.match(upload_id) or not os.path.isdir(self._dir(upload_id)):
+            raise KeyError(upload_id)
+        with open(os.path.join(self._dir(upload_id), ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                meta = self._load(upload_id)
+                if meta is None:
+                    raise KeyError(upload_id)
+                yield meta
+                self._save(upload_id, meta)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self, upload_id: str):
+        if not _UPLOAD_ID_RE.match(upload_id):
+            return None
+        try:
+            with open(os.path.join(self._dir(upload_id), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, upload_id: str, meta: dict):
+        meta["updated_at"] = time.time()
+        path = os.path.join(self._dir(upload_id), "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    def _dir(self, upload_id: str) -> str:
+        return os.path.join(self.root, upload_id)
+
+    def _file(self, upload_id: str) -> str:
+        return os.path.join(self._dir(upload_id), "audio.part")
+
+
+# Lazily-built singleton instance
+get_chunked_upload_store = LazyService("chunked_uploads", ChunkedUploadStore)
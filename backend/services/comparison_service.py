@@ -1,7 +1,15 @@
 # backend/services/comparison_service.py
 from data.professional_speeches import get_all_speeches, get_speech_by_id
-from services.gemini_service import gemini_service
+from data.coaching_content import PROFESSIONAL_TIPS, DEFAULT_PROFESSIONAL_TIPS
+from services.gemini_service import get_gemini_service
+from services.speech_scorer import get_speech_scorer
+from services.prosody_service import prosody_service
+from services.providers import LazyService
+from services.metrics_service import record_fallback
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ComparisonService:
     def __init__(self):
@@ -20,10 +28,12 @@ class ComparisonService:
                 professional = self._find_most_relevant_speech(user_speech)
             
             if not professional:
+                record_fallback("comparison", "unknown_speech")
                 return self._create_mock_comparison(user_speech)
             
-            # Analyze user's speech with Gemini
-            user_analysis = await gemini_service.analyze_speech(user_speech)
+            # Local scores are enough for the similarity maths; the comparison
+            # narrative below is the Gemini call
+            user_analysis = get_speech_scorer().score(user_speech)
             
             # Get professional metrics
             professional_metrics = professional["metrics"]
@@ -64,9 +74,20 @@ class ComparisonService:
             }
             
         except Exception as e:
-            print(f"❌ Comparison error: {e}")
+            logger.error("Comparison error: %s", e)
+            record_fallback("comparison", "error")
             return self._create_mock_comparison(user_speech)
     
+    def compare_prosody(self, user_audio: bytes, reference_audio: bytes,
+                        user_digest: str = None, reference_digest: str = None) -> dict:
+        """
+        Align the user's pitch/energy contours with a reference recording.
+        Returns alignment cost, overall prosody similarity and per-segment deltas.
+        """
+        result = prosody_service.compare_recordings(user_audio, reference_audio, user_digest, reference_digest)
+        result["success"] = True
+        return result
+    
     def _find_most_relevant_speech(self, user_speech: str):
         """Find the most relevant professional speech based on content"""
         # Simple keyword matching (in production, use AI)
@@ -114,11 +135,12 @@ class ComparisonService:
             Be constructive, professional, and specific.
             """
             
-            response = await gemini_service.model.generate_content_async(prompt)
+            response = await get_gemini_service().generate(prompt, "comparison")
             return json.loads(response.text) if response else self._default_comparison()
             
         except Exception as e:
-            print(f"Gemini comparison error: {e}")
+            logger.warning("Gemini comparison error: %s", e)
+            record_fallback("comparison_narrative", "upstream_error")
             return self._default_comparison()
     
     def _calculate_similarity_scores(self, user_analysis, pro_metrics):
@@ -162,34 +184,7 @@ class ComparisonService:
     
     def _get_professional_tips(self, speaker_name):
         """Get tips based on the professional speaker's style"""
-        tips = {
-            "Steve Jobs": [
-                "Use dramatic pauses for emphasis",
-                "Tell personal stories to connect",
-                "Repeat key phrases for impact"
-            ],
-            "Simon Sinek": [
-                "Start with 'Why' before 'What'",
-                "Use simple, powerful visuals",
-                "Speak slowly to emphasize points"
-            ],
-            "Martin Luther King Jr.": [
-                "Use rhythmic repetition",
-                "Build to emotional climax",
-                "Speak with conviction and passion"
-            ],
-            "Brené Brown": [
-                "Be vulnerable and authentic",
-                "Use personal anecdotes",
-                "Maintain conversational tone"
-            ]
-        }
-        
-        return tips.get(speaker_name, [
-            "Practice deliberate pauses",
-            "Record and review yourself",
-            "Focus on one improvement at a time"
-        ])
+        return PROFESSIONAL_TIPS.get(speaker_name, DEFAULT_PROFESSIONAL_TIPS)
     
     def _default_comparison(self):
         return {
@@ -242,5 +237,5 @@ class ComparisonService:
             "is_mock": True
         }
 
-# Create singleton instance
-comparison_service = ComparisonService()
\ No newline at end of file
+# Lazily-built singleton instance
+get_comparison_service = LazyService("comparison", ComparisonService)
\ No newline at end of file
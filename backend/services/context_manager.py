@@ -0,0 +1,190 @@
+# backend/services/context_manager.py
+"""
+Token-budgeted conversation context for coach prompts.
+
+The most recent turns are included verbatim up to CONTEXT_TOKEN_BUDGET;
+anything older is represented by a rolling summary capped at
+CONTEXT_SUMMARY_TOKENS. For stored sessions the summary is cached on the
+session and refreshed incrementally in the background (Gemini, or a local
+extractive summary when Gemini is unavailable), so prompt size stays flat
+however long a practice session runs.
+"""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+
+from config.settings import settings
+from services.gemini_service import get_gemini_service, estimate_tokens, CHARS_PER_TOKEN
+from services.metrics_service import CONTEXT_TOKENS, record_fallback
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+
+def cap_summary(summary: str, max_tokens: int) -> str:
+    """Keep the newest part of a summary that fits in max_tokens."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(summary) <= max_chars:
+        return summary
+    tail = summary[-max_chars:]
+    cut = max(tail.find("\n"), tail.find(" "))
+    return tail[cut + 1:] if cut >= 0 else tail
+
+
+def fold_gists(summary: str, turns: list, max_tokens: int = None) -> str:
+    """
+    Local extractive summary: append the first sentence of each turn,
+    dropping the oldest lines once over max_tokens.
+    """
+    max_chars = (max_tokens or settings.CONTEXT_SUMMARY_TOKENS) * CHARS_PER_TOKEN
+    lines = summary.splitlines() if summary else []
+    for turn in turns:
+        speaker = "Student" if turn.get("speaker") == "user" else "Coach"
+        gist = re.split(r"(?<=[.!?])\s", turn.get("text", "").strip(), maxsplit=1)[0][:160]
+        if gist:
+            lines.append(f"{speaker}: {gist}")
+    while lines and sum(len(line) + 1 for line in lines) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+@dataclass
+class ConversationContext:
+    summary: str = ""
+    turns: list = field(default_factory=list)
+    # Absolute turn range [start, end) that is older than the verbatim window
+    # but not yet covered by the cached summary
+    pending: tuple = (0, 0)
+
+    @property
+    def has_pending(self) -> bool:
+        return self.pending[1] > self.pending[0]
+
+    def render(self, user_label: str = "User", coach_label: str = "Coach") -> str:
+        parts = []
+        if self.summary:
+            parts.append(f"Earlier in this session:\n{self.summary}\n\n")
+        for msg in self.turns:
+            speaker = user_label if msg.get("speaker") == "user" else coach_label
+            parts.append(f"{speaker}: {msg.get('text', '')}\n")
+        return "".join(parts)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.render())
+
+
+class ConversationContextManager:
+    def __init__(self):
+        self.token_budget = settings.CONTEXT_TOKEN_BUDGET
+        self.summary_tokens = settings.CONTEXT_SUMMARY_TOKENS
+        self._refreshing = {}  # session_id -> in-flight summary task
+
+    def build(self, turns: list, summary: str = "", first_index: int = 0, summarized_upto: int = 0) -> ConversationContext:
+        """
+        Select recent turns (newest first) until the token budget is spent.
+        Older turns not yet in `summary` are folded in locally for this prompt
+        and reported as pending so the cached summary can catch up.
+        """
+        used = 0
+        keep = 0
+        for msg in reversed(turns):
+            cost = estimate_tokens(msg.get("text", "")) + 3
+            if keep and used + cost > self.token_budget:
+                break
+            used += cost
+            keep += 1
+
+        recent = [dict(msg) for msg in turns[len(turns) - keep:]]
+        if recent and used > self.token_budget:
+            # A single turn larger than the whole budget: keep its tail
+            recent[0]["text"] = cap_summary(recent[0].get("text", ""), self.token_budget)
+
+        window_start = first_index + len(turns) - keep
+        pending_start = max(summarized_upto, first_index)
+        older = turns[pending_start - first_index:len(turns) - keep]
+        context_summary = cap_summary(summary, self.summary_tokens) if summary else ""
+        if older:
+            context_summary = fold_gists(context_summary, older, self.summary_tokens)
+
+        return ConversationContext(
+            summary=context_summary,
+            turns=recent,
+            pending=(pending_start, max(pending_start, window_start))
+        )
+
+    def build_for_session(self, session, store) -> ConversationContext:
+        """Build context from a stored session and refresh its summary in the background if stale."""
+        context = self.build(session.history, session.summary, session.first_index, session.summarized_upto)
+        if context.has_pending:
+            self.schedule_refresh(session.session_id, store)
+        CONTEXT_TOKENS.observe(context.tokens)
+        return context
+
+    def build_for_history(self, history: list) -> ConversationContext:
+        """Build context from a client-sent history (no cached summary)."""
+        context = self.build(history or [])
+        CONTEXT_TOKENS.observe(context.tokens)
+        return context
+
+    def schedule_refresh(self, session_id: str, store):
+        if session_id in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.refresh_summary(session_id, store))
+        self._refreshing[session_id] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(session_id, None))
+
+    async def refresh_summary(self, session_id: str, store):
+        """Fold turns that left the verbatim window into the session's cached summary."""
+        session = await asyncio.to_thread(store.get, session_id)
+        if session is None:
+            return
+        context = self.build(session.history, session.summary, session.first_index, session.summarized_upto)
+        start, end = context.pending
+        if end <= start:
+            return
+        turns = session.history[start - session.first_index:end - session.first_index]
+        summary = await self._summarize(session.summary, turns)
+
+        # Apply to the current session: it may have moved on while Gemini was answering
+        def apply(current):
+            if current.summarized_upto != start:
+                return False
+            current.summary = summary
+            current.summarized_upto = end
+
+        await asyncio.to_thread(store.update, session_id, apply)
+
+    async def _summarize(self, previous: str, turns: list) -> str:
+        gemini = get_gemini_service()
+        if gemini.model:
+            transcript = "\n".join(
+                f"{'Student' if msg.get('speaker') == 'user' else 'Coach'}: {msg.get('text', '')}"
+                for msg in turns
+            )
+            prompt = (
+                "Update the running summary of a speaking-coach session.\n"
+                f"Current summary:\n{previous or '(none)'}\n\n"
+                f"New turns:\n{transcript}\n\n"
+                f"Write the updated summary in at most {self.summary_tokens * 3 // 4} words. "
+                "Keep the student's goals, problems discussed, advice given and progress. "
+                "Return only the summary."
+            )
+            try:
+                response = await gemini.generate(prompt, "summarize_context")
+                return cap_summary(response.text.strip(), self.summary_tokens)
+            except Exception as e:
+                logger.warning("Context summary failed, using local summary: %s", e)
+                record_fallback("context_summary", "upstream_error")
+        else:
+            record_fallback("context_summary", "no_model")
+        return fold_gists(previous, turns, self.summary_tokens)
+
+
+# Lazily-built singleton instance
+get_context_manager = LazyService("context_manager", ConversationContextManager)
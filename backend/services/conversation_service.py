@@ -1,8 +1,49 @@
 # backend/services/conversation_service.py
-from services.gemini_service import gemini_service
+from services.gemini_service import get_gemini_service
+from services.context_manager import get_context_manager
+from services.providers import LazyService
+from services.intent_classifier import load_intent_classifier
+from services.metrics_service import COACH_ROUTES, record_fallback
+from services.tracing_service import span
+from config.settings import settings
+from data.coaching_content import COACHING_TIP_KEYWORDS
+from data.coach_prompts import COACHING_TURN
+from data.intent_examples import INTENT_KEYWORDS
 import json
+import logging
 import random
 
+logger = logging.getLogger(__name__)
+
+
+def keyword_intent(user_message: str) -> str:
+    """Substring intent rules, used when no trained classifier is available"""
+    user_message_lower = user_message.lower().strip()
+    for intent, keywords in INTENT_KEYWORDS.items():
+        if any(keyword in user_message_lower for keyword in keywords):
+            return intent
+    return "other"
+
+
+def route_intent(classifier, user_message: str) -> str:
+    """
+    Intent a turn is routed to ("other" goes to Gemini). Confident
+    classifier predictions win; below INTENT_CONFIDENCE_THRESHOLD a keyword
+    match is still answered locally when the classifier gives that intent
+    at least INTENT_KEYWORD_MIN_PROBA (benchmarks/bench_intent.py).
+    """
+    if classifier is None:
+        return keyword_intent(user_message)
+    proba = classifier.predict_proba(user_message)
+    best = int(proba.argmax())
+    if proba[best] >= settings.INTENT_CONFIDENCE_THRESHOLD:
+        return classifier.classes[best]
+    intent = keyword_intent(user_message)
+    if intent in classifier.classes and proba[classifier.classes.index(intent)] >= settings.INTENT_KEYWORD_MIN_PROBA:
+        return intent
+    return "other"
+
+
 class ConversationService:
     def __init__(self):
         self.coach_personality = {
@@ -11,44 +52,42 @@ class ConversationService:
             "expertise": "public speaking and communication",
             "voice_tone": "warm, professional, friendly"
         }
+        # Intents answered locally without calling Gemini
+        self._intent_handlers = {
+            "greeting": lambda message: self._greeting_response(),
+            "nervousness": self._handle_nervousness,
+            "filler_words": self._handle_filler_words,
+            "pacing": self._handle_pacing,
+            "practice": self._suggest_practice,
+            "confidence": self._handle_confidence,
+            "clarity": self._handle_clarity
+        }
     
-    async def get_coaching_response(self, user_message: str, conversation_history: list = None):
+    async def get_coaching_response(self, user_message: str, conversation_history: list = None, context=None):
         """
-        Generate a conversational response as a speaking coach
+        Generate a conversational response as a speaking coach.
+        `context` is a prebuilt ConversationContext (stored sessions); otherwise
+        one is built from conversation_history.
         """
         try:
-            # Clean the user message
-            user_message_lower = user_message.lower().strip()
-            
-            # Check for specific intents
-            if any(greeting in user_message_lower for greeting in ["hi", "hello", "hey", "how are you"]):
-                return self._greeting_response()
-            
-            if any(nervous_word in user_message_lower for nervous_word in ["nervous", "anxious", "scared", "afraid", "fear", "worried", "stage fright"]):
-                return self._handle_nervousness(user_message)
-            
-            if any(filler_word in user_message_lower for filler_word in ["filler", "um", "uh", "like", "you know", "actually", "basically"]):
-                return self._handle_filler_words(user_message)
-            
-            if any(pace_word in user_message_lower for pace_word in ["fast", "slow", "speed", "pace", "rate", "quick", "rushed"]):
-                return self._handle_pacing(user_message)
-            
-            if any(practice_word in user_message_lower for practice_word in ["practice", "exercise", "drill", "train", "rehearse", "prepare"]):
-                return self._suggest_practice(user_message)
-            
-            if any(conf_word in user_message_lower for conf_word in ["confidence", "confident", "bold", "assertive"]):
-                return self._handle_confidence(user_message)
-            
-            if any(clarity_word in user_message_lower for clarity_word in ["clear", "clarity", "understand", "audible", "mumble"]):
-                return self._handle_clarity(user_message)
+            with span("conversation.intent_match"):
+                handler = self._match_intent(user_message)
+            if handler:
+                return handler(user_message)
             
             # Default: Use Gemini for intelligent response
-            return await self._gemini_general_response(user_message, conversation_history)
+            return await self._gemini_general_response(user_message, conversation_history, context)
             
         except Exception as e:
-            print(f"Conversation error: {e}")
+            logger.error("Conversation error: %s", e)
             return self._fallback_response()
     
+    def _match_intent(self, user_message: str):
+        """Return the canned handler for the classified intent, or None if the turn needs Gemini"""
+        intent = route_intent(load_intent_classifier(), user_message)
+        COACH_ROUTES.labels(route="local" if intent in self._intent_handlers else "gemini", intent=intent).inc()
+        return self._intent_handlers.get(intent)
+    
     def _greeting_response(self):
         """Respond to greetings"""
         greetings = [
@@ -163,41 +202,58 @@ class ConversationService:
             "is_encouraging": True
         }
     
-    async def _gemini_general_response(self, user_message, history):
+    async def stream_coaching_response(self, user_message: str, conversation_history: list = None, context=None):
+        """
+        get_coaching_response as a stream: yields ("text", chunk) while the
+        reply is generated, then ("response", dict) with the full response.
+        """
+        with span("conversation.intent_match"):
+            handler = self._match_intent(user_message)
+        if handler:
+            response = handler(user_message)
+            yield "text", response["text"]
+            yield "response", response
+            return
+        
+        chunks = []
+        try:
+            prompt = self._coaching_prompt(user_message, conversation_history, context)
+            async for chunk in get_gemini_service().generate_stream(prompt, "coaching_response", prefix="coach_alex"):
+                chunks.append(chunk)
+                yield "text", chunk
+        except Exception as e:
+            logger.warning("Gemini streamed response error: %s", e)
+        
+        response_text = "".join(chunks).strip()
+        if not response_text:
+            response = self._fallback_response()
+            yield "text", response["text"]
+            yield "response", response
+            return
+        # A reply cut off mid-stream is still spoken as far as it got
+        yield "response", {
+            "text": response_text,
+            "coach_name": "Alex",
+            "coaching_tips": self._extract_coaching_tips(response_text),
+            "requires_response": True,
+            "is_encouraging": True
+        }
+    
+    def _coaching_prompt(self, user_message, history, context=None):
+        # Build conversation context within the prompt token budget
+        if context is None:
+            context = get_context_manager().build_for_history(history)
+        history_text = context.render("Student", "Coach Alex")
+        
+        # The Coach Alex instructions are a registered prompt prefix
+        return COACHING_TURN.substitute(context=history_text, message=user_message)
+    
+    async def _gemini_general_response(self, user_message, history, context=None):
         """Use Gemini for general conversation"""
         try:
-            # Build conversation context
-            history_text = ""
-            if history and len(history) > 0:
-                # Get last 6 messages (3 exchanges) for context
-                recent_history = history[-6:] if len(history) > 6 else history
-                for msg in recent_history:
-                    speaker = "Student" if msg.get("speaker") == "user" else "Coach Alex"
-                    history_text += f"{speaker}: {msg.get('text', '')}\n"
-            
-            prompt = f"""You are Alex, a friendly, encouraging speaking coach with expertise in public speaking and communication.
+            prompt = self._coaching_prompt(user_message, history, context)
             
-            Your coaching style:
-            - Always positive and constructive
-            - Give one actionable tip per response
-            - Ask follow-up questions to keep conversation flowing
-            - Use metaphors and examples
-            - Focus on one improvement at a time
-            - Keep responses conversational (1-2 sentences max)
-            
-            Conversation context:
-            {history_text}
-            
-            Student: {user_message}
-            
-            Respond as Coach Alex with:
-            1. Brief acknowledgment of their statement
-            2. One specific, actionable tip or encouragement
-            3. A natural follow-up question to continue conversation
-            
-            Coach Alex:"""
-            
-            response = await gemini_service.model.generate_content_async(prompt)
+            response = await get_gemini_service().generate(prompt, "coaching_response", prefix="coach_alex")
             response_text = response.text.strip()
             
             # Extract coaching tips from response
@@ -212,7 +268,7 @@ class ConversationService:
             }
             
         except Exception as e:
-            print(f"Gemini general response error: {e}")
+            logger.warning("Gemini general response error: %s", e)
             return self._fallback_response()
     
     def _extract_coaching_tips(self, response_text: str):
@@ -220,20 +276,8 @@ class ConversationService:
         tips = []
         
         # Extract common tips based on keywords
-        keywords_to_tips = {
-            "breath": ["Remember to breathe deeply", "Practice breathing exercises"],
-            "pause": ["Use pauses for emphasis", "Don't rush your pauses"],
-            "slow": ["Speak at a measured pace", "Don't rush your words"],
-            "fast": ["Consider slowing down slightly", "Pace yourself"],
-            "confident": ["Project confidence in your voice", "Stand tall and speak boldly"],
-            "clear": ["Enunciate your words clearly", "Focus on articulation"],
-            "practice": ["Practice regularly for improvement", "Consistent practice is key"],
-            "eye contact": ["Maintain good eye contact", "Connect with your audience visually"],
-            "volume": ["Adjust your volume appropriately", "Project your voice"]
-        }
-        
         response_lower = response_text.lower()
-        for keyword, tip_list in keywords_to_tips.items():
+        for keyword, tip_list in COACHING_TIP_KEYWORDS.items():
             if keyword in response_lower:
                 tips.extend(tip_list)
         
@@ -250,6 +294,7 @@ class ConversationService:
     
     def _fallback_response(self):
         """Fallback if everything fails"""
+        record_fallback("conversation", "fallback_response")
         fallbacks = [
             "I'm here to help you practice speaking! What would you like to work on today?",
             "Great to connect! What speaking challenge are you facing right now?",
@@ -264,13 +309,19 @@ class ConversationService:
             "is_encouraging": True
         }
     
-    async def analyze_speaking_pattern(self, text: str):
-        """Quick analysis of speaking patterns during conversation"""
+    async def analyze_speaking_pattern(self, text: str, filled_pauses: int = None):
+        """
+        Quick analysis of speaking patterns during conversation. `filled_pauses`
+        is the recording's acoustic filler count, when known; it raises the
+        filler count when STT dropped the "um"s.
+        """
         try:
             # Count filler words
             filler_words = ["um", "uh", "like", "you know", "so", "actually", "basically", "well", "i mean"]
             words = text.lower().split()
             filler_count = sum(1 for word in words if word in filler_words)
+            if filled_pauses is not None:
+                filler_count = max(filler_count, filled_pauses)
             
             # Analyze sentence structure
             sentence_count = text.count('.') + text.count('!') + text.count('?')
@@ -295,7 +346,7 @@ class ConversationService:
             Keep responses concise and encouraging."""
             
             try:
-                response = await gemini_service.model.generate_content_async(prompt)
+                response = await get_gemini_service().generate(prompt, "speaking_pattern")
                 try:
                     analysis = json.loads(response.text)
                     # Add filler word count
@@ -303,9 +354,9 @@ class ConversationService:
                     return analysis
                 except json.JSONDecodeError:
                     # If Gemini doesn't return valid JSON, use our simple analysis
-                    pass
-            except:
-                pass  # Fall through to simple analysis
+                    record_fallback("speaking_pattern", "invalid_json")
+            except Exception:
+                record_fallback("speaking_pattern", "upstream_error")  # Fall through to simple analysis
             
             # Simple analysis based on text characteristics
             if len(words) < 5:
@@ -365,7 +416,7 @@ class ConversationService:
                 }
             
         except Exception as e:
-            print(f"Analysis error: {e}")
+            logger.error("Analysis error: %s", e)
             return {
                 "quick_tip": "Keep practicing regularly for improvement",
                 "strength": "You're taking steps to improve - that's great!",
@@ -377,5 +428,5 @@ class ConversationService:
                 "filler_word_count": 0
             }
 
-# Create singleton instance
-conversation_service = ConversationService()
\ No newline at end of file
+# Lazily-built singleton instance
+get_conversation_service = LazyService("conversation", ConversationService)
\ No newline at end of file
@@ -1,14 +1,19 @@
 # backend/services/elevenlabs_service.py
 import os
+import logging
 import requests
 import random
 from config.settings import settings
+from services.providers import LazyService
+from services.metrics_service import track_upstream, record_upstream_error, record_fallback
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 class ElevenLabsService:
     def __init__(self):
         self.api_key = settings.ELEVENLABS_API_KEY
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = settings.ELEVENLABS_BASE_URL.rstrip("/")
         self.headers = {
             "xi-api-key": self.api_key,
             "Content-Type": "application/json"
@@ -16,9 +21,9 @@ class ElevenLabsService:
         
         # Test connection on startup
         if self.api_key:
-            print(f"✅ ElevenLabs configured with API key")
+            logger.info("ElevenLabs configured with API key")
         else:
-            print("❌ ElevenLabs API key not found in .env file")
+            logger.warning("ElevenLabs API key not found in .env file")
     
     # ------------------------------------------------------------------
     # text_to_speech METHOD
@@ -29,7 +34,7 @@ class ElevenLabsService:
         Returns audio bytes or None if error
         """
         if not self.api_key:
-            print("❌ No ElevenLabs API key")
+            record_fallback("elevenlabs_tts", "no_api_key")
             return None
         
         try:
@@ -46,17 +51,19 @@ class ElevenLabsService:
                 }
             }
             
-            response = requests.post(url, json=payload, headers=self.headers)
+            with track_upstream("elevenlabs", "text_to_speech"):
+                response = requests.post(url, json=payload, headers=self.headers)
             
             if response.status_code == 200:
-                print(f"✅ TTS successful: {len(text)} characters")
+                logger.debug("TTS successful: %d characters", len(text))
                 return response.content
             else:
-                print(f"❌ TTS failed: {response.status_code} - {response.text[:100]}")
+                record_upstream_error("elevenlabs", "text_to_speech")
+                logger.warning("TTS failed: %s - %.100s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            print(f"❌ TTS error: {e}")
+            logger.error("TTS error: %s", e)
             return None
 
     # ------------------------------------------------------------------
@@ -92,8 +99,8 @@ class ElevenLabsService:
         
         # IMPROVED mock implementation with mode parameter
         # If mode is "analysis", return consistent text for proper analysis
+        record_fallback("elevenlabs_stt", "mock")
         if mode == "analysis":
-            print("🎤 Mock STT (Analysis Mode): Returning placeholder for speech analysis")
             return "This is a sample recorded speech about improving public speaking skills through regular practice and feedback."
         
         # For "conversation" mode - return varied conversation starters
@@ -137,7 +144,7 @@ class ElevenLabsService:
         
         # Return random realistic text
         selected_text = random.choice(mock_responses)
-        print(f"🗣️ Mock STT (Conversation Mode): '{selected_text}'")
+        logger.debug("Mock STT (conversation mode): %s", selected_text)
         return selected_text
     
     # ------------------------------------------------------------------
@@ -150,7 +157,8 @@ class ElevenLabsService:
         
         try:
             url = f"{self.base_url}/voices"
-            response = requests.get(url, headers=self.headers)
+            with track_upstream("elevenlabs", "get_voices"):
+                response = requests.get(url, headers=self.headers)
             
             if response.status_code == 200:
                 voices = response.json().get("voices", [])
@@ -172,10 +180,11 @@ class ElevenLabsService:
                         })
                 return simplified_voices
             else:
-                print(f"Failed to get voices: {response.status_code}")
+                record_upstream_error("elevenlabs", "get_voices")
+                logger.warning("Failed to get voices: %s", response.status_code)
                 return []
         except Exception as e:
-            print(f"Error getting voices: {e}")
+            logger.error("Error getting voices: %s", e)
             return []
 
     # ------------------------------------------------------------------
@@ -198,5 +207,5 @@ class ElevenLabsService:
                 "note": "Make sure your ElevenLabs API key is valid."
             }
 
-# Create singleton instance
-elevenlabs_service = ElevenLabsService()
\ No newline at end of file
+# Lazily-built singleton instance
+get_elevenlabs_service = LazyService("elevenlabs", ElevenLabsService)
\ No newline at end of file
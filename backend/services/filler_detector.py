@@ -0,0 +1,185 @@
+# backend/services/filler_detector.py
+"""
+Acoustic filled-pause ("um", "uh", "er") and hesitation detection.
+
+STT engines mostly drop filled pauses, so transcript word matching
+(services/speech_scorer.py) undercounts them. Acoustically a filled pause
+is a sustained vowel: voiced for longer than a syllable (a quarter of a
+second or more) with a flat pitch at or below the speaker's usual level,
+steady loudness and a spectral envelope that does not move (no formant
+transitions, unlike words), often next to a pause.
+
+1. Per 10 ms frame: pitch (semitones re the speaker's median), level, and
+   the low-order cepstrum of the pre-emphasized spectrum (the envelope,
+   i.e. the formants); envelope movement is the cepstral distance between
+   consecutive frames, in dB.
+2. Windows of STABLE_WINDOW_SECONDS are stable when fully voiced with
+   pitch, level and envelope all steady (rolling sums, all frames at once);
+   runs of stable frames are the candidates.
+3. Each candidate is scored by a small hand-set logistic classifier
+   (FILLER_WEIGHTS) on duration, pitch spread and slope, envelope movement,
+   pitch relative to the speaker and pauses on either side.
+
+Silent hesitations are counted too: quiet, unvoiced gaps inside speech
+longer than a consonant closure. A minute of audio takes about 0.15 s
+(benchmarks/bench_fillers.py); it runs with the rest of the recording
+analysis in the audio process pool (services/audio_pool.py).
+"""
+import numpy as np
+
+from services.audio_features import frame_signal, pitch_track
+
+HOP_SECONDS = 0.01
+FMIN = 70.0
+FMAX = 400.0
+ENVELOPE_FRAME_SECONDS = 0.025
+ENVELOPE_FFT = 512
+CEPSTRAL_COEFFICIENTS = 12
+PRE_EMPHASIS = 0.97
+FRAME_BLOCK = 2048
+
+# Stability window and the limits a window must stay within
+STABLE_WINDOW_SECONDS = 0.15
+MAX_PITCH_STD_ST = 1.0
+MAX_ENVELOPE_DELTA_DB = 2.5
+MAX_LEVEL_STD_DB = 3.0
+# Candidate length: longer than a stressed vowel, shorter than a sung note
+MIN_FILLER_SECONDS = 0.25
+MAX_FILLER_SECONDS = 2.0
+# A pause next to a candidate: this much unvoiced time within PAUSE_REACH_SECONDS
+PAUSE_SECONDS = 0.1
+PAUSE_REACH_SECONDS = 0.15
+# Silent hesitations: unvoiced gaps between these lengths, this far below the speech level
+MIN_SILENT_PAUSE_SECONDS = 0.3
+MAX_SILENT_PAUSE_SECONDS = 3.0
+SILENT_PAUSE_DB = 20.0
+
+# Logistic classifier: bias, then weights for (duration, pitch steadiness,
+# envelope steadiness, pitch at or below the speaker's median, pitch not
+# gliding, pauses on either side)
+FILLER_WEIGHTS = (-4.0, 3.0, 1.5, 1.5, 1.0, 1.0, 0.75)
+FILLER_THRESHOLD = 0.6
+# Pitch glide (semitones per second) above which a vowel sounds intoned, not filled
+MAX_PITCH_SLOPE = 6.0
+MAX_SEGMENTS = 50
+
+
+def _runs(mask: np.ndarray) -> tuple:
+    """(starts, ends) of runs of True in a boolean array (ends exclusive)."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[::2], edges[1::2]
+
+
+def _rolling_sum(x: np.ndarray, width: int) -> np.ndarray:
+    """Sums of x over every window of `width` frames (len(x) - width + 1 values)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    return cumulative[width:] - cumulative[:-width]
+
+
+def envelope_cepstrum(samples: np.ndarray, sample_rate: int, hop: int, frame_length: int, n_frames: int) -> np.ndarray:
+    """Low-order cepstrum per pitch frame (same centers), from a shorter window."""
+    size = int(sample_rate * ENVELOPE_FRAME_SECONDS)
+    emphasized = np.append(samples[:1], samples[1:] - PRE_EMPHASIS * samples[:-1]).astype(np.float32)
+    offset = max(0, (frame_length - size) // 2)
+    frames = frame_signal(emphasized[offset:], size, hop)[:n_frames]
+    window = np.hamming(size).astype(np.float32)
+    cepstra = np.zeros((n_frames, CEPSTRAL_COEFFICIENTS), dtype=np.float32)
+    for start in range(0, len(frames), FRAME_BLOCK):
+        spectrum = np.fft.rfft(frames[start:start + FRAME_BLOCK] * window, ENVELOPE_FFT, axis=1)
+        log_power = np.log(spectrum.real ** 2 + spectrum.imag ** 2 + 1e-10)
+        cepstra[start:start + len(log_power)] = np.fft.irfft(log_power, ENVELOPE_FFT, axis=1)[:, 1:CEPSTRAL_COEFFICIENTS + 1]
+    return cepstra
+
+
+def detect_fillers(samples: np.ndarray, sample_rate: int) -> dict:
+    """Filled pauses and silent hesitations in mono float samples."""
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    hop = max(1, int(sample_rate * HOP_SECONDS))
+    frame_length = int(2.5 * sample_rate / FMIN)
+    duration = len(samples) / sample_rate
+    width = max(2, int(round(STABLE_WINDOW_SECONDS / HOP_SECONDS)))
+    if len(samples) < frame_length + width * hop:
+        return {"available": False, "reason": "Recording too short"}
+
+    f0, voiced, _, level = pitch_track(samples, sample_rate, hop, frame_length, FMIN, FMAX)
+    if voiced.sum() < width:
+        return {"available": False, "reason": "Not enough voiced speech"}
+    n = len(f0)
+    semitones = np.zeros(n)
+    semitones[voiced] = 12 * np.log2(f0[voiced] / np.median(f0[voiced]))
+    speech_level = float(np.median(level[voiced]))
+
+    # Envelope movement: cepstral distance (dB) from the previous frame
+    cepstra = envelope_cepstrum(samples, sample_rate, hop, frame_length, n)
+    delta = np.zeros(n)
+    delta[1:] = (10 / np.log(10)) * np.sqrt(2 * np.sum(np.diff(cepstra, axis=0) ** 2, axis=1))
+
+    # Stable windows, all at once from rolling sums
+    count = _rolling_sum(voiced, width)
+    pitch_mean = _rolling_sum(semitones, width) / width
+    pitch_std = np.sqrt(np.maximum(_rolling_sum(semitones ** 2, width) / width - pitch_mean ** 2, 0.0))
+    level_mean = _rolling_sum(level, width) / width
+    level_std = np.sqrt(np.maximum(_rolling_sum(level ** 2, width) / width - level_mean ** 2, 0.0))
+    # Movement inside the window: deltas of its frames after the first
+    envelope = _rolling_sum(delta[1:], width - 1)[:len(count)] / (width - 1)
+    stable = ((count == width) & (pitch_std <= MAX_PITCH_STD_ST)
+              & (level_std <= MAX_LEVEL_STD_DB) & (envelope <= MAX_ENVELOPE_DELTA_DB))
+
+    # Frames covered by any stable window
+    cover = np.zeros(n + 1)
+    starts = np.flatnonzero(stable)
+    np.add.at(cover, starts, 1)
+    np.add.at(cover, starts + width, -1)
+    covered = np.cumsum(cover[:n]) > 0
+
+    segments = []
+    reach = int(PAUSE_REACH_SECONDS / HOP_SECONDS)
+    pause = int(PAUSE_SECONDS / HOP_SECONDS)
+    for start, end in zip(*_runs(covered)):
+        seconds = (end - start) * HOP_SECONDS
+        if seconds < MIN_FILLER_SECONDS or seconds > MAX_FILLER_SECONDS:
+            continue
+        pitch = semitones[start:end]
+        slope = np.polyfit(np.arange(end - start) * HOP_SECONDS, pitch, 1)[0]
+        before = (~voiced[max(0, start - reach):start]).sum() >= pause or start < reach
+        after = (~voiced[end:end + reach]).sum() >= pause or end + reach > n
+        features = (
+            min((seconds - MIN_FILLER_SECONDS) / 0.25, 1.0),
+            1.0 - pitch.std() / MAX_PITCH_STD_ST,
+            1.0 - delta[start + 1:end].mean() / MAX_ENVELOPE_DELTA_DB,
+            float(np.median(pitch) <= 0.5),
+            float(abs(slope) <= MAX_PITCH_SLOPE),
+            (before + after) / 2,
+        )
+        z = FILLER_WEIGHTS[0] + float(np.dot(FILLER_WEIGHTS[1:], features))
+        confidence = 1 / (1 + np.exp(-z))
+        if confidence >= FILLER_THRESHOLD:
+            segments.append({
+                "start": round(float(start * HOP_SECONDS), 2),
+                "end": round(float(end * HOP_SECONDS), 2),
+                "duration": round(float(seconds), 2),
+                "confidence": round(float(confidence), 2),
+            })
+
+    # Silent hesitations: quiet unvoiced gaps with speech on both sides
+    gap_starts, gap_ends = _runs(~voiced)
+    inner = (gap_starts > 0) & (gap_ends < n)
+    gap_starts, gap_ends = gap_starts[inner], gap_ends[inner]
+    lengths = (gap_ends - gap_starts) * HOP_SECONDS
+    keep = (lengths >= MIN_SILENT_PAUSE_SECONDS) & (lengths <= MAX_SILENT_PAUSE_SECONDS)
+    quiet = level < speech_level - SILENT_PAUSE_DB
+    quiet_share = np.array([quiet[s:e].mean() for s, e in zip(gap_starts[keep], gap_ends[keep])])
+    silent = lengths[keep][quiet_share >= 0.8] if len(quiet_share) else np.zeros(0)
+
+    minutes = duration / 60
+    return {
+        "available": True,
+        "filled_pauses": len(segments),
+        "filled_pauses_per_minute": round(len(segments) / minutes, 1),
+        "filled_pause_seconds": round(sum(segment["duration"] for segment in segments), 2),
+        "silent_pauses": int(len(silent)),
+        "silent_pause_seconds": round(float(silent.sum()), 2),
+        "hesitations_per_minute": round((len(segments) + len(silent)) / minutes, 1),
+        "segments": segments[:MAX_SEGMENTS],
+    }
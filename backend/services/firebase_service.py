@@ -1,25 +1,40 @@
 # backend/services/firebase_service.py
 import os
-import firebase_admin
-from firebase_admin import credentials, firestore
 from config.settings import settings
+from services.providers import LazyService
+from services.metrics_service import track_upstream, record_fallback, QUEUE_DEPTH
 import json
+import logging
+import queue
+import threading
 from datetime import datetime
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class FirebaseService:
     def __init__(self):
         self.db = None
+        # Write-behind queue for fire-and-forget writes (conversation logs),
+        # flushed in batches by a background thread and drained on shutdown
+        self.write_batch_size = 20
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self.initialize_firebase()
     
     def initialize_firebase(self):
         """Initialize Firebase connection"""
-        print(f"🔍 Attempting Firebase initialization...")
-        print(f"🔍 GOOGLE_APPLICATION_CREDENTIALS: {settings.GOOGLE_APPLICATION_CREDENTIALS}")
-        print(f"🔍 File exists: {os.path.exists(settings.GOOGLE_APPLICATION_CREDENTIALS) if settings.GOOGLE_APPLICATION_CREDENTIALS else 'No path'}")
+        logger.info("Attempting Firebase initialization", extra={
+            "credentials_path": settings.GOOGLE_APPLICATION_CREDENTIALS,
+            "credentials_exist": bool(settings.GOOGLE_APPLICATION_CREDENTIALS) and os.path.exists(settings.GOOGLE_APPLICATION_CREDENTIALS)
+        })
     
 
         try:
+            import firebase_admin
+            from firebase_admin import credentials, firestore
+            
             # Check if Firebase is already initialized
             if not firebase_admin._apps:
                 # Use service account credentials
@@ -28,25 +43,25 @@ class FirebaseService:
                 if cred_path:
                     cred = credentials.Certificate(cred_path)
                     firebase_admin.initialize_app(cred)
-                    print("✅ Firebase initialized with service account")
+                    logger.info("Firebase initialized with service account")
                 else:
-                    print("⚠️ No service account found for Firebase")
+                    logger.warning("No service account found for Firebase")
                     return
             else:
-                print("✅ Firebase already initialized")
+                logger.info("Firebase already initialized")
             
             # Initialize Firestore
             self.db = firestore.client()
-            print("✅ Firestore client ready")
+            logger.info("Firestore client ready")
             
         except Exception as e:
-            print(f"❌ Firebase initialization error: {e}")
+            logger.error("Firebase initialization error: %s", e)
             self.db = None
     
     def save_session(self, session_data: dict) -> str:
         """Save a practice session to Firestore - FIXED VERSION"""
         if not self.db:
-            print("⚠️ Firestore not initialized. Using mock session.")
+            record_fallback("firestore", "not_initialized")
             import uuid
             return f"mock_session_{uuid.uuid4()}"
         
@@ -66,21 +81,105 @@ class FirebaseService:
             
             # Save to Firestore
             doc_ref = self.db.collection("sessions").document(session_id)
-            doc_ref.set(session_data)
+            with track_upstream("firestore", "save_session"):
+                doc_ref.set(session_data)
             
-            print(f"✅ Session saved to Firestore: {session_id}")
+            logger.debug("Session saved to Firestore: %s", session_id)
             return session_id
             
         except Exception as e:
-            print(f"❌ Error saving session: {e}")
+            logger.error("Error saving session: %s", e)
+            record_fallback("firestore", "save_session_error")
             # Return mock ID as fallback
             import uuid
             return f"mock_fallback_{uuid.uuid4()}"
     
+    # ------------------------------------------------------------------
+    # Queued conversation writes
+    # ------------------------------------------------------------------
+    def save_conversation(self, conversation_data: dict) -> bool:
+        """Queue a coaching exchange for writing"""
+        return self._enqueue_write("conversations", None, conversation_data)
+    
+    def save_conversation_session(self, session_data: dict) -> bool:
+        """Queue a conversation session record for writing"""
+        return self._enqueue_write("conversation_sessions", session_data.get("session_id"), session_data)
+    
+    def save_conversation_entry(self, entry_data: dict) -> bool:
+        """Queue a conversation turn for writing"""
+        return self._enqueue_write("conversation_entries", None, entry_data)
+    
+    @property
+    def pending_writes(self) -> int:
+        return self._write_queue.qsize()
+    
+    def _enqueue_write(self, collection: str, document_id, data: dict) -> bool:
+        if not self.db:
+            record_fallback("firestore", "not_initialized")
+            return False
+        
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="firestore-writer", daemon=True)
+                self._writer.start()
+        self._write_queue.put((collection, document_id, data))
+        QUEUE_DEPTH.labels("firestore_writes").inc()
+        return True
+    
+    def _write_loop(self):
+        """Commit queued writes in batches until a stop sentinel arrives"""
+        stopping = False
+        while not stopping:
+            item = self._write_queue.get()
+            items = []
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    items.append(item)
+                if stopping or len(items) >= self.write_batch_size:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if items:
+                self._commit_batch(items)
+                QUEUE_DEPTH.labels("firestore_writes").dec(len(items))
+            for _ in range(len(items) + (1 if stopping else 0)):
+                self._write_queue.task_done()
+    
+    def _commit_batch(self, items: list):
+        try:
+            batch = self.db.batch()
+            for collection, document_id, data in items:
+                collection_ref = self.db.collection(collection)
+                doc_ref = collection_ref.document(document_id) if document_id else collection_ref.document()
+                batch.set(doc_ref, data)
+            with track_upstream("firestore", "batch_write"):
+                batch.commit()
+        except Exception as e:
+            logger.error("Error writing %d queued documents: %s", len(items), e)
+    
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Flush queued writes and stop the writer. Returns True if the queue was fully drained."""
+        with self._writer_lock:
+            writer = self._writer
+            if writer is None or not writer.is_alive():
+                return self._write_queue.empty()
+            self._write_queue.put(None)
+        writer.join(timeout)
+        if writer.is_alive():
+            logger.warning("Shutdown with %d Firestore writes still queued", self.pending_writes)
+            return False
+        return True
+    
     def get_session(self, session_id: str) -> dict:
         """Get a session by ID"""
         if not self.db:
             # Return mock session if Firebase not initialized
+            record_fallback("firestore", "not_initialized")
             return {
                 "session_id": session_id,
                 "user_id": "demo_user",
@@ -91,7 +190,8 @@ class FirebaseService:
         
         try:
             doc_ref = self.db.collection("sessions").document(session_id)
-            doc = doc_ref.get()
+            with track_upstream("firestore", "get_session"):
+                doc = doc_ref.get()
             
             if doc.exists:
                 return doc.to_dict()
@@ -102,7 +202,7 @@ class FirebaseService:
                     "is_mock": True
                 }
         except Exception as e:
-            print(f"❌ Error getting session: {e}")
+            logger.error("Error getting session: %s", e)
             return {
                 "session_id": session_id,
                 "error": str(e),
@@ -113,6 +213,7 @@ class FirebaseService:
         """Get recent sessions for a user"""
         if not self.db:
             # Return mock sessions
+            record_fallback("firestore", "not_initialized")
             return [{
                 "session_id": f"mock_session_{i}",
                 "user_id": "demo_user",
@@ -125,20 +226,23 @@ class FirebaseService:
         try:
             # For demo, we'll use mock user ID
             # In real app, you'd have user authentication
+            from firebase_admin import firestore
             sessions_ref = self.db.collection("sessions")
             
             # Query by user_id if available, else get all
             query = sessions_ref.order_by("created_at", direction=firestore.Query.DESCENDING).limit(limit)
             
             sessions = []
-            for doc in query.stream():
-                session_data = doc.to_dict()
-                session_data["id"] = doc.id
-                sessions.append(session_data)
+            with track_upstream("firestore", "get_user_sessions"):
+                for doc in query.stream():
+                    session_data = doc.to_dict()
+                    session_data["id"] = doc.id
+                    sessions.append(session_data)
             
             return sessions
         except Exception as e:
-            print(f"❌ Error getting user sessions: {e}")
+            logger.error("Error getting user sessions: %s", e)
+            record_fallback("firestore", "get_user_sessions_error")
             return [{
                 "session_id": f"error_session_{i}",
                 "user_id": "demo_user",
@@ -151,27 +255,65 @@ class FirebaseService:
     def save_analysis(self, session_id: str, analysis_data: dict) -> bool:
         """Save analysis results for a session"""
         if not self.db:
-            print(f"⚠️ Firebase not initialized, mock saving analysis for session: {session_id}")
+            record_fallback("firestore", "not_initialized")
             # Mock successful save
             return True
         
         try:
             doc_ref = self.db.collection("sessions").document(session_id)
-            doc_ref.update({
-                "analysis": analysis_data,
-                "updated_at": datetime.now().isoformat()
-            })
+            with track_upstream("firestore", "save_analysis"):
+                doc_ref.update({
+                    "analysis": analysis_data,
+                    "updated_at": datetime.now().isoformat()
+                })
             
-            print(f"✅ Analysis saved for session: {session_id}")
+            logger.debug("Analysis saved for session: %s", session_id)
+            return True
+        except Exception as e:
+            logger.error("Error saving analysis: %s", e)
+            return False
+    
+    def save_transcript(self, session_id: str, text: str) -> bool:
+        """Set a session's text to the transcript of its recording"""
+        if not self.db:
+            record_fallback("firestore", "not_initialized")
+            return True
+        
+        try:
+            doc_ref = self.db.collection("sessions").document(session_id)
+            with track_upstream("firestore", "save_transcript"):
+                doc_ref.update({
+                    "text": text,
+                    "updated_at": datetime.now().isoformat()
+                })
+            return True
+        except Exception as e:
+            logger.error("Error saving transcript: %s", e)
+            return False
+    
+    def save_voice_quality(self, session_id: str, voice_quality: dict) -> bool:
+        """Attach voice-quality (strain) measures to a session, next to its analysis"""
+        if not self.db:
+            record_fallback("firestore", "not_initialized")
+            return True
+        
+        try:
+            doc_ref = self.db.collection("sessions").document(session_id)
+            with track_upstream("firestore", "save_voice_quality"):
+                doc_ref.update({
+                    "voice_quality": voice_quality,
+                    "updated_at": datetime.now().isoformat()
+                })
             return True
         except Exception as e:
-            print(f"❌ Error saving analysis: {e}")
+            logger.error("Error saving voice quality: %s", e)
             return False
     
     def get_statistics(self, user_id: str = "demo_user") -> dict:
         """Get user statistics"""
         if not self.db:
             # Return mock statistics
+            record_fallback("firestore", "not_initialized")
             return {
                 "total_sessions": 5,
                 "average_clarity": 7.5,
@@ -222,7 +364,7 @@ class FirebaseService:
             }
             
         except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
+            logger.error("Error getting statistics: %s", e)
             return {
                 "total_sessions": 0,
                 "average_clarity": 7.5,
@@ -233,5 +375,5 @@ class FirebaseService:
                 "is_mock": True
             }
 
-# Create singleton instance
-firebase_service = FirebaseService()
\ No newline at end of file
+# Lazily-built singleton instance
+get_firebase_service = LazyService("firebase", FirebaseService)
\ No newline at end of file
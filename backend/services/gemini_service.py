@@ -1,91 +1,204 @@
 # backend/services/gemini_service.py
-import google.generativeai as genai
 from config.settings import settings
+from data.coach_prompts import SYSTEM_PROMPTS
+from services.providers import LazyService
+from services.metrics_service import track_upstream, record_upstream_error, record_fallback, PROMPT_TOKENS
+from datetime import timedelta
 import os
 import json
-import traceback
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
 
 
 class GeminiService:
     def __init__(self):
+        # Imported here: google.generativeai dominates import time and is only
+        # needed once the service is actually built.
+        import google.generativeai as genai
+
+        self._genai = genai
+        # Static system prompts registered once and referenced per call
+        self._prefixes = {}
+        self._prefix_models = {}
+        self._prefix_expiry = {}
+
         self.auth_method = settings.google_auth_method
         self.model_name = settings.GEMINI_MODEL
 
-        print("===================================")
-        print("🔧 Initializing Gemini Service")
-        print(f"🔧 Auth Method: {self.auth_method}")
-        print(f"🔧 Model Name: {self.model_name}")
-        print("===================================")
+        logger.info("Initializing Gemini service", extra={"auth_method": self.auth_method, "model": self.model_name})
 
         if self.auth_method == "api_key":
             # Use simple API key auth
             if settings.GOOGLE_API_KEY:
-                print("🔑 Configuring Gemini with API key...")
                 genai.configure(api_key=settings.GOOGLE_API_KEY)
                 try:
                     self.model = genai.GenerativeModel(self.model_name)
-                    print(f"✅ Gemini configured with API key, model: {self.model_name}")
-                except Exception as e:
-                    print(f"❌ Failed to load model: {e}")
-                    traceback.print_exc()
+                    logger.info("Gemini configured with API key, model: %s", self.model_name)
+                except Exception:
+                    logger.exception("Failed to load Gemini model")
                     self.model = None
             else:
-                print("❌ API key auth selected but no GOOGLE_API_KEY found.")
+                logger.error("API key auth selected but no GOOGLE_API_KEY found")
                 self.model = None
 
         elif self.auth_method == "service_account":
-            print("🔐 Service Account authentication selected...")
-            print("⚠️ Full service account support not yet implemented.")
+            logger.warning("Service account auth selected; full support not yet implemented")
 
             if settings.GOOGLE_API_KEY:
-                print("➡️ Falling back to API key since GOOGLE_API_KEY exists.")
+                logger.info("Falling back to API key since GOOGLE_API_KEY exists")
                 genai.configure(api_key=settings.GOOGLE_API_KEY)
                 try:
                     self.model = genai.GenerativeModel(self.model_name)
-                    print(f"✅ Fallback model loaded: {self.model_name}")
-                except Exception as e:
-                    print(f"❌ Failed to load fallback model: {e}")
-                    traceback.print_exc()
+                    logger.info("Fallback Gemini model loaded: %s", self.model_name)
+                except Exception:
+                    logger.exception("Failed to load fallback Gemini model")
                     self.model = None
             else:
-                print("❌ No API key available for fallback.")
+                logger.error("No API key available for Gemini fallback")
                 self.model = None
         else:
-            print("⚠️ No valid auth method configured.")
+            logger.warning("No valid Gemini auth method configured")
             self.model = None
 
-        print("===================================")
+        for name, system_text in SYSTEM_PROMPTS.items():
+            self.register_prefix(name, system_text)
 
 
-    async def analyze_speech(self, text: str) -> dict:
-        """Analyze speech and return structured AI feedback."""
-        print("\n===================================")
-        print(f"🔍 Starting speech analysis...")
-        print(f"🔍 Input text (first 50 chars): {text[:50]}...")
-        print(f"🔍 Auth method: {self.auth_method}")
-        print(f"🔍 Model available: {self.model is not None}")
-        print("===================================\n")
+    def register_prefix(self, name: str, system_text: str):
+        """
+        Register a static system prompt once so calls can reference it by name.
 
+        Prefixes of at least PROMPT_CACHE_MIN_TOKENS are stored with Gemini
+        context caching; smaller ones are bound to a dedicated model as its
+        system_instruction (eligible for Gemini's implicit prefix caching).
+        Without an SDK model the prefix is sent inline with each prompt.
+        """
+        self._prefixes[name] = system_text
+        if not isinstance(self.model, self._genai.GenerativeModel):
+            return
+
+        if estimate_tokens(system_text) >= settings.PROMPT_CACHE_MIN_TOKENS:
+            try:
+                from google.generativeai import caching
+
+                cache = caching.CachedContent.create(
+                    model=self.model_name,
+                    display_name=f"coach-prefix-{name}",
+                    system_instruction=system_text,
+                    ttl=timedelta(seconds=settings.PROMPT_CACHE_TTL_SECONDS)
+                )
+                self._prefix_models[name] = self._genai.GenerativeModel.from_cached_content(cache)
+                self._prefix_expiry[name] = time.time() + settings.PROMPT_CACHE_TTL_SECONDS
+                logger.info("Cached prompt prefix %s with Gemini context caching", name)
+                return
+            except Exception as e:
+                logger.warning("Context caching unavailable for prefix %s: %s", name, e)
+
+        self._prefix_models[name] = self._genai.GenerativeModel(self.model_name, system_instruction=system_text)
+        self._prefix_expiry.pop(name, None)
+
+
+    def _model_for(self, prefix: str):
+        expiry = self._prefix_expiry.get(prefix)
+        if expiry is not None and time.time() > expiry - 60:
+            # Context cache about to expire; register it again
+            self.register_prefix(prefix, self._prefixes[prefix])
+        return self._prefix_models.get(prefix)
+
+
+    async def generate(self, prompt: str, operation: str = "generate", prefix: str = None):
+        """
+        Instrumented wrapper around generate_content_async.
+        All Gemini calls go through here so latency and errors are recorded per operation.
+        `prefix` names a system prompt registered with register_prefix.
+        """
         if not self.model:
-            print("❌ No Gemini model loaded — returning mock feedback.")
-            return self._get_mock_feedback(text)
+            raise RuntimeError("Gemini model not configured")
 
+        model = self.model
+        if prefix:
+            model = self._model_for(prefix)
+            if model is None:
+                model = self.model
+                prompt = f"{self._prefixes[prefix]}\n\n{prompt}"
+
+        with track_upstream("gemini", operation):
+            response = await model.generate_content_async(prompt)
+        self._record_usage(operation, response)
+        return response
+
+
+    async def generate_stream(self, prompt: str, operation: str = "generate", prefix: str = None):
+        """generate(), yielding the response text chunk by chunk as Gemini produces it."""
+        if not self.model:
+            raise RuntimeError("Gemini model not configured")
+
+        model = self.model
+        if prefix:
+            model = self._model_for(prefix)
+            if model is None:
+                model = self.model
+                prompt = f"{self._prefixes[prefix]}\n\n{prompt}"
+
+        # Latency here is time to the first chunk; the span must not stay
+        # open across yields to the caller
+        with track_upstream("gemini", f"{operation}_stream"):
+            response = await model.generate_content_async(prompt, stream=True)
         try:
-            print("🤖 Sending prompt to Gemini API...")
+            async for chunk in response:
+                if chunk.text:
+                    yield chunk.text
+        except Exception:
+            record_upstream_error("gemini", f"{operation}_stream")
+            raise
+        self._record_usage(operation, response)
+
+
+    def _record_usage(self, operation: str, response):
+        """Count prompt tokens served from Gemini's cache vs. processed fresh."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) or 0
+        PROMPT_TOKENS.labels(operation, "cached").inc(cached_tokens)
+        PROMPT_TOKENS.labels(operation, "uncached").inc(max(prompt_tokens - cached_tokens, 0))
+        logger.debug("Gemini %s prompt tokens: %d (%d cached)", operation, prompt_tokens, cached_tokens)
+
+
+    async def narrate_speech(self, text: str, scores: dict):
+        """
+        Coaching narrative for a speech already scored locally
+        (services/speech_scorer.py). Returns {"key_feedback", "improvement_suggestions"}
+        or None when Gemini is unavailable or answers badly.
+        """
+        logger.debug("Starting speech narrative", extra={"chars": len(text), "model_available": self.model is not None})
 
+        if not self.model:
+            record_fallback("gemini_analysis", "no_model")
+            return None
+
+        try:
             prompt = f"""
             You are a professional speaking coach. Analyze this speech text and provide feedback:
 
             Speech: "{text}"
 
+            Measured: clarity {scores.get("clarity_score")}/10, confidence {scores.get("confidence_score")}/10,
+            {scores.get("filler_words_count", 0)} filler words, {scores.get("hedge_count", 0)} hedging phrases,
+            pace {scores.get("pace", "medium")}, {scores.get("word_count", 0)} words.
+
             Provide feedback in this JSON format:
             {{
-                "clarity_score": 0-10,
-                "confidence_score": 0-10,
-                "filler_words_count": number,
-                "filler_words_list": ["um", "like", ...],
-                "pace": "slow/medium/fast",
-                "word_count": number,
                 "key_feedback": ["feedback point 1", "feedback point 2", "feedback point 3"],
                 "improvement_suggestions": ["suggestion 1", "suggestion 2"]
             }}
@@ -93,11 +206,9 @@ class GeminiService:
             Return ONLY valid JSON, no extra text.
             """
 
-            response = await self.model.generate_content_async(prompt)
+            response = await self.generate(prompt, "analyze_speech")
             response_text = response.text.strip()
-
-            print("📥 Gemini raw response received:")
-            print(response_text[:250], "...\n")
+            logger.debug("Gemini analysis response: %.250s", response_text)
 
             # Clean JSON (remove ```json code blocks)
             if response_text.startswith("```json"):
@@ -106,76 +217,98 @@ class GeminiService:
                 response_text = response_text[3:-3]
 
             try:
-                feedback = json.loads(response_text)
-                feedback["is_real_ai"] = True
-                print("✅ Successfully parsed JSON from Gemini.")
-                return feedback
-
-            except json.JSONDecodeError as e:
-                print("❌ JSON parsing error:")
-                print(str(e))
-                print("📄 Response received:")
-                print(response_text)
-                traceback.print_exc()
-                return self._get_mock_feedback(text)
+                narrative = json.loads(response_text)
+                return {
+                    "key_feedback": list(narrative.get("key_feedback") or [])[:3],
+                    "improvement_suggestions": list(narrative.get("improvement_suggestions") or [])[:3]
+                }
+
+            except (json.JSONDecodeError, AttributeError) as e:
+                logger.warning("Gemini returned invalid JSON: %s", e, extra={"response": response_text[:500]})
+                record_fallback("gemini_analysis", "invalid_json")
+                return None
 
         except Exception as e:
-            print("❌ Gemini API call failed:")
-            print(str(e))
-            traceback.print_exc()
-            return self._get_mock_feedback(text)
-
-
-    def _get_mock_feedback(self, text: str) -> dict:
-        """Fallback mock feedback for testing or offline mode."""
-        print("⚠️ Using mock feedback (no real AI).")
-
-        words = text.split()
-        filler_words = ["um", "uh", "like", "you know", "so", "actually", "basically"]
-        found_fillers = [word for word in words if word.lower() in filler_words]
-
-        return {
-            "clarity_score": min(9, len(words) // 10 + 5),
-            "confidence_score": min(8, len(words) // 15 + 4),
-            "filler_words_count": len(found_fillers),
-            "filler_words_list": found_fillers[:3],
-            "pace": "medium" if len(words) < 100 else "fast",
-            "word_count": len(words),
-            "key_feedback": [
-                "Good content structure",
-                "Could use more vocal variety",
-                "Strong opening statement"
-            ],
-            "improvement_suggestions": [
-                "Practice pausing for emphasis",
-                "Reduce filler words",
-                "Use more descriptive language"
-            ],
-            "is_real_ai": False,
-            "note": "Using mock data. Check Gemini API setup."
-        }
+            logger.error("Gemini API call failed: %s", e)
+            record_fallback("gemini_analysis", "upstream_error")
+            return None
+
+
+    async def narrate_speeches(self, items: list) -> list:
+        """
+        Batched narrate_speech: one Gemini call for several (text, scores)
+        pairs. Returns a list aligned with `items`; entries Gemini left out
+        or answered badly are None.
+        """
+        if not items:
+            return []
+        if not self.model:
+            record_fallback("gemini_analysis", "no_model")
+            return [None] * len(items)
+
+        speeches = "\n\n".join(
+            f"""Speech {index}: "{text}"
+            Measured: clarity {scores.get("clarity_score")}/10, confidence {scores.get("confidence_score")}/10,
+            {scores.get("filler_words_count", 0)} filler words, {scores.get("hedge_count", 0)} hedging phrases,
+            pace {scores.get("pace", "medium")}, {scores.get("word_count", 0)} words."""
+            for index, (text, scores) in enumerate(items)
+        )
+        prompt = f"""
+        You are a professional speaking coach. Analyze these speeches and provide feedback on each:
+
+        {speeches}
+
+        Provide feedback as a JSON array with one object per speech:
+        [
+            {{"index": 0, "key_feedback": ["feedback point 1", "feedback point 2", "feedback point 3"], "improvement_suggestions": ["suggestion 1", "suggestion 2"]}}
+        ]
+
+        Return ONLY valid JSON, no extra text.
+        """
+
+        try:
+            response = await self.generate(prompt, "analyze_speech_batch")
+        except Exception as e:
+            logger.error("Gemini API call failed: %s", e)
+            record_fallback("gemini_analysis", "upstream_error")
+            return [None] * len(items)
+
+        response_text = response.text.strip()
+        if response_text.startswith("```json"):
+            response_text = response_text[7:-3]
+        elif response_text.startswith("```"):
+            response_text = response_text[3:-3]
+
+        narratives = [None] * len(items)
+        try:
+            for entry in json.loads(response_text):
+                index = entry.get("index")
+                if isinstance(index, int) and 0 <= index < len(items) and entry.get("key_feedback"):
+                    narratives[index] = {
+                        "key_feedback": list(entry["key_feedback"])[:3],
+                        "improvement_suggestions": list(entry.get("improvement_suggestions") or [])[:3]
+                    }
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            logger.warning("Gemini returned invalid JSON: %s", e, extra={"response": response_text[:500]})
+        missing = narratives.count(None)
+        if missing:
+            record_fallback("gemini_analysis", "invalid_json", missing)
+        return narratives
 
 
     async def simple_test(self) -> str:
         """Simple test to verify Gemini API connectivity."""
-        print("\n🔍 Running Gemini simple test...")
-        print(f"🔍 Model available: {self.model is not None}")
-
         if not self.model:
             return "⚠️ Gemini not configured. Missing API key?"
 
         try:
-            response = await self.model.generate_content_async(
-                "Say exactly: Gemini API is working!"
-            )
-            print("📥 Test response received:", response.text)
+            response = await self.generate("Say exactly: Gemini API is working!", "simple_test")
             return response.text
 
         except Exception as e:
-            print("❌ Gemini simple test failed:", str(e))
-            traceback.print_exc()
+            logger.exception("Gemini simple test failed")
             return f"❌ Gemini test failed: {str(e)}"
 
 
-# Singleton instance used across the app
-gemini_service = GeminiService()
+# Lazily-built singleton used across the app
+get_gemini_service = LazyService("gemini", GeminiService)
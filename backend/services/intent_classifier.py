@@ -0,0 +1,151 @@
+# backend/services/intent_classifier.py
+"""
+Local intent classifier for coaching turns: TF-IDF features (word uni/bigrams
+and in-word character trigrams) with a multinomial logistic regression,
+in plain NumPy. Trained offline by scripts/train_intent_classifier.py and
+loaded from INTENT_MODEL_PATH; a prediction costs tens of microseconds.
+"""
+import logging
+import os
+import re
+import threading
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def extract_terms(text: str) -> list:
+    words = _WORD_RE.findall(text.lower())
+    terms = [f"w:{word}" for word in words]
+    terms += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        terms += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return terms
+
+
+class IntentClassifier:
+    def __init__(self, terms, idf: np.ndarray, weights: np.ndarray, bias: np.ndarray, classes):
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+        self.idf = idf.astype(np.float32)
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.classes = list(classes)
+
+    # ------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------
+    def _sparse_features(self, text: str):
+        """Indices and L2-normalized sublinear TF-IDF values of known terms."""
+        counts = {}
+        for term in extract_terms(text):
+            index = self.vocabulary.get(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+        if not counts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        values = tf * self.idf[indices]
+        return indices, values / np.linalg.norm(values)
+
+    # ------------------------------------------------------------------
+    # Inference
+    # ------------------------------------------------------------------
+    def predict_proba(self, text: str) -> np.ndarray:
+        indices, values = self._sparse_features(text)
+        logits = self.bias + values @ self.weights[indices]
+        logits = logits - logits.max()
+        exp = np.exp(logits)
+        return exp / exp.sum()
+
+    def predict(self, text: str) -> tuple:
+        """Return (intent, confidence)."""
+        proba = self.predict_proba(text)
+        best = int(proba.argmax())
+        return self.classes[best], float(proba[best])
+
+    # ------------------------------------------------------------------
+    # Training and persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def train(cls, texts: list, labels: list, epochs: int = 1000, learning_rate: float = 10.0, l2: float = 1e-4):
+        """Fit on labelled turns with full-batch gradient descent (small data)."""
+        classes = sorted(set(labels))
+        documents = [extract_terms(text) for text in texts]
+        terms = sorted({term for doc in documents for term in doc})
+        vocabulary = {term: index for index, term in enumerate(terms)}
+
+        document_frequency = np.zeros(len(terms), dtype=np.float64)
+        for doc in documents:
+            for term in set(doc):
+                document_frequency[vocabulary[term]] += 1
+        idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+
+        model = cls(terms, idf, np.zeros((len(terms), len(classes))), np.zeros(len(classes)), classes)
+        features = np.zeros((len(texts), len(terms)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            indices, values = model._sparse_features(text)
+            features[row, indices] = values
+        targets = np.zeros((len(texts), len(classes)))
+        targets[np.arange(len(texts)), [classes.index(label) for label in labels]] = 1.0
+
+        weights = np.zeros((len(terms), len(classes)))
+        bias = np.log(targets.mean(axis=0))
+        for _ in range(epochs):
+            logits = features @ weights + bias
+            logits -= logits.max(axis=1, keepdims=True)
+            proba = np.exp(logits)
+            proba /= proba.sum(axis=1, keepdims=True)
+            error = (proba - targets) / len(texts)
+            weights -= learning_rate * (features.T @ error + l2 * weights)
+            bias -= learning_rate * error.sum(axis=0)
+
+        return cls(terms, idf, weights, bias, classes)
+
+    def save(self, path: str):
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            terms=np.array(terms),
+            idf=self.idf,
+            weights=self.weights,
+            bias=self.bias,
+            classes=np.array(self.classes)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["terms"].tolist(), data["idf"], data["weights"], data["bias"], data["classes"].tolist())
+
+
+_classifier = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def load_intent_classifier():
+    """
+    Load the trained model once per process (preloaded before fork in
+    production). Returns None if no model file is available.
+    """
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                try:
+                    _classifier = IntentClassifier.load(settings.INTENT_MODEL_PATH)
+                    logger.info("Intent classifier loaded: %d terms, %d intents",
+                                len(_classifier.vocabulary), len(_classifier.classes))
+                except (OSError, KeyError, ValueError) as e:
+                    logger.warning("Intent classifier unavailable (%s); using keyword intents", e)
+                    _classifier = None
+                _classifier_loaded = True
+    return _classifier
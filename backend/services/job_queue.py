@@ -0,0 +1,297 @@
+# backend/services/job_queue.py
+"""
+Persistent background job queue on SQLite.
+
+Heavy work (transcription, prosody alignment, comparison narratives, speech
+reports) is enqueued here by the API and executed by a separate pool of
+worker processes (services/job_worker.py), so load spikes queue up instead
+of tying up API workers.
+
+- Priorities: "interactive" jobs are always claimed before "batch" jobs.
+- Retries: failed attempts are retried with exponential backoff up to
+  max_attempts; ValueError (bad input) fails at once.
+- Idempotency: enqueueing with an idempotency key that already exists
+  returns the existing job instead of creating a new one.
+- Crash safety: claims are leases, renewed by the worker's heartbeat while
+  the job runs; a job whose worker died is re-queued once its lease expires
+  (or failed, if that was its last attempt), and a worker that lost its
+  lease can no longer complete or fail the job.
+
+The database runs in WAL mode and every operation uses its own short
+connection, so API threads and worker processes can share it safely.
+"""
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+from config.settings import settings
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {"interactive": 0, "batch": 10}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    idempotency_key TEXT UNIQUE,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority, available_at, created_at);
+"""
+
+_PUBLIC_FIELDS = ("id", "kind", "status", "priority", "attempts", "max_attempts", "error",
+                  "created_at", "started_at", "finished_at")
+
+
+class JobQueue:
+    def __init__(self, path: str = None, spool_dir: str = None):
+        self.path = path or settings.JOB_QUEUE_PATH
+        self.spool_dir = spool_dir or settings.JOB_SPOOL_DIR
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit: each statement is its own transaction unless BEGIN is explicit
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # API side
+    # ------------------------------------------------------------------
+    def enqueue(self, kind: str, payload: dict, priority: str = "interactive",
+                idempotency_key: str = None, max_attempts: int = None) -> dict:
+        """
+        Add a job. If `idempotency_key` was already used, returns that job
+        instead, marked "duplicate": True.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{priority}'; use one of {sorted(PRIORITIES)}")
+        now = time.time()
+        job_id = f"job_{uuid.uuid4().hex}"
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, priority, status, max_attempts, idempotency_key, created_at, available_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?) ON CONFLICT(idempotency_key) DO NOTHING",
+                (job_id, kind, json.dumps(payload), PRIORITIES[priority],
+                 max_attempts or settings.JOB_MAX_ATTEMPTS, idempotency_key, now, now)
+            )
+            if idempotency_key:
+                row = conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+            else:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        job = self._public(row)
+        if row["id"] != job_id:
+            job["duplicate"] = True
+        return job
+
+    def spool(self, data: bytes, suffix: str = "") -> str:
+        """Store upload bytes for a job payload; the file is removed when the job finishes."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        path = os.path.join(self.spool_dir, f"{uuid.uuid4().hex}{suffix}")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def get(self, job_id: str, with_result: bool = False):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = self._public(row)
+        if with_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def list(self, status: str = None, limit: int = 50) -> list:
+        query, args = "SELECT * FROM jobs", ()
+        if status:
+            query, args = query + " WHERE status = ?", (status,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC LIMIT ?", args + (limit,)).fetchall()
+        return [self._public(row) for row in rows]
+
+    def counts(self) -> dict:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def claim(self, worker: str):
+        """Lease the highest-priority runnable job to `worker`; None if the queue is idle."""
+        now = time.time()
+        with self._connect() as conn:
+            # IMMEDIATE takes the write lock up front, so two workers can
+            # never claim the same row
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Recover jobs whose worker died mid-run: retry them, unless
+                # that was their last attempt
+                exhausted = conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Worker died', worker = NULL, finished_at = ?, "
+                    "lease_until = NULL WHERE status = 'running' AND lease_until < ? AND attempts >= max_attempts "
+                    "RETURNING payload",
+                    (now, now)
+                ).fetchall()
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', error = 'Worker died', worker = NULL, lease_until = NULL "
+                    "WHERE status = 'running' AND lease_until < ?",
+                    (now,)
+                )
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ? "
+                    "ORDER BY priority, created_at LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?, "
+                        "started_at = ?, lease_until = ? WHERE id = ?",
+                        (worker, now, now + settings.JOB_LEASE_SECONDS, row["id"])
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        for lost in exhausted:
+            self.discard_files(json.loads(lost["payload"]).get("files", []))
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["attempts"] += 1
+        job["worker"] = worker
+        return job
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend `worker`'s lease on a running job; False if the lease was already lost."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = 'running' AND worker = ?",
+                (time.time() + settings.JOB_LEASE_SECONDS, job_id, worker)
+            )
+        return cursor.rowcount > 0
+
+    def complete(self, job_id: str, result, worker: str = None) -> bool:
+        """
+        Store the result of a running job. With `worker`, only while that
+        worker still holds the lease; returns False if it was lost.
+        """
+        query, args = "WHERE id = ? AND status = 'running'", (job_id,)
+        if worker is not None:
+            query, args = query + " AND worker = ?", args + (worker,)
+        with self._connect() as conn:
+            # fetchall: a RETURNING statement only finishes once fully read
+            rows = conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, finished_at = ?, lease_until = NULL "
+                + query + " RETURNING payload",
+                (json.dumps(result), time.time()) + args
+            ).fetchall()
+        if not rows:
+            logger.warning("Result for job %s dropped: its lease was lost", job_id)
+            return False
+        self.discard_files(json.loads(rows[0]["payload"]).get("files", []))
+        return True
+
+    def fail(self, job_id: str, error: str, retry: bool = True, worker: str = None) -> str:
+        """
+        Record a failed attempt; returns the new status (queued for retry, or
+        failed). With `worker`, only while that worker still holds the lease
+        ("lost" otherwise).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT attempts, max_attempts, payload, status, worker FROM jobs WHERE id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("ROLLBACK")
+                    return "missing"
+                if worker is not None and (row["status"] != "running" or row["worker"] != worker):
+                    conn.execute("ROLLBACK")
+                    logger.warning("Failure of job %s dropped: its lease was lost", job_id)
+                    return "lost"
+                if retry and row["attempts"] < row["max_attempts"]:
+                    delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (row["attempts"] - 1)
+                    conn.execute(
+                        "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, lease_until = NULL WHERE id = ?",
+                        (error, now + delay, job_id)
+                    )
+                    conn.execute("COMMIT")
+                    return "queued"
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, lease_until = NULL WHERE id = ?",
+                    (error, now, job_id)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.discard_files(json.loads(row["payload"]).get("files", []))
+        return "failed"
+
+    def purge(self, older_than_seconds: float) -> int:
+        """Delete finished jobs older than the retention window."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (time.time() - older_than_seconds,)
+            )
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _public(row) -> dict:
+        job = {field: row[field] for field in _PUBLIC_FIELDS}
+        job["priority"] = next((name for name, value in PRIORITIES.items() if value == row["priority"]), row["priority"])
+        return job
+
+    def discard_files(self, paths: list):
+        """Remove spooled files (only ever inside the spool directory)."""
+        for path in paths:
+            if os.path.commonpath([os.path.abspath(path), os.path.abspath(self.spool_dir)]) == os.path.abspath(self.spool_dir):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        """Drop all jobs and spooled files (benchmarks, local resets)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs")
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+
+# Lazily-built singleton instance
+get_job_queue = LazyService("job_queue", JobQueue)
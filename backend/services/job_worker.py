@@ -0,0 +1,265 @@
+# backend/services/job_worker.py
+"""
+Worker processes for the background job queue (services/job_queue.py).
+
+With JOB_WORKERS > 0 the pool is started automatically: as a supervisor
+process next to the gunicorn master in production (gunicorn.conf.py), or by
+the app lifespan when running a single uvicorn process. It can also run on its own, next to an
+app started with JOB_WORKERS=0:
+
+    python -m services.job_worker [--workers N]
+
+Workers are spawned (not forked) so they never inherit gRPC channels or
+event loops from the API process.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+from config.settings import settings
+from services.job_queue import JobQueue
+from services.metrics_service import JOBS, JOB_DURATION
+
+logger = logging.getLogger(__name__)
+
+# One event loop per worker process: async clients (Gemini) stay bound to it
+_loop = None
+
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+# ---------------------------------------------------------------------------
+# Job handlers: payload dict -> JSON-serializable result
+# ---------------------------------------------------------------------------
+def _transcription(payload: dict) -> dict:
+    from services.practice_stt_service import get_practice_stt_service
+
+    audio = _read(payload["files"][0])
+    stt = get_practice_stt_service()
+    return {
+        "text": stt.transcribe_practice_speech(audio),
+        "recording_quality": stt.analyze_recording_quality(audio),
+        "is_mock": True
+    }
+
+
+def _prosody_comparison(payload: dict) -> dict:
+    from services.comparison_service import get_comparison_service
+
+    user_path, reference_path = payload["files"]
+    return get_comparison_service().compare_prosody(_read(user_path), _read(reference_path))
+
+
+def _comparison(payload: dict) -> dict:
+    from services.comparison_service import get_comparison_service
+
+    return _run(get_comparison_service().compare_with_professional(payload["text"], payload.get("professional_id")))
+
+
+def _speech_report(payload: dict) -> dict:
+    """Local scores plus Gemini narrative, saved to the session when one is given."""
+    from services.firebase_service import get_firebase_service
+    from services.gemini_service import get_gemini_service
+    from services.speech_scorer import get_speech_scorer
+
+    text = payload["text"]
+    feedback = get_speech_scorer().score(text, payload.get("duration_seconds"))
+    narrative = _run(get_gemini_service().narrate_speech(text, feedback))
+    if narrative:
+        feedback.update(narrative)
+        feedback["is_real_ai"] = True
+    report = {"text": text, "feedback": feedback, "analysis_type": "speech_coaching"}
+    if payload.get("session_id"):
+        get_firebase_service().save_analysis(payload["session_id"], report)
+    return report
+
+
+def _archive(payload: dict) -> dict:
+    from services.recording_archive import get_recording_archive
+
+    return get_recording_archive().store(payload["recording_id"], payload["files"][0])
+
+
+JOB_HANDLERS = {
+    "transcription": _transcription,
+    "prosody_comparison": _prosody_comparison,
+    "comparison": _comparison,
+    "speech_report": _speech_report,
+    "archive": _archive,
+}
+
+# Kinds whose input is uploaded audio, with the upload fields they take in order
+UPLOAD_KINDS = {
+    "transcription": ("file",),
+    "prosody_comparison": ("file", "reference"),
+}
+
+# Kinds only queued by their own endpoints, never through /api/jobs
+INTERNAL_KINDS = {"archive"}
+
+
+# ---------------------------------------------------------------------------
+# Worker loop
+# ---------------------------------------------------------------------------
+def _heartbeat(queue: JobQueue, job: dict, done: threading.Event):
+    """Renew the job's lease until `done` is set, so long jobs are not taken for dead."""
+    while not done.wait(settings.JOB_HEARTBEAT_SECONDS):
+        try:
+            if not queue.renew(job["id"], job["worker"]):
+                logger.warning("Job %s lost its lease while running", job["id"])
+                return
+        except Exception as e:
+            logger.error("Lease renewal for job %s failed: %s", job["id"], e)
+
+
+def execute(queue: JobQueue, job: dict):
+    kind = job["kind"]
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        queue.fail(job["id"], f"Unknown job kind '{kind}'", retry=False, worker=job["worker"])
+        JOBS.labels(kind=kind, status="failed").inc()
+        return
+
+    start = time.perf_counter()
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(queue, job, done), name=f"job-heartbeat-{job['id']}", daemon=True
+    )
+    heartbeat.start()
+    try:
+        result = handler(job["payload"])
+    except (ValueError, KeyError) as e:
+        # Bad input: retrying cannot help
+        status = queue.fail(job["id"], f"{type(e).__name__}: {e}", retry=False, worker=job["worker"])
+    except Exception as e:
+        logger.exception("Job %s (%s) attempt %d failed", job["id"], kind, job["attempts"])
+        status = queue.fail(job["id"], f"{type(e).__name__}: {e}", worker=job["worker"])
+    else:
+        status = "done" if queue.complete(job["id"], result, worker=job["worker"]) else "lost"
+    finally:
+        done.set()
+    JOB_DURATION.labels(kind=kind).observe(time.perf_counter() - start)
+    JOBS.labels(kind=kind, status="retried" if status == "queued" else status).inc()
+
+
+def run_worker(worker_id: str, stop_event, queue_path: str = None):
+    """Process entry point: claim and run jobs until `stop_event` is set."""
+    from config.logging_config import configure_logging
+
+    configure_logging()
+    # Ctrl-C reaches the whole process group; shutdown is driven by stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    queue = JobQueue(queue_path)
+    logger.info("Job worker %s started (pid %d)", worker_id, os.getpid())
+    while not stop_event.is_set():
+        job = queue.claim(worker_id)
+        if job is None:
+            stop_event.wait(settings.JOB_POLL_SECONDS)
+            continue
+        execute(queue, job)
+    logger.info("Job worker %s stopped", worker_id)
+
+
+class JobWorkerPool:
+    """Starts the worker processes, restarts any that die, purges old jobs and voice-load buckets, and sweeps the recording archive."""
+
+    def __init__(self, workers: int = None, queue_path: str = None):
+        self.workers = workers or settings.JOB_WORKERS
+        self.queue_path = queue_path or settings.JOB_QUEUE_PATH
+        self._context = multiprocessing.get_context("spawn")
+        self._stop = self._context.Event()
+        self._processes = {}
+        self._monitor = None
+
+    def start(self):
+        # Create the schema once before the workers race to do it
+        JobQueue(self.queue_path)
+        for index in range(self.workers):
+            self._spawn(f"worker-{index}")
+        self._monitor = threading.Thread(target=self._supervise, name="job-pool-monitor", daemon=True)
+        self._monitor.start()
+        logger.info("Job worker pool started: %d workers, queue %s", self.workers, self.queue_path)
+
+    def _spawn(self, worker_id: str):
+        process = self._context.Process(
+            target=run_worker, args=(worker_id, self._stop, self.queue_path),
+            name=f"job-{worker_id}", daemon=True
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def _supervise(self):
+        last_purge = 0.0
+        while not self._stop.wait(5.0):
+            for worker_id, process in list(self._processes.items()):
+                if not process.is_alive():
+                    logger.warning("Job worker %s exited (code %s); restarting", worker_id, process.exitcode)
+                    self._spawn(worker_id)
+            if time.monotonic() - last_purge > 3600:
+                last_purge = time.monotonic()
+                try:
+                    purged = JobQueue(self.queue_path).purge(settings.JOB_RETENTION_SECONDS)
+                    if purged:
+                        logger.info("Purged %d finished jobs", purged)
+                except Exception as e:
+                    logger.error("Job purge failed: %s", e)
+                try:
+                    from services.recording_archive import RecordingArchive
+
+                    RecordingArchive().sweep()
+                except Exception as e:
+                    logger.error("Archive sweep failed: %s", e)
+                try:
+                    from services.voice_load import VoiceLoadStore
+
+                    VoiceLoadStore().purge()
+                except Exception as e:
+                    logger.error("Voice-load purge failed: %s", e)
+
+    def stop(self, timeout: float = None):
+        """Let running jobs finish (up to `timeout`), then terminate stragglers."""
+        self._stop.set()
+        deadline = time.monotonic() + (settings.SHUTDOWN_DRAIN_SECONDS if timeout is None else timeout)
+        for process in self._processes.values():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                # Its job is re-queued when the lease expires
+                process.terminate()
+        logger.info("Job worker pool stopped")
+
+
+def main():
+    from config.logging_config import configure_logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.JOB_WORKERS or 2)
+    args = parser.parse_args()
+
+    configure_logging()
+    pool = JobWorkerPool(args.workers)
+    pool.start()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    signal.signal(signal.SIGINT, lambda *_: stopped.set())
+    while not stopped.wait(1.0):
+        pass
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
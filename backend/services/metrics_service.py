@@ -0,0 +1,147 @@
+# backend/services/metrics_service.py
+"""
+Prometheus metrics shared by the API and services.
+
+With several gunicorn workers each process keeps its own counters; set
+PROMETHEUS_MULTIPROC_DIR (gunicorn.conf.py does this) and /metrics
+aggregates across workers.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    REGISTRY,
+)
+from prometheus_client import multiprocess
+
+from services.tracing_service import span
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to Gemini, ElevenLabs and Firestore",
+    ["upstream", "operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Failed calls to Gemini, ElevenLabs and Firestore",
+    ["upstream", "operation"]
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit ratio = hit / (hit + miss))",
+    ["cache", "result"]
+)
+
+QUEUE_DEPTH = Gauge(
+    "queue_depth",
+    "Items waiting in in-process queues",
+    ["queue"],
+    multiprocess_mode="livesum"
+)
+
+CONTEXT_TOKENS = Histogram(
+    "conversation_context_tokens",
+    "Estimated tokens of conversation history/summary included per prompt",
+    buckets=(25, 50, 100, 200, 400, 600, 800, 1200, 2000, 4000)
+)
+
+PROMPT_TOKENS = Counter(
+    "gemini_prompt_tokens_total",
+    "Gemini input tokens by whether they were served from the prompt cache",
+    ["operation", "kind"]
+)
+
+COACH_ROUTES = Counter(
+    "coach_turns_total",
+    "Coaching turns by route (local canned answer or Gemini) and classified intent",
+    ["route", "intent"]
+)
+
+JOBS = Counter(
+    "background_jobs_total",
+    "Background job attempts by kind and outcome (done, retried, failed)",
+    ["kind", "status"]
+)
+
+JOB_DURATION = Histogram(
+    "background_job_duration_seconds",
+    "Background job attempt run time by kind",
+    ["kind"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+
+SPECULATIVE_TTS = Counter(
+    "speculative_tts_total",
+    "Speculative coach-reply syntheses by outcome (started, failed); hits are in cache_requests_total",
+    ["outcome"]
+)
+
+VOICE_TURN_LATENCY = Histogram(
+    "voice_turn_seconds",
+    "Time from upload to each voice turn milestone (transcript, first_audio, complete)",
+    ["stage"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 1.5, 2, 3, 5, 10, 30)
+)
+
+FALLBACKS = Counter(
+    "fallback_responses_total",
+    "Responses served from mock or canned fallback paths",
+    ["component", "reason"]
+)
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str):
+    """
+    Time an upstream call (also traced as an `upstream.operation` span);
+    exceptions are counted as errors and re-raised.
+    """
+    start = time.perf_counter()
+    try:
+        with span(f"{upstream}.{operation}"):
+            yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(upstream, operation).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(upstream, operation).observe(time.perf_counter() - start)
+
+
+def record_upstream_error(upstream: str, operation: str):
+    """Count a failed upstream call that did not raise (e.g. non-200 response)."""
+    UPSTREAM_ERRORS.labels(upstream, operation).inc()
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_fallback(component: str, reason: str, count: int = 1):
+    FALLBACKS.labels(component, reason).inc(count)
+
+
+def metrics_payload() -> tuple:
+    """Return (body, content_type) for the /metrics endpoint."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
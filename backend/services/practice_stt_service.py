@@ -1,6 +1,18 @@
 # backend/services/practice_stt_service.py
+import logging
+
+from config.settings import settings
+from services.providers import LazyService
+from services.audio_pool import get_audio_pool
+from services.audio_preprocess import decode_recording, get_audio_preprocessor
+from services.filler_detector import detect_fillers
+from services.metrics_service import record_fallback
+from services.tracing_service import span
+from services.voice_quality import get_voice_quality_service
 import random
 
+logger = logging.getLogger(__name__)
+
 class PracticeSTTService:
     """Speech-to-text service SPECIFIC for practice sessions"""
     
@@ -24,14 +36,94 @@ class PracticeSTTService:
         # Return a random sample (in real app, this would use actual STT)
         return random.choice(practice_samples)
     
-    def analyze_recording_quality(self, audio_bytes: bytes) -> dict:
-        """Mock analysis of recording quality"""
+    def prepare(self, audio_bytes):
+        """
+        (samples, sample_rate, report) of a recording cleaned up for STT and
+        analysis: 16 kHz mono, noise-reduced, loudness-normalized. Browser
+        webm/mp4 is decoded with ffmpeg; None if the audio cannot be decoded
+        (or ffmpeg is missing). A real STT backend would be sent
+        encode_wav(samples, sample_rate).
+        """
+        return prepare_audio(audio_bytes)
+    
+    def analyze_recording_quality(self, audio) -> dict:
+        """
+        Recording quality, voice-quality (strain) measures and acoustic
+        fillers, computed on the pre-processed audio in the audio process pool.
+        `audio` is a SpooledAudio (handed to the pool by file or shared
+        memory, not copied through pickling) or bytes.
+        """
+        analysis = get_audio_pool().run_audio(analyze_audio, audio)
+        if analysis is None:
+            voice = {"available": False, "reason": "Could not decode recording"}
+            fillers = voice
+        else:
+            voice, fillers, report = analysis["voice_quality"], analysis["fillers"], analysis["preprocessing"]
+        if not voice.get("available"):
+            # Not decodable or too little voicing: mock values as before
+            return {
+                "duration_seconds": len(getattr(audio, "data", audio)) / 16000,  # Mock calculation
+                "clarity_indicator": random.uniform(0.7, 0.95),
+                "background_noise": random.uniform(0.1, 0.3),
+                "volume_level": "good",
+                "voice_quality": voice,
+                "fillers": fillers
+            }
+        
+        # HNR of 0-25 dB mapped onto the 0-1 clarity scale; noise as amplitude relative to
+        # speech, from the noise floor before noise reduction
+        clarity = min(max(voice["hnr_db"] / 25.0, 0.0), 1.0)
+        noise_floor = report.get("noise_floor_dbfs")
+        if noise_floor is None:
+            noise_floor = voice["noise_floor_dbfs"]
+        noise = min(10 ** ((min(noise_floor, voice["speech_level_dbfs"]) - voice["speech_level_dbfs"]) / 20), 1.0)
+        if voice["speech_level_dbfs"] < -35:
+            volume = "low"
+        elif voice["speech_level_dbfs"] > -6:
+            volume = "high"
+        else:
+            volume = "good"
         return {
-            "duration_seconds": len(audio_bytes) / 16000,  # Mock calculation
-            "clarity_indicator": random.uniform(0.7, 0.95),
-            "background_noise": random.uniform(0.1, 0.3),
-            "volume_level": "good"
+            "duration_seconds": analysis["duration_seconds"],
+            "clarity_indicator": round(clarity, 3),
+            "background_noise": round(noise, 3),
+            "volume_level": volume,
+            "voice_quality": voice,
+            "fillers": fillers,
+            "preprocessing": report
         }
 
-# Create singleton instance
-practice_stt_service = PracticeSTTService()
\ No newline at end of file
+
+def prepare_audio(audio_bytes):
+    """See PracticeSTTService.prepare."""
+    try:
+        if settings.PREPROCESS_ENABLED:
+            return get_audio_preprocessor().process(audio_bytes)
+        samples, sample_rate = decode_recording(audio_bytes)
+    except FileNotFoundError:
+        logger.warning("ffmpeg not found (%s); cannot decode non-WAV recordings", settings.PREPROCESS_FFMPEG)
+        record_fallback("audio_decode", "ffmpeg_unavailable")
+        return None
+    except ValueError as e:
+        logger.info("Recording not analyzed: %s", e)
+        return None
+    return samples, sample_rate, {"sample_rate": sample_rate, "gain_db": 0.0, "noise_floor_dbfs": None}
+
+
+def analyze_audio(audio_bytes: bytes):
+    """The CPU-heavy part of the recording analysis; runs in an audio pool process. None if not decodable."""
+    prepared = prepare_audio(audio_bytes)
+    if prepared is None:
+        return None
+    samples, sample_rate, report = prepared
+    with span("fillers.detect"):
+        fillers = detect_fillers(samples, sample_rate)
+    return {
+        "duration_seconds": round(len(samples) / sample_rate, 2),
+        "voice_quality": get_voice_quality_service().analyze_samples(samples, sample_rate, report["gain_db"]),
+        "fillers": fillers,
+        "preprocessing": report,
+    }
+
+# Lazily-built singleton instance
+get_practice_stt_service = LazyService("practice_stt", PracticeSTTService)
\ No newline at end of file
@@ -0,0 +1,260 @@
+# backend/services/prosody_service.py
+import numpy as np
+from dataclasses import dataclass
+from config.settings import settings
+from services.audio_io import decode_wav
+from services.audio_features import pitch_track
+from services.cache import TTLCache
+from services.metrics_service import record_cache
+from services.tracing_service import span
+from services.uploads import audio_digest
+
+
+@dataclass
+class ProsodyContour:
+    """Speaker-normalized pitch and energy contours at a fixed frame rate."""
+    pitch: np.ndarray      # semitones relative to the speaker's median pitch, interpolated over unvoiced frames
+    energy: np.ndarray     # dB relative to the speaker's loud (95th percentile) level
+    voiced: np.ndarray     # fraction of voiced analysis frames per contour frame
+    frame_rate: float
+
+    @property
+    def duration(self) -> float:
+        return len(self.pitch) / self.frame_rate
+
+
+class ProsodyService:
+    """
+    Aligns a user's pitch/energy contours with a professional's recording using
+    banded dynamic time warping and turns the warping path into per-segment
+    coaching deltas ("you rush here").
+    """
+
+    def __init__(self):
+        self.analysis_hop_seconds = 0.01   # pitch tracker hop
+        self.contour_frame_rate = 25.0     # contour rate used for alignment (40 ms frames)
+        self.band_fraction = 0.1           # Sakoe-Chiba band as a fraction of the longer clip
+        self.min_band_seconds = 2.0
+        self.segment_seconds = 3.0
+        self.weights = {"pitch": 1.0, "energy": 0.5, "voicing": 1.0}
+        self.pitch_scale = 2.0             # semitones treated as one unit of cost
+        self.energy_scale = 6.0            # dB treated as one unit of cost
+        # Contours by recording digest: re-comparing a recording skips decoding and pitch tracking
+        self._contours = TTLCache(maxsize=settings.PROSODY_CONTOUR_CACHE_SIZE, ttl=settings.STT_CACHE_TTL_SECONDS)
+
+    # ------------------------------------------------------------------
+    # Contour extraction
+    # ------------------------------------------------------------------
+    def extract_contour(self, samples: np.ndarray, sample_rate: int) -> ProsodyContour:
+        """Extract a pooled, speaker-normalized prosody contour from mono samples."""
+        hop = max(1, int(sample_rate * self.analysis_hop_seconds))
+        f0, voiced, _, energy_db = pitch_track(samples, sample_rate, hop)
+
+        # Pool analysis frames down to the contour rate
+        pool = max(1, int(round((sample_rate / hop) / self.contour_frame_rate)))
+        n = len(f0) // pool
+        if n == 0:
+            raise ValueError("Recording too short for prosody analysis")
+        f0 = f0[:n * pool].reshape(n, pool)
+        voiced = voiced[:n * pool].reshape(n, pool)
+        energy_db = energy_db[:n * pool].reshape(n, pool)
+
+        voiced_fraction = voiced.mean(axis=1)
+        voiced_counts = voiced.sum(axis=1)
+        log_f0 = np.where(voiced, np.log2(np.where(voiced, f0, 1.0)), 0.0)
+        has_pitch = voiced_counts > 0
+        semitones = 12.0 * log_f0.sum(axis=1) / np.maximum(voiced_counts, 1)
+        if has_pitch.any():
+            semitones = semitones - np.median(semitones[has_pitch])
+            idx = np.arange(n)
+            semitones = np.interp(idx, idx[has_pitch], semitones[has_pitch])
+        else:
+            semitones = np.zeros(n)
+
+        energy = energy_db.mean(axis=1)
+        energy = energy - np.percentile(energy, 95)
+
+        return ProsodyContour(
+            pitch=semitones,
+            energy=energy,
+            voiced=voiced_fraction,
+            frame_rate=(sample_rate / hop) / pool
+        )
+
+    # ------------------------------------------------------------------
+    # Banded DTW
+    # ------------------------------------------------------------------
+    def _features(self, contour: ProsodyContour) -> np.ndarray:
+        return np.column_stack([
+            contour.pitch / self.pitch_scale,
+            contour.energy / self.energy_scale,
+            contour.voiced
+        ])
+
+    def _frame_costs(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Weighted L1 cost between one user frame and a slice of reference frames."""
+        diff = np.abs(y - x)
+        # Pitch is only meaningful where both frames are mostly voiced
+        pitch_weight = self.weights["pitch"] * np.minimum(x[2], y[:, 2])
+        return (pitch_weight * diff[:, 0]
+                + self.weights["energy"] * diff[:, 1]
+                + self.weights["voicing"] * diff[:, 2])
+
+    def banded_dtw(self, x: np.ndarray, y: np.ndarray, radius: int) -> tuple:
+        """
+        Sakoe-Chiba banded DTW between feature sequences x (n, d) and y (m, d).
+
+        Each row is solved in vectorized form: the horizontal dependency
+        D[i, j] = min(P[j], c[j] + D[i, j - 1]) unrolls to
+        D[i, j] = C[j] + min_{k <= j}(P[k] - C[k]) with C the running sum of
+        the row costs, so a row costs one cumsum and one minimum.accumulate.
+        Returns (total_cost, path) with path as an (L, 2) array of index pairs.
+        """
+        n, m = len(x), len(y)
+        centers = np.round(np.arange(n) * (m - 1) / max(n - 1, 1)).astype(int)
+        lo = np.clip(centers - radius, 0, m - 1)
+        hi = np.clip(centers + radius + 1, 1, m)
+        lo[0], hi[-1] = 0, m
+        # Keep the band connected so every row is reachable from the previous one
+        lo[1:] = np.minimum(lo[1:], hi[:-1])
+
+        width = int((hi - lo).max())
+        D = np.full((n, width), np.inf)
+
+        for i in range(n):
+            a, b = lo[i], hi[i]
+            c = self._frame_costs(x[i], y[a:b])
+            if i == 0:
+                P = np.full(b - a, np.inf)
+                P[0] = c[0]
+            else:
+                pa, pb = lo[i - 1], hi[i - 1]
+                prev = np.full(b - a + 1, np.inf)   # prev[k] = D[i-1, a-1+k]
+                s, e = max(a - 1, pa), min(b, pb)
+                if e > s:
+                    prev[s - a + 1:e - a + 1] = D[i - 1, s - pa:e - pa]
+                P = c + np.minimum(prev[1:], prev[:-1])
+            C = np.cumsum(c)
+            D[i, :b - a] = C + np.minimum.accumulate(P - C)
+
+        return D[n - 1, m - 1 - lo[n - 1]], self._backtrack(D, lo, hi)
+
+    @staticmethod
+    def _backtrack(D: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        def cell(i, j):
+            if i < 0 or j < lo[i] or j >= hi[i]:
+                return np.inf
+            return D[i, j - lo[i]]
+
+        i, j = len(lo) - 1, int(hi[-1]) - 1
+        path = [(i, j)]
+        while i > 0 or j > 0:
+            diag, up, left = cell(i - 1, j - 1), cell(i - 1, j), cell(i, j - 1)
+            if diag <= up and diag <= left:
+                i, j = i - 1, j - 1
+            elif up <= left:
+                i -= 1
+            else:
+                j -= 1
+            path.append((i, j))
+        return np.array(path[::-1])
+
+    # ------------------------------------------------------------------
+    # Comparison
+    # ------------------------------------------------------------------
+    def compare_contours(self, user: ProsodyContour, reference: ProsodyContour) -> dict:
+        """Align two contours and summarize cost and per-segment deltas."""
+        x, y = self._features(user), self._features(reference)
+        longest = max(len(x), len(y))
+        radius = max(
+            int(self.band_fraction * longest),
+            int(self.min_band_seconds * user.frame_rate),
+            abs(len(x) - len(y))
+        )
+        total_cost, path = self.banded_dtw(x, y, radius)
+        normalized_cost = float(total_cost / len(path))
+
+        return {
+            "alignment_cost": round(normalized_cost, 4),
+            "prosody_similarity": round(100.0 * float(np.exp(-normalized_cost)), 1),
+            "user_duration_seconds": round(user.duration, 2),
+            "reference_duration_seconds": round(reference.duration, 2),
+            "tempo_ratio": round(reference.duration / max(user.duration, 1e-6), 2),
+            "pitch_range": {
+                "user_semitones": round(float(np.std(user.pitch)), 2),
+                "reference_semitones": round(float(np.std(reference.pitch)), 2)
+            },
+            "segments": self._segment_deltas(user, reference, path),
+            "band_radius_frames": radius,
+            "path_length": int(len(path))
+        }
+
+    def _segment_deltas(self, user: ProsodyContour, reference: ProsodyContour, path: np.ndarray) -> list:
+        """Split the user's timeline into fixed segments and describe each against the reference."""
+        frames_per_segment = max(1, int(self.segment_seconds * user.frame_rate))
+        n_segments = int(np.ceil(len(user.pitch) / frames_per_segment))
+        user_idx, ref_idx = path[:, 0], path[:, 1]
+        seg_of_step = user_idx // frames_per_segment
+
+        segments = []
+        for s in range(n_segments):
+            steps = seg_of_step == s
+            if not steps.any():
+                continue
+            u, r = user_idx[steps], ref_idx[steps]
+            user_frames = u.max() - u.min() + 1
+            ref_frames = r.max() - r.min() + 1
+            tempo = ref_frames / user_frames
+            pitch_delta = float(np.mean(user.pitch[u] - reference.pitch[r]))
+            energy_delta = float(np.mean(user.energy[u] - reference.energy[r]))
+            user_range = float(np.std(user.pitch[u]))
+            ref_range = float(np.std(reference.pitch[r]))
+
+            notes = []
+            if tempo > 1.25:
+                notes.append("You rush here - slow down to match the reference pacing")
+            elif tempo < 0.8:
+                notes.append("You drag here - tighten the pacing")
+            if ref_range > 1.0 and user_range < 0.6 * ref_range:
+                notes.append("Your pitch is flatter than the reference - add more vocal variety")
+            if energy_delta < -6.0:
+                notes.append("Project more - you are noticeably quieter than the reference")
+            elif energy_delta > 6.0:
+                notes.append("Ease off the volume a little here")
+
+            segments.append({
+                "start_seconds": round(float(u.min()) / user.frame_rate, 2),
+                "end_seconds": round(float(u.max() + 1) / user.frame_rate, 2),
+                "reference_start_seconds": round(float(r.min()) / reference.frame_rate, 2),
+                "reference_end_seconds": round(float(r.max() + 1) / reference.frame_rate, 2),
+                "tempo_ratio": round(float(tempo), 2),
+                "pitch_delta_semitones": round(pitch_delta, 2),
+                "pitch_range_delta_semitones": round(user_range - ref_range, 2),
+                "energy_delta_db": round(energy_delta, 2),
+                "notes": notes
+            })
+        return segments
+
+    def recording_contour(self, audio: bytes, digest: str = None) -> ProsodyContour:
+        """Contour of a WAV recording, cached by content digest."""
+        digest = digest or audio_digest(audio)
+        contour = self._contours.get(digest)
+        record_cache("prosody_contours", contour is not None)
+        if contour is None:
+            with span("prosody.decode"):
+                samples, sample_rate = decode_wav(audio)
+            with span("prosody.extract_contour"):
+                contour = self.extract_contour(samples, sample_rate)
+            self._contours.set(digest, contour)
+        return contour
+
+    def compare_recordings(self, user_audio: bytes, reference_audio: bytes,
+                           user_digest: str = None, reference_digest: str = None) -> dict:
+        """Compare the prosody of two WAV recordings (digests from read_upload, if known)."""
+        user = self.recording_contour(user_audio, user_digest)
+        reference = self.recording_contour(reference_audio, reference_digest)
+        with span("prosody.align"):
+            return self.compare_contours(user, reference)
+
+# Create singleton instance
+prosody_service = ProsodyService()
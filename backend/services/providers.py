@@ -0,0 +1,73 @@
+# backend/services/providers.py
+import asyncio
+import threading
+import time
+
+
+class LazyService:
+    """
+    Builds a service on first use instead of at import time.
+
+    Instances are callable with no arguments, so they can be used directly as
+    FastAPI dependencies (``Depends(get_gemini_service)``) or called from other
+    services. Construction is guarded by a lock so concurrent first calls
+    (request threads plus background warm-up) build the service only once.
+    """
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self.init_seconds = None
+
+    def __call__(self):
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    self._instance = self._factory()
+                    self.init_seconds = time.perf_counter() - start
+                instance = self._instance
+        return instance
+
+    @property
+    def is_ready(self) -> bool:
+        return self._instance is not None
+
+    def override(self, instance):
+        """Replace the service instance (local stand-ins, benchmarks)."""
+        with self._lock:
+            self._instance = instance
+            self.init_seconds = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._instance = None
+            self.init_seconds = None
+
+
+async def warm_up(providers: list) -> dict:
+    """
+    Build all providers concurrently in worker threads.
+    Failures are reported per service and never raised, since each
+    service already falls back to mock data when its client is unavailable.
+    """
+    results = await asyncio.gather(
+        *(asyncio.to_thread(provider) for provider in providers),
+        return_exceptions=True
+    )
+    return {
+        provider.name: (
+            {"ready": False, "error": str(result)}
+            if isinstance(result, Exception)
+            else {"ready": True, "init_seconds": round(provider.init_seconds or 0.0, 3)}
+        )
+        for provider, result in zip(providers, results)
+    }
+
+
+def readiness(providers: list) -> dict:
+    """Non-blocking snapshot of which services have been built."""
+    return {provider.name: provider.is_ready for provider in providers}
@@ -0,0 +1,404 @@
+# backend/services/recording_archive.py
+"""
+Session recording archive.
+
+Recordings are kept after transcription so they can be played back,
+re-analyzed or compared without another upload:
+
+- Storage: each recording is transcoded by a background job ("archive",
+  services/job_worker.py) to low-bitrate mono Opus with ffmpeg, and stored
+  content-addressed under ARCHIVE_DIR by the digest of the original
+  upload, so the same recording uploaded twice is stored once. Without
+  ffmpeg the original file is kept instead.
+- Index: SQLite (ARCHIVE_INDEX_PATH), one row per recording keyed by
+  session and user, one row per stored blob.
+- Playback: main.py serves blobs with FileResponse, which answers HTTP
+  Range requests for scrubbing.
+- Quotas: a user cannot archive past ARCHIVE_USER_QUOTA_BYTES; the
+  sweeper also evicts their least recently played recordings down to the
+  quota.
+- Sweeper (hourly, from the job worker pool supervisor): drops recordings
+  past ARCHIVE_RETENTION_DAYS and archives that never completed, then
+  compacts: deletes blobs nothing references and files the index does not
+  know.
+"""
+import logging
+import os
+import shutil
+import sqlite3
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+
+from config.settings import settings
+from services.audio_io import wav_info
+from services.metrics_service import record_fallback
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    filename TEXT,
+    status TEXT NOT NULL,
+    source_bytes INTEGER NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recordings_session ON recordings (session_id, created_at);
+CREATE INDEX IF NOT EXISTS recordings_user ON recordings (user_id, last_accessed);
+CREATE INDEX IF NOT EXISTS recordings_digest ON recordings (digest);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    duration_seconds REAL,
+    created_at REAL NOT NULL
+);
+"""
+
+# Archives still pending after this long are treated as failed by the sweeper
+PENDING_TIMEOUT_SECONDS = 86400
+
+# Originals kept as-is when ffmpeg is unavailable, by leading bytes
+_SOURCE_TYPES = (
+    (b"RIFF", ".wav", "audio/wav"),
+    (b"\x1aE\xdf\xa3", ".webm", "audio/webm"),
+    (b"OggS", ".ogg", "audio/ogg"),
+    (b"ID3", ".mp3", "audio/mpeg"),
+)
+
+
+class QuotaExceeded(ValueError):
+    pass
+
+
+class RecordingArchive:
+    def __init__(self, path: str = None, root: str = None):
+        self.path = path or settings.ARCHIVE_INDEX_PATH
+        self.root = root or settings.ARCHIVE_DIR
+        self.quota = settings.ARCHIVE_USER_QUOTA_BYTES
+        os.makedirs(self.root, exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # API side
+    # ------------------------------------------------------------------
+    def register(self, session_id: str, user_id: str, digest: str, source_bytes: int,
+                 filename: str = None) -> dict:
+        """
+        Add a recording to the archive. Returns it with status "ready" when
+        the same audio is already stored (nothing to transcode), else
+        "pending" until store() runs. Raises QuotaExceeded if it would take
+        the user over their quota.
+        """
+        with self._connect() as conn:
+            # IMMEDIATE: concurrent uploads of one user cannot both pass the quota check
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = conn.execute(
+                    "SELECT * FROM recordings WHERE session_id = ? AND digest = ? AND status != 'failed'",
+                    (session_id, digest)
+                ).fetchone()
+                if existing is not None:
+                    conn.execute("COMMIT")
+                    return self._public(conn, existing)
+                # Audio the user already has archived is not billed again
+                owned = conn.execute(
+                    "SELECT 1 FROM recordings WHERE user_id = ? AND digest = ? AND status IN ('pending', 'ready')",
+                    (user_id, digest)
+                ).fetchone()
+                if not owned and self._usage(conn, user_id) + source_bytes > self.quota:
+                    raise QuotaExceeded(f"Archive quota of {self.quota / (1 << 20):.0f} MB would be exceeded")
+
+                stored = conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+                now = time.time()
+                recording_id = f"rec_{uuid.uuid4().hex}"
+                conn.execute(
+                    "INSERT INTO recordings (id, session_id, user_id, digest, filename, status, source_bytes, "
+                    "created_at, last_accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (recording_id, session_id, user_id, digest, filename, "ready" if stored else "pending",
+                     source_bytes, now, now)
+                )
+                row = conn.execute("SELECT * FROM recordings WHERE id = ?", (recording_id,)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return self._public(conn, row)
+
+    def get(self, recording_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM recordings WHERE id = ?", (recording_id,)).fetchone()
+            return self._public(conn, row) if row else None
+
+    def list(self, session_id: str = None, user_id: str = None, limit: int = 50) -> list:
+        clauses, args = [], []
+        if session_id:
+            clauses.append("session_id = ?")
+            args.append(session_id)
+        if user_id:
+            clauses.append("user_id = ?")
+            args.append(user_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM recordings{where} ORDER BY created_at DESC LIMIT ?", (*args, limit)
+            ).fetchall()
+            return [self._public(conn, row) for row in rows]
+
+    def audio(self, recording_id: str):
+        """(path, media_type) of a ready recording, marking it played; None if not ready."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT b.path, b.media_type FROM recordings r JOIN blobs b ON b.digest = r.digest "
+                "WHERE r.id = ? AND r.status = 'ready'",
+                (recording_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE recordings SET last_accessed = ? WHERE id = ?", (time.time(), recording_id))
+        return os.path.join(self.root, row["path"]), row["media_type"]
+
+    def usage(self, user_id: str) -> dict:
+        with self._connect() as conn:
+            used = self._usage(conn, user_id)
+        return {"user_id": user_id, "used_bytes": used, "quota_bytes": self.quota}
+
+    def delete(self, recording_id: str) -> bool:
+        with self._connect() as conn:
+            rows = conn.execute("DELETE FROM recordings WHERE id = ? RETURNING digest", (recording_id,)).fetchall()
+            if rows:
+                self._drop_unreferenced(conn, rows[0]["digest"])
+        return bool(rows)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def store(self, recording_id: str, source_path: str) -> dict:
+        """Transcode and store the source file for a pending recording (job handler)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT digest FROM recordings WHERE id = ?", (recording_id,)).fetchone()
+            if row is None:
+                # Deleted while queued
+                raise KeyError(f"Unknown recording {recording_id}")
+            digest = row["digest"]
+            stored = conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if stored is None:
+            try:
+                self._store_blob(digest, source_path)
+            except ValueError as e:
+                with self._connect() as conn:
+                    conn.execute("UPDATE recordings SET status = 'failed', error = ? WHERE id = ?", (str(e), recording_id))
+                raise
+        with self._connect() as conn:
+            conn.execute("UPDATE recordings SET status = 'ready', error = NULL WHERE id = ?", (recording_id,))
+        return self.get(recording_id)
+
+    def _store_blob(self, digest: str, source_path: str):
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, f"{uuid.uuid4().hex}.part")
+        try:
+            try:
+                self._transcode(source_path, tmp_path)
+                extension, media_type = ".opus", "audio/ogg"
+            except FileNotFoundError:
+                # No ffmpeg on this host: keep the original
+                logger.warning("ffmpeg not found (%s); archiving the original recording", settings.ARCHIVE_FFMPEG)
+                record_fallback("archive_transcode", "ffmpeg_unavailable")
+                shutil.copyfile(source_path, tmp_path)
+                extension, media_type = _source_type(source_path)
+
+            relative = os.path.join(digest[:2], digest + extension)
+            os.makedirs(os.path.join(self.root, digest[:2]), exist_ok=True)
+            os.replace(tmp_path, os.path.join(self.root, relative))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO blobs (digest, path, media_type, bytes, duration_seconds, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(digest) DO NOTHING",
+                (digest, relative, media_type, os.path.getsize(os.path.join(self.root, relative)),
+                 _duration(source_path), time.time())
+            )
+
+    @staticmethod
+    def _transcode(source_path: str, target_path: str):
+        try:
+            subprocess.run(
+                [settings.ARCHIVE_FFMPEG, "-nostdin", "-v", "error", "-y", "-i", source_path,
+                 "-vn", "-ac", "1", "-c:a", "libopus", "-b:a", settings.ARCHIVE_OPUS_BITRATE,
+                 "-application", "voip", "-f", "ogg", target_path],
+                check=True, capture_output=True, timeout=settings.ARCHIVE_TRANSCODE_TIMEOUT_SECONDS
+            )
+        except subprocess.CalledProcessError as e:
+            # Undecodable input: retrying cannot help
+            message = e.stderr.decode("utf-8", "replace").strip().splitlines()
+            raise ValueError(f"Could not transcode recording: {message[-1] if message else e}")
+
+    # ------------------------------------------------------------------
+    # Sweeper
+    # ------------------------------------------------------------------
+    def sweep(self) -> dict:
+        """Retention, quota eviction and compaction; returns what was removed."""
+        now = time.time()
+        removed = {"expired": 0, "evicted": 0, "abandoned": 0, "blobs": 0, "orphan_files": 0}
+        with self._connect() as conn:
+            removed["expired"] = conn.execute(
+                "DELETE FROM recordings WHERE created_at < ?", (now - settings.ARCHIVE_RETENTION_DAYS * 86400,)
+            ).rowcount
+            removed["abandoned"] = conn.execute(
+                "DELETE FROM recordings WHERE status != 'ready' AND created_at < ?", (now - PENDING_TIMEOUT_SECONDS,)
+            ).rowcount
+
+            # Users over quota lose their least recently played recordings
+            # (a blob shared by several of a user's recordings counts once)
+            over = conn.execute(
+                "SELECT user_id, SUM(bytes) AS used FROM ("
+                "SELECT DISTINCT r.user_id, r.digest, b.bytes FROM recordings r JOIN blobs b ON b.digest = r.digest"
+                ") GROUP BY user_id HAVING used > ?",
+                (self.quota,)
+            ).fetchall()
+            for user in over:
+                used = user["used"]
+                rows = conn.execute(
+                    "SELECT r.id, r.digest, b.bytes FROM recordings r JOIN blobs b ON b.digest = r.digest "
+                    "WHERE r.user_id = ? ORDER BY r.last_accessed",
+                    (user["user_id"],)
+                ).fetchall()
+                remaining = {}
+                for row in rows:
+                    remaining[row["digest"]] = remaining.get(row["digest"], 0) + 1
+                for row in rows:
+                    if used <= self.quota:
+                        break
+                    conn.execute("DELETE FROM recordings WHERE id = ?", (row["id"],))
+                    remaining[row["digest"]] -= 1
+                    if not remaining[row["digest"]]:
+                        used -= row["bytes"]
+                    removed["evicted"] += 1
+
+            removed["blobs"] = self._drop_unreferenced(conn)
+            known = {row["path"] for row in conn.execute("SELECT path FROM blobs").fetchall()}
+            if removed["blobs"]:
+                conn.execute("VACUUM")
+
+        # Files on disk the index does not know (crashed writes, lost rows)
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, self.root)
+                if relative in known:
+                    continue
+                try:
+                    # Leave in-progress transcodes alone
+                    if os.path.getmtime(path) < now - settings.JOB_LEASE_SECONDS:
+                        os.remove(path)
+                        removed["orphan_files"] += 1
+                except OSError:
+                    continue
+        if any(removed.values()):
+            logger.info("Archive sweep: %s", removed)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _drop_unreferenced(self, conn, digest: str = None) -> int:
+        """Delete blobs no recording references (only `digest`'s, if given)."""
+        query = "SELECT digest, path FROM blobs WHERE digest NOT IN (SELECT digest FROM recordings)"
+        args = ()
+        if digest is not None:
+            query, args = query + " AND digest = ?", (digest,)
+        rows = conn.execute(query, args).fetchall()
+        for row in rows:
+            conn.execute("DELETE FROM blobs WHERE digest = ?", (row["digest"],))
+            try:
+                os.remove(os.path.join(self.root, row["path"]))
+            except FileNotFoundError:
+                pass
+        return len(rows)
+
+    @staticmethod
+    def _usage(conn, user_id: str) -> int:
+        """
+        Archived bytes of the user's recordings, once per distinct audio;
+        audio not yet transcoded counts at its upload size.
+        """
+        row = conn.execute(
+            "SELECT COALESCE(SUM(used), 0) AS used FROM ("
+            "SELECT COALESCE(MAX(b.bytes), MAX(r.source_bytes)) AS used "
+            "FROM recordings r LEFT JOIN blobs b ON b.digest = r.digest "
+            "WHERE r.user_id = ? AND r.status IN ('pending', 'ready') GROUP BY r.digest)",
+            (user_id,)
+        ).fetchone()
+        return row["used"]
+
+    @staticmethod
+    def _public(conn, row) -> dict:
+        recording = {field: row[field] for field in (
+            "id", "session_id", "user_id", "filename", "status", "source_bytes", "created_at", "last_accessed"
+        )}
+        blob = conn.execute(
+            "SELECT media_type, bytes, duration_seconds FROM blobs WHERE digest = ?", (row["digest"],)
+        ).fetchone()
+        if blob is not None and row["status"] == "ready":
+            recording.update(media_type=blob["media_type"], bytes=blob["bytes"],
+                             duration_seconds=blob["duration_seconds"])
+        return recording
+
+    def clear(self):
+        """Drop the index and all stored audio (benchmarks, local resets)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM recordings")
+            conn.execute("DELETE FROM blobs")
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+def _source_type(path: str) -> tuple:
+    with open(path, "rb") as f:
+        head = f.read(4)
+    for magic, extension, media_type in _SOURCE_TYPES:
+        if head.startswith(magic):
+            return extension, media_type
+    return ".bin", "application/octet-stream"
+
+
+def _duration(path: str):
+    with open(path, "rb") as f:
+        header = f.read(64 * 1024)
+    try:
+        info = wav_info(header)
+    except ValueError:
+        return None
+    # The header's size field, not the (truncated) bytes read
+    data_bytes = int.from_bytes(header[info.data_offset - 4:info.data_offset], "little")
+    data_bytes = min(data_bytes, os.path.getsize(path) - info.data_offset)
+    return round(data_bytes / (info.sample_rate * info.channels * info.sample_width), 2)
+
+
+# Lazily-built singleton instance
+get_recording_archive = LazyService("recording_archive", RecordingArchive)
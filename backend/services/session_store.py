@@ -0,0 +1,309 @@
+# backend/services/session_store.py
+"""
+Server-side conversation sessions.
+
+Each session keeps a ring buffer of recent turns plus a rolling summary of
+older turns (maintained by services.context_manager), so clients send only
+the new message per turn. Turns are appended with append_turns, an atomic
+read-modify-write (a BEGIN IMMEDIATE transaction in SQLite, WATCH/MULTI in
+Redis), so concurrent requests on one session cannot drop each other's
+turns. The store is blocking: call it from a thread, not the event loop.
+Sessions live in Redis (any Redis-compatible server) when REDIS_URL is
+set, otherwise in a SQLite file (SESSION_DB_PATH, WAL mode like the job
+queue), so every gunicorn worker sees every session either way. With
+SESSION_DB_PATH empty they fall back to an in-process LRU/TTL cache, which
+is only correct with a single worker.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from config.settings import settings
+from services.cache import TTLCache
+from services.context_manager import fold_gists
+from services.metrics_service import record_cache
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (expires_at);
+"""
+
+
+@dataclass
+class ConversationSession:
+    session_id: str
+    mode: str = "speaking_practice"
+    turns: deque = field(default_factory=lambda: deque(maxlen=settings.SESSION_HISTORY_TURNS))
+    summary: str = ""
+    summarized_upto: int = 0  # turns [0, summarized_upto) are covered by `summary`
+    turn_count: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def first_index(self) -> int:
+        """Absolute index of the oldest turn still in the ring buffer."""
+        return self.turn_count - len(self.turns)
+
+    def add_turn(self, speaker: str, text: str):
+        """Append a turn; an unsummarized turn pushed out of the ring buffer is folded into the summary."""
+        if len(self.turns) == self.turns.maxlen and self.first_index >= self.summarized_upto:
+            self.summary = fold_gists(self.summary, [self.turns[0]])
+            self.summarized_upto = self.first_index + 1
+        self.turns.append({"speaker": speaker, "text": text})
+        self.turn_count += 1
+        self.updated_at = time.time()
+
+    @property
+    def history(self) -> list:
+        """Recent turns in the same shape clients used to send as `history`."""
+        return list(self.turns)
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "mode": self.mode,
+            "turns": list(self.turns),
+            "summary": self.summary,
+            "summarized_upto": self.summarized_upto,
+            "turn_count": self.turn_count,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationSession":
+        session = cls(
+            session_id=data["session_id"],
+            mode=data.get("mode", "speaking_practice"),
+            summary=data.get("summary", ""),
+            summarized_upto=data.get("summarized_upto", 0),
+            turn_count=data.get("turn_count", 0),
+            created_at=data.get("created_at", time.time()),
+            updated_at=data.get("updated_at", time.time())
+        )
+        session.turns.extend(data.get("turns", []))
+        return session
+
+
+class SessionStore:
+    def __init__(self, path: str = None):
+        self.ttl = settings.SESSION_TTL_SECONDS
+        self.path = settings.SESSION_DB_PATH if path is None else path
+        self._redis = None
+        self._memory = None
+        self._lock = threading.Lock()  # atomic updates of in-memory sessions
+
+        if settings.REDIS_URL:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+                self._redis.ping()
+                logger.info("Conversation sessions stored in Redis")
+            except Exception as e:
+                logger.error("Redis unavailable (%s); using %s sessions", e, "SQLite" if self.path else "in-memory")
+                self._redis = None
+
+        if self._redis is None and self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+        elif self._redis is None:
+            logger.warning("SESSION_DB_PATH is empty: sessions are per process, run a single worker")
+            self._memory = TTLCache(maxsize=settings.SESSION_MAX_SESSIONS, ttl=self.ttl)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @property
+    def backend(self) -> str:
+        if self._redis is not None:
+            return "redis"
+        return "memory" if self._memory is not None else "sqlite"
+
+    def create(self, mode: str = "speaking_practice", session_id: str = None) -> ConversationSession:
+        session = ConversationSession(session_id=session_id or f"session_{uuid.uuid4().hex}", mode=mode)
+        if self.backend == "sqlite":
+            # Expired sessions are dropped as new ones start
+            with self._connect() as conn:
+                conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        self.save(session)
+        return session
+
+    def get(self, session_id: str):
+        """Return the session, or None if unknown or expired."""
+        if not session_id:
+            return None
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._key(session_id))
+                session = ConversationSession.from_dict(json.loads(raw)) if raw else None
+            except Exception as e:
+                logger.error("Error loading session %s: %s", session_id, e)
+                session = None
+        elif self._memory is not None:
+            session = self._memory.get(session_id)
+        else:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT data FROM sessions WHERE id = ? AND expires_at >= ?", (session_id, time.time())
+                ).fetchone()
+            session = ConversationSession.from_dict(json.loads(row["data"])) if row else None
+        record_cache("conversation_sessions", session is not None)
+        return session
+
+    def get_or_create(self, session_id: str, mode: str = "speaking_practice", history: list = None) -> ConversationSession:
+        """
+        Load a session, recreating an expired/unknown one under the same id.
+        A client-sent `history` seeds the recreated session so nothing is lost.
+        """
+        session = self.get(session_id)
+        if session is None:
+            session = self._seeded(session_id, mode, history)
+        return session
+
+    @staticmethod
+    def _seeded(session_id: str, mode: str, history: list) -> ConversationSession:
+        session = ConversationSession(session_id=session_id or f"session_{uuid.uuid4().hex}", mode=mode)
+        for msg in history or []:
+            session.add_turn("user" if msg.get("speaker") == "user" else "ai", msg.get("text", ""))
+        return session
+
+    def append_turns(self, session_id: str, turns: list, mode: str = "speaking_practice",
+                     history: list = None) -> ConversationSession:
+        """
+        Atomically append `turns` ([(speaker, text), ...]) to the stored
+        session, recreating an expired/unknown one like get_or_create.
+        Returns the updated session.
+        """
+        def append(session: ConversationSession):
+            for speaker, text in turns:
+                session.add_turn(speaker, text)
+
+        return self.update(session_id, append, lambda: self._seeded(session_id, mode, history))
+
+    def update(self, session_id: str, mutate, default=None):
+        """
+        Atomically load the session (or `default()` when it is missing),
+        apply `mutate(session)` and save it. `mutate` returning False skips
+        the save. Returns the session, or None if it is missing and there
+        is no default.
+        """
+        if self._redis is not None:
+            return self._update_redis(session_id, mutate, default)
+        if self._memory is not None:
+            with self._lock:
+                session = self._memory.get(session_id)
+                if session is None and default is not None:
+                    session = default()
+                if session is not None and mutate(session) is not False:
+                    self._memory.set(session.session_id, session)
+                return session
+
+        with self._connect() as conn:
+            # IMMEDIATE: the read and the write happen under one write lock
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT data FROM sessions WHERE id = ? AND expires_at >= ?", (session_id, time.time())
+                ).fetchone()
+                session = ConversationSession.from_dict(json.loads(row["data"])) if row else None
+                if session is None and default is not None:
+                    session = default()
+                if session is not None and mutate(session) is not False:
+                    conn.execute(
+                        "INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+                        (session.session_id, json.dumps(session.to_dict()), time.time() + self.ttl)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return session
+
+    def _update_redis(self, session_id: str, mutate, default):
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    # A write by another worker between WATCH and EXEC aborts
+                    # the transaction; retry on the new value
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    session = ConversationSession.from_dict(json.loads(raw)) if raw else None
+                    if session is None and default is not None:
+                        session = default()
+                    if session is None or mutate(session) is False:
+                        pipe.unwatch()
+                        return session
+                    pipe.multi()
+                    pipe.set(key, json.dumps(session.to_dict()), ex=self.ttl)
+                    pipe.execute()
+                    return session
+                except WatchError:
+                    continue
+                except Exception as e:
+                    # Like save(): the turn goes unrecorded, the request carries on
+                    logger.error("Error saving session %s: %s", session_id, e)
+                    session = default() if default is not None else None
+                    if session is not None:
+                        mutate(session)
+                    return session
+
+    def save(self, session: ConversationSession):
+        if self._redis is not None:
+            try:
+                self._redis.set(self._key(session.session_id), json.dumps(session.to_dict()), ex=self.ttl)
+            except Exception as e:
+                logger.error("Error saving session %s: %s", session.session_id, e)
+        elif self._memory is not None:
+            self._memory.set(session.session_id, session)
+        else:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO sessions (id, data, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+                    (session.session_id, json.dumps(session.to_dict()), time.time() + self.ttl)
+                )
+
+    def delete(self, session_id: str):
+        if self._redis is not None:
+            self._redis.delete(self._key(session_id))
+        elif self._memory is not None:
+            self._memory.pop(session_id)
+        else:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"conversation_session:{session_id}"
+
+
+# Lazily-built singleton instance
+get_session_store = LazyService("session_store", SessionStore)
@@ -0,0 +1,108 @@
+# backend/services/speculative_tts.py
+"""
+Speculative text-to-speech for coach replies.
+
+Conversation endpoints start synthesizing a reply as soon as its text
+exists and return an `audio_token`; the client's follow-up request
+(/api/text-to-speech with the token, or GET /api/text-to-speech/{token})
+picks up the finished audio, or waits for the synthesis already under way,
+instead of starting it only after a full round trip.
+
+Tokens are content hashes of voice and text, so repeated replies (the
+canned local answers) share one synthesis. Audio lives in a small LRU
+cache with a short TTL, plus Redis when REDIS_URL is set so another worker
+can serve the follow-up; audio nobody asks for simply expires.
+
+Hit rate: cache_requests_total{cache="speculative_tts"}; syntheses started
+and failed: speculative_tts_total.
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+
+from config.settings import settings
+from services.cache import TTLCache
+from services.elevenlabs_service import get_elevenlabs_service
+from services.metrics_service import SPECULATIVE_TTS, record_cache
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+
+def audio_token(text: str, voice_id: str = None) -> str:
+    key = f"{voice_id or settings.TTS_VOICE_ID}\n{text}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class SpeculativeTTS:
+    def __init__(self):
+        self.tts = get_elevenlabs_service()
+        self.ttl = settings.TTS_SPECULATIVE_TTL_SECONDS
+        # token -> audio bytes, or the synthesis task while it runs
+        self._audio = TTLCache(maxsize=settings.TTS_SPECULATIVE_CACHE_SIZE, ttl=self.ttl)
+        self._redis = None
+
+        if settings.REDIS_URL:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+                self._redis.ping()
+            except Exception as e:
+                logger.error("Redis unavailable (%s); speculative audio stays per worker", e)
+                self._redis = None
+
+    def start(self, text: str, voice_id: str = None) -> Optional[str]:
+        """Begin synthesizing `text` in the background; returns its audio token, or None if disabled."""
+        if not settings.TTS_SPECULATIVE or not self.tts.api_key or not text:
+            return None
+        voice_id = voice_id or settings.TTS_VOICE_ID
+        token = audio_token(text, voice_id)
+        if self._audio.get(token) is None:
+            self._audio.set(token, asyncio.create_task(self._synthesize(token, text, voice_id)))
+            SPECULATIVE_TTS.labels("started").inc()
+        return token
+
+    async def get(self, token: str, wait: float = None) -> Optional[bytes]:
+        """Audio for `token`, waiting up to `wait` seconds for a synthesis in progress; None on a miss."""
+        entry = self._audio.get(token)
+        if entry is None and self._redis is not None:
+            try:
+                entry = await asyncio.to_thread(self._redis.get, self._key(token))
+            except Exception as e:
+                logger.error("Error loading speculative audio: %s", e)
+        if isinstance(entry, asyncio.Task):
+            try:
+                # shield: a caller giving up must not cancel the synthesis
+                entry = await asyncio.wait_for(
+                    asyncio.shield(entry), settings.TTS_SPECULATIVE_WAIT_SECONDS if wait is None else wait
+                )
+            except Exception:
+                # Timed out or failed: the caller synthesizes itself
+                entry = None
+        record_cache("speculative_tts", entry is not None)
+        return entry
+
+    async def _synthesize(self, token: str, text: str, voice_id: str) -> Optional[bytes]:
+        audio = await asyncio.to_thread(self.tts.text_to_speech, text, voice_id)
+        if not audio:
+            SPECULATIVE_TTS.labels("failed").inc()
+            self._audio.pop(token)
+            return None
+        # Replace the task with the bytes so the finished task can be freed
+        self._audio.set(token, audio)
+        if self._redis is not None:
+            try:
+                await asyncio.to_thread(self._redis.set, self._key(token), audio, ex=self.ttl)
+            except Exception as e:
+                logger.error("Error saving speculative audio: %s", e)
+        return audio
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return f"tts_audio:{token}"
+
+
+# Lazily-built singleton instance
+get_speculative_tts = LazyService("speculative_tts", SpeculativeTTS)
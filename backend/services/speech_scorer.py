@@ -0,0 +1,213 @@
+# backend/services/speech_scorer.py
+"""
+Deterministic local speech scoring from lexical features.
+
+Per transcript: filler and hedge density, type/token ratio (Guiraud's
+R = types / sqrt(tokens), which is stable across lengths), sentence length
+mean and variation, and Flesch reading ease from a vowel-group syllable
+estimate. Feature extraction is a handful of compiled-regex passes per text;
+scoring runs on the whole batch as NumPy arrays. A typical transcript
+(a few hundred words) scores in well under a millisecond.
+
+Output uses the same feedback fields as the Gemini analysis, so it is the
+default response for /api/analyze and the Gemini narrative is optional.
+
+STT drops most "um"s and "uh"s, so when the recording's acoustic filled
+pause count (services/filler_detector.py) is known, the filler count used
+for scoring is the larger of the two.
+"""
+import re
+
+import numpy as np
+
+from data.speech_lexicon import (
+    FILLER_TERMS, HEDGE_TERMS, PACE_WPM, LONG_SENTENCE_WORDS, FEEDBACK, SUGGESTIONS
+)
+from services.providers import LazyService
+
+
+_WORD_RE = re.compile(r"[a-z']+")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+_VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+# Trailing silent e ("make", "voice"), but not "the" or syllabic "-le"
+_SILENT_E_RE = re.compile(r"[a-z]{2}[^aeiouyl\s']e\b")
+_FILLER_WORDS = frozenset(term for term in FILLER_TERMS if " " not in term)
+_FILLER_PHRASES = [f" {term} " for term in FILLER_TERMS if " " in term]
+_HEDGE_WORDS = frozenset(term for term in HEDGE_TERMS if " " not in term)
+_HEDGE_PHRASES = [f" {term} " for term in HEDGE_TERMS if " " in term]
+
+# Feature matrix columns
+WORDS, TYPES, SENTENCES, SENTENCE_SQUARES, SYLLABLES, FILLERS, HEDGES = range(7)
+
+
+def extract_features(text: str) -> tuple:
+    """One row of the feature matrix plus the filler words found."""
+    lower = text.lower()
+    words = _WORD_RE.findall(lower)
+    sentence_lengths = [n for n in map(len, map(str.split, _SENTENCE_RE.split(lower))) if n]
+    syllables = len(_VOWEL_GROUP_RE.findall(lower)) - len(_SILENT_E_RE.findall(lower))
+    # Single words by set lookup, phrases by substring count over the
+    # space-joined tokens (much cheaper than a regex alternation scan)
+    joined = f" {' '.join(words)} "
+    fillers = [word for word in words if word in _FILLER_WORDS]
+    fillers += [phrase.strip() for phrase in _FILLER_PHRASES for _ in range(joined.count(phrase))]
+    hedges = sum(1 for word in words if word in _HEDGE_WORDS)
+    hedges += sum(joined.count(phrase) for phrase in _HEDGE_PHRASES)
+    row = (
+        len(words),
+        len(set(words)),
+        len(sentence_lengths),
+        sum(n * n for n in sentence_lengths),
+        max(syllables, len(words)),
+        len(fillers),
+        hedges,
+    )
+    return row, fillers
+
+
+class SpeechScorer:
+    # Transcripts shorter than this are pulled toward a neutral score
+    MIN_EVIDENCE_WORDS = 30
+
+    def score(self, text: str, duration_seconds: float = None, filled_pauses: int = None) -> dict:
+        return self.score_batch(
+            [text],
+            None if duration_seconds is None else [duration_seconds],
+            None if filled_pauses is None else [filled_pauses]
+        )[0]
+
+    def score_batch(self, texts: list, durations: list = None, filled_pauses: list = None) -> list:
+        """
+        Score a batch of transcripts; `durations` (seconds) enables pace
+        scoring, `filled_pauses` (acoustic counts, None where unknown) raise
+        the filler counts STT missed. filler_words_list holds the fillers
+        found in the transcript; an acoustic count is reported on its own
+        as acoustic_filler_count.
+        """
+        rows, filler_lists = zip(*(extract_features(text) for text in texts)) if texts else ((), ())
+        if filled_pauses is None:
+            filled_pauses = [None] * len(texts)
+        else:
+            rows = tuple(
+                row if count is None else row[:FILLERS] + (max(row[FILLERS], int(count)),) + row[FILLERS + 1:]
+                for row, count in zip(rows, filled_pauses)
+            )
+        features = np.array(rows, dtype=np.float64).reshape(len(texts), 7)
+        metrics = self._metrics(features)
+        wpm = [None] * len(texts)
+        if durations is not None:
+            seconds = np.array([d or 0.0 for d in durations], dtype=np.float64)
+            rates = features[:, WORDS] * 60.0 / np.maximum(seconds, 1e-9)
+            wpm = [rate if s > 0 else None for rate, s in zip(rates.tolist(), seconds.tolist())]
+        return [
+            self._feedback(i, rows[i], metrics, filler_lists[i], wpm[i], filled_pauses[i])
+            for i in range(len(texts))
+        ]
+
+    def _metrics(self, features: np.ndarray) -> dict:
+        words = np.maximum(features[:, WORDS], 1.0)
+        sentences = np.maximum(features[:, SENTENCES], 1.0)
+        mean_sentence = words / sentences
+        sentence_std = np.sqrt(np.maximum(features[:, SENTENCE_SQUARES] / sentences - mean_sentence ** 2, 0.0))
+        sentence_cv = sentence_std / np.maximum(mean_sentence, 1.0)
+        guiraud = features[:, TYPES] / np.sqrt(words)
+        readability = 206.835 - 1.015 * mean_sentence - 84.6 * features[:, SYLLABLES] / words
+        filler_rate = 100.0 * features[:, FILLERS] / words
+        hedge_rate = 100.0 * features[:, HEDGES] / words
+
+        diversity = np.clip((guiraud - 3.0) * 2.5, 0, 10)
+        filler_score = np.clip(10.0 - filler_rate, 0, 10)
+        long_penalty = np.clip((mean_sentence - LONG_SENTENCE_WORDS) / 5.0, 0, 3)
+        varied = (features[:, SENTENCES] >= 3) & (sentence_cv >= 0.3) & (sentence_cv <= 1.0)
+        clarity = (0.6 * np.clip((readability - 20.0) / 6.0, 0, 10) + 0.2 * filler_score
+                   + 0.2 * diversity - long_penalty + 0.5 * varied)
+        confidence = 9.0 - 0.8 * hedge_rate - 0.3 * filler_rate + 0.1 * (diversity - 5.0)
+
+        # Little text is little evidence: shrink toward 5
+        evidence = np.minimum(features[:, WORDS] / self.MIN_EVIDENCE_WORDS, 1.0)
+        clarity = 5.0 + evidence * (np.clip(clarity, 0, 10) - 5.0)
+        confidence = 5.0 + evidence * (np.clip(confidence, 0, 10) - 5.0)
+
+        # Plain lists: per-item indexing of NumPy arrays is slow
+        return {
+            "clarity": np.round(clarity, 1).tolist(),
+            "confidence": np.round(confidence, 1).tolist(),
+            "filler_score": np.round(5.0 + evidence * (filler_score - 5.0), 1).tolist(),
+            "type_token_ratio": np.round(features[:, TYPES] / words, 3).tolist(),
+            "diversity": diversity.tolist(),
+            "mean_sentence": mean_sentence.tolist(),
+            "sentence_cv": sentence_cv.tolist(),
+            "readability": np.round(readability, 1).tolist(),
+            "filler_rate": filler_rate.tolist(),
+            "hedge_rate": hedge_rate.tolist(),
+        }
+
+    def _feedback(self, i: int, row: tuple, metrics: dict, fillers: list, wpm, filled_pauses=None) -> dict:
+        feedback, suggestions = [], []
+
+        if row[WORDS] < self.MIN_EVIDENCE_WORDS:
+            feedback.append(FEEDBACK["too_short"])
+            suggestions.append(SUGGESTIONS["too_short"])
+        if metrics["mean_sentence"][i] > LONG_SENTENCE_WORDS:
+            feedback.append(FEEDBACK["long_sentences"])
+            suggestions.append(SUGGESTIONS["long_sentences"])
+        else:
+            feedback.append(FEEDBACK["clear_structure"])
+        if metrics["filler_rate"][i] >= 3.0:
+            feedback.append(FEEDBACK["many_fillers"])
+            suggestions.append(SUGGESTIONS["many_fillers"])
+        elif metrics["filler_rate"][i] < 1.0 and row[WORDS] >= self.MIN_EVIDENCE_WORDS:
+            feedback.append(FEEDBACK["few_fillers"])
+        if metrics["hedge_rate"][i] >= 2.0:
+            feedback.append(FEEDBACK["hedging"])
+            suggestions.append(SUGGESTIONS["hedging"])
+        elif row[WORDS] >= self.MIN_EVIDENCE_WORDS:
+            feedback.append(FEEDBACK["assertive"])
+        if row[SENTENCES] >= 3:
+            if metrics["sentence_cv"][i] < 0.2:
+                feedback.append(FEEDBACK["monotone_rhythm"])
+                suggestions.append(SUGGESTIONS["monotone_rhythm"])
+            elif metrics["sentence_cv"][i] <= 1.0:
+                feedback.append(FEEDBACK["varied_rhythm"])
+        if row[WORDS] >= 50:
+            if metrics["diversity"][i] >= 7.5:
+                feedback.append(FEEDBACK["rich_vocabulary"])
+            elif metrics["diversity"][i] < 4.0:
+                feedback.append(FEEDBACK["repetitive_vocabulary"])
+                suggestions.append(SUGGESTIONS["repetitive_vocabulary"])
+
+        pace = "medium"
+        if wpm is not None:
+            if wpm < PACE_WPM[0]:
+                pace = "slow"
+                suggestions.append(SUGGESTIONS["slow"])
+            elif wpm > PACE_WPM[1]:
+                pace = "fast"
+                suggestions.append(SUGGESTIONS["fast"])
+
+        result = {
+            "clarity_score": metrics["clarity"][i],
+            "confidence_score": metrics["confidence"][i],
+            "filler_score": metrics["filler_score"][i],
+            "filler_words_count": row[FILLERS],
+            "filler_words_list": list(dict.fromkeys(fillers))[:5],
+            "hedge_count": row[HEDGES],
+            "pace": pace,
+            "word_count": row[WORDS],
+            "sentence_count": row[SENTENCES],
+            "type_token_ratio": metrics["type_token_ratio"][i],
+            "readability": metrics["readability"][i],
+            "key_feedback": feedback[:3],
+            "improvement_suggestions": (suggestions or [SUGGESTIONS["default"]])[:2],
+            "is_real_ai": False,
+            "analysis_source": "local"
+        }
+        if wpm is not None:
+            result["speaking_rate_wpm"] = round(wpm)
+        if filled_pauses is not None:
+            result["acoustic_filler_count"] = int(filled_pauses)
+        return result
+
+
+# Lazily-built singleton instance
+get_speech_scorer = LazyService("speech_scorer", SpeechScorer)
@@ -0,0 +1,90 @@
+# backend/services/stt_cache.py
+"""
+Transcripts and recording-quality results cached by recording content.
+
+The frontend re-uploads the same recording for retries, re-analysis and
+comparison; keyed by the upload's content digest (services/uploads.py),
+each unique recording is transcribed once. Concurrent requests for the
+same recording share the running transcription.
+
+Entries live in a bounded LRU/TTL cache, or in Redis when REDIS_URL is set
+so all workers share them.
+"""
+import asyncio
+import json
+import logging
+
+from config.settings import settings
+from services.cache import TTLCache
+from services.metrics_service import record_cache
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    def __init__(self):
+        self.ttl = settings.STT_CACHE_TTL_SECONDS
+        self._memory = TTLCache(maxsize=settings.STT_CACHE_SIZE, ttl=self.ttl)
+        self._inflight = {}  # cache key -> running computation
+        self._redis = None
+
+        if settings.REDIS_URL:
+            try:
+                import redis
+
+                self._redis = redis.Redis.from_url(settings.REDIS_URL)
+                self._redis.ping()
+            except Exception as e:
+                logger.error("Redis unavailable (%s); using in-memory transcript cache", e)
+                self._redis = None
+
+    async def get_or_compute(self, digest: str, kind: str, compute, *args):
+        """
+        Cached result of `compute(*args)` for the recording `digest`.
+        `kind` separates results per recording (e.g. "practice",
+        "conversation:analysis", "quality"); `compute` is blocking and runs
+        in a worker thread.
+        """
+        key = f"{kind}:{digest}"
+        value = await self._load(key)
+        record_cache(f"stt_{kind.split(':')[0]}", value is not None)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._compute(key, compute, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: a cancelled request must not cancel a shared transcription
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute, *args):
+        value = await asyncio.to_thread(compute, *args)
+        if value is not None:
+            await self._store(key, value)
+        return value
+
+    async def _load(self, key: str):
+        if self._redis is not None:
+            try:
+                raw = await asyncio.to_thread(self._redis.get, f"stt:{key}")
+                return json.loads(raw) if raw else None
+            except Exception as e:
+                logger.error("Error loading cached transcript: %s", e)
+                return None
+        return self._memory.get(key)
+
+    async def _store(self, key: str, value):
+        if self._redis is not None:
+            try:
+                await asyncio.to_thread(self._redis.set, f"stt:{key}", json.dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.error("Error caching transcript: %s", e)
+        else:
+            self._memory.set(key, value)
+
+
+# Lazily-built singleton instance
+get_transcript_cache = LazyService("transcript_cache", TranscriptCache)
@@ -0,0 +1,111 @@
+# backend/services/tracing_service.py
+"""
+Request tracing: OpenTelemetry spans plus an optional Server-Timing breakdown.
+
+Spans are exported according to TRACE_EXPORTER (none | file | console | otlp)
+and sampled at TRACE_SAMPLE_RATE. Independently of sampling, a request that
+sends the debug header (X-Debug-Timing: 1) gets a compact Server-Timing
+header listing how long each stage took.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from opentelemetry import trace
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_tracer = trace.get_tracer("vocal-health-companion")
+
+# Per-request list of (stage, milliseconds); None when timing isn't requested
+_stage_timings = contextvars.ContextVar("stage_timings", default=None)
+
+_configured = False
+
+
+def configure_tracing():
+    """
+    Install the tracer provider for this process.
+    Must run after fork (span processors own background threads), so it is
+    called from the app lifespan rather than at import time.
+    """
+    global _configured
+    if _configured or settings.TRACE_EXPORTER == "none":
+        return
+    _configured = True
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({
+            "service.name": "vocal-health-backend",
+            "deployment.environment": settings.ENVIRONMENT
+        }),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACE_SAMPLE_RATE))
+    )
+
+    if settings.TRACE_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.error("TRACE_EXPORTER=otlp requires opentelemetry-exporter-otlp-proto-http; tracing disabled")
+            return
+        exporter = OTLPSpanExporter(endpoint=settings.OTLP_ENDPOINT)
+    elif settings.TRACE_EXPORTER == "file":
+        # One JSON span per line, appended to TRACE_FILE
+        exporter = ConsoleSpanExporter(
+            out=open(settings.TRACE_FILE, "a"),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    else:
+        exporter = ConsoleSpanExporter()
+
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    logger.info("Tracing enabled", extra={
+        "exporter": settings.TRACE_EXPORTER,
+        "sample_rate": settings.TRACE_SAMPLE_RATE
+    })
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Trace a pipeline stage; also records its duration for Server-Timing."""
+    start = time.perf_counter()
+    with _tracer.start_as_current_span(name, attributes=attributes or None) as current:
+        try:
+            yield current
+        finally:
+            timings = _stage_timings.get()
+            if timings is not None:
+                timings.append((name, (time.perf_counter() - start) * 1000))
+
+
+def request_span(method: str, path: str):
+    """Root span for an HTTP request (covered by Server-Timing's `total`)."""
+    return _tracer.start_as_current_span(f"{method} {path}", attributes={"http.method": method})
+
+
+def start_request_timing():
+    """Begin collecting stage timings for the current request."""
+    return _stage_timings.set([])
+
+
+def finish_request_timing(token, total_ms: float) -> str:
+    """Stop collecting and return a Server-Timing header value."""
+    timings = _stage_timings.get() or []
+    _stage_timings.reset(token)
+    entries = [f'{_metric_name(name)};dur={ms:.1f}' for name, ms in timings]
+    entries.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+
+def _metric_name(name: str) -> str:
+    # Server-Timing metric names are HTTP tokens; keep them short and safe
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
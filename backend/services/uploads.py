@@ -0,0 +1,188 @@
+# backend/services/uploads.py
+"""
+Reading uploaded recordings without holding extra copies in memory.
+
+Starlette already streams multipart uploads into a spooled temp file
+(memory up to 1 MB, then disk). UploadSizeLimit, an ASGI middleware, caps
+the whole multipart body before that happens: by Content-Length up front,
+and by counting the bytes actually received. read_upload then enforces the
+per-file size and duration caps and exposes the file as a read-only
+buffer: small uploads
+are read as-is, larger ones are memory-mapped, so a long rehearsal costs
+page cache rather than worker RSS. Decoding (services/audio_io.decode_wav)
+reads samples straight out of the buffer with np.frombuffer.
+
+read_upload also hashes the buffer (BLAKE2b, 128-bit) for the transcript
+and audio-feature caches. That is one separate pass over the spooled file
+(in the threadpool for mapped uploads): Starlette's multipart parser has no
+hook to hash the bytes while it spools them.
+"""
+import hashlib
+import mmap
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from config.settings import settings
+from services.audio_io import wav_info
+
+# Uploads up to this size are read into memory (Starlette keeps them there anyway)
+IN_MEMORY_BYTES = 1 << 20
+
+
+def audio_digest(audio_bytes) -> str:
+    return hashlib.blake2b(audio_bytes, digest_size=16).hexdigest()
+
+
+class SpooledAudio:
+    """
+    An uploaded recording as a read-only buffer (`data`: bytes or a
+    memoryview over an mmap) with its content digest, and `path` when it
+    is mapped from a named file. Close it when done, or use it as a
+    context manager.
+    """
+
+    def __init__(self, data, digest: str, mapping: mmap.mmap = None, path: str = None):
+        self.data = data
+        self.digest = digest
+        self.path = path
+        self._mapping = mapping
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def close(self):
+        if self._mapping is not None:
+            try:
+                self.data.release()
+                self._mapping.close()
+            except BufferError:
+                # An array still views the mapping; it is unmapped once that is freed
+                pass
+            self._mapping = None
+        self.data = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _check_duration(data, max_seconds: float):
+    try:
+        duration = wav_info(data).duration
+    except ValueError:
+        return  # Not WAV (e.g. browser webm): only the size cap applies
+    if duration > max_seconds:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Recording is {duration:.0f}s long; the limit is {max_seconds:.0f}s"
+        )
+
+
+def _map(fileobj, max_seconds: float = None, digest: str = None, path: str = None) -> SpooledAudio:
+    mapping = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+    data = memoryview(mapping)
+    audio = SpooledAudio(data, digest or "", mapping, path)
+    try:
+        if max_seconds is not None:
+            _check_duration(data, max_seconds)
+        if digest is None:
+            audio.digest = audio_digest(data)
+    except Exception:
+        audio.close()
+        raise
+    return audio
+
+
+def map_file(path: str, digest: str = None) -> SpooledAudio:
+    """A non-empty recording on disk as a memory-mapped SpooledAudio (blocking: hashes it unless `digest` is given)."""
+    with open(path, "rb") as f:
+        # The mapping stays valid after the file is closed
+        return _map(f, digest=digest, path=path)
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = None, max_seconds: float = None) -> SpooledAudio:
+    """Validate an uploaded recording against the size/duration caps and return it as a SpooledAudio."""
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    max_seconds = max_seconds or settings.UPLOAD_MAX_SECONDS
+
+    size = upload.size
+    if size is None:
+        size = upload.file.seek(0, 2)
+        upload.file.seek(0)
+    if size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"Upload exceeds the {max_bytes / (1 << 20):.1f} MB limit")
+
+    if size <= IN_MEMORY_BYTES:
+        data = await upload.read()
+        _check_duration(data, max_seconds)
+        return SpooledAudio(data, audio_digest(data))
+    # Hashing a large mapping takes a while; keep it off the event loop
+    return await run_in_threadpool(_map, upload.file, max_seconds)
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware: multipart requests larger than `max_bytes`
+    (UPLOAD_MAX_REQUEST_BYTES) get a 413 before their body is parsed and
+    spooled. A declared Content-Length over the cap is refused without
+    reading anything; otherwise the body is counted as it arrives and,
+    past the cap, the app sees a client disconnect and its response is
+    replaced by the 413.
+    """
+
+    def __init__(self, app, max_bytes: int = None):
+        self.app = app
+        self.max_bytes = max_bytes or settings.UPLOAD_MAX_REQUEST_BYTES
+
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            {"detail": f"Request body exceeds the {self.max_bytes / (1 << 20):.1f} MB limit"},
+            status_code=413
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            return await self.app(scope, receive, send)
+        length = headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_bytes:
+            return await self._too_large()(scope, receive, send)
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def counted_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if exceeded:
+                return  # replaced by the 413 below
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, counted_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not started:
+            await self._too_large()(scope, receive, send)
@@ -0,0 +1,181 @@
+# backend/services/voice_load.py
+"""
+Cumulative voice load per user.
+
+Each analyzed session recording adds its vocal dose (services/voice_quality.py
+voice_dose: phonation time, cycle dose, loud and high-pitch time, energy
+dose) to an hourly rollup row for the user, so windowed totals ("last 24 h")
+are a SUM over at most a few hundred indexed rows and never rescan
+sessions. Rows are in SQLite (VOICE_LOAD_PATH); buckets are UTC hours.
+
+- Idempotent: a recording is counted once per source key (session and
+  content digest), so a retried upload or repeated finalize adds nothing.
+- Alerts: window totals are compared with VOICE_LOAD_LIMITS in
+  data/voice_norms.py; "warning" from VOICE_LOAD_WARNING_FRACTION of a
+  limit, "limit" at or over it.
+- Retention: rollups older than VOICE_LOAD_RETENTION_DAYS are purged
+  hourly by the job worker pool supervisor.
+"""
+import logging
+import math
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from config.settings import settings
+from data.voice_norms import VOICE_LOAD_LIMITS, VOICE_LOAD_WARNING_FRACTION, VOICE_LOAD_FEEDBACK
+from services.providers import LazyService
+
+logger = logging.getLogger(__name__)
+
+MEASURES = ("phonation_seconds", "cycle_dose", "loud_seconds", "high_pitch_seconds", "energy_dose")
+HOUR = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS voice_load (
+    user_id TEXT NOT NULL,
+    hour_start INTEGER NOT NULL,
+    recordings INTEGER NOT NULL DEFAULT 0,
+    phonation_seconds REAL NOT NULL DEFAULT 0,
+    cycle_dose REAL NOT NULL DEFAULT 0,
+    loud_seconds REAL NOT NULL DEFAULT 0,
+    high_pitch_seconds REAL NOT NULL DEFAULT 0,
+    energy_dose REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, hour_start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS voice_load_sources (
+    source TEXT PRIMARY KEY,
+    hour_start INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS voice_load_sources_hour ON voice_load_sources (hour_start);
+"""
+
+
+def _hour(at: float) -> int:
+    return int(at // HOUR) * HOUR
+
+
+class VoiceLoadStore:
+    def __init__(self, path: str = None):
+        self.path = path or settings.VOICE_LOAD_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def record(self, user_id: str, dose: dict, source: str = None, at: float = None) -> bool:
+        """
+        Add one recording's dose to the user's bucket for the hour of `at`
+        (default now). Returns False if `source` was already counted.
+        """
+        hour = _hour(time.time() if at is None else at)
+        values = [float(dose.get(measure) or 0.0) for measure in MEASURES]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if source is not None:
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO voice_load_sources (source, hour_start) VALUES (?, ?)",
+                        (source, hour)
+                    ).rowcount
+                    if not inserted:
+                        conn.execute("ROLLBACK")
+                        return False
+                conn.execute(
+                    f"INSERT INTO voice_load (user_id, hour_start, recordings, {', '.join(MEASURES)}) "
+                    f"VALUES (?, ?, 1, {', '.join('?' for _ in MEASURES)}) "
+                    f"ON CONFLICT (user_id, hour_start) DO UPDATE SET recordings = recordings + 1, "
+                    + ", ".join(f"{m} = {m} + excluded.{m}" for m in MEASURES),
+                    (user_id, hour, *values)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def window(self, user_id: str, hours: int = 24, now: float = None) -> dict:
+        """Totals over the last `hours` hourly buckets, the current one included."""
+        hours = max(1, int(hours))
+        end = _hour(time.time() if now is None else now)
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT COALESCE(SUM(recordings), 0) AS recordings, "
+                + ", ".join(f"COALESCE(SUM({m}), 0) AS {m}" for m in MEASURES)
+                + " FROM voice_load WHERE user_id = ? AND hour_start > ? AND hour_start <= ?",
+                (user_id, end - hours * HOUR, end)
+            ).fetchone()
+        return self._totals(row, hours=hours)
+
+    def series(self, user_id: str, hours: int = 24 * 7, bucket_hours: int = 1, now: float = None) -> list:
+        """Totals per `bucket_hours` (1 = hourly, 24 = daily, UTC) over the last `hours`; empty buckets omitted."""
+        bucket = max(1, int(bucket_hours)) * HOUR
+        end = _hour(time.time() if now is None else now)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT (hour_start / ?) * ? AS start, SUM(recordings) AS recordings, "
+                + ", ".join(f"SUM({m}) AS {m}" for m in MEASURES)
+                + " FROM voice_load WHERE user_id = ? AND hour_start > ? AND hour_start <= ? "
+                "GROUP BY start ORDER BY start",
+                (bucket, bucket, user_id, end - max(1, int(hours)) * HOUR, end)
+            ).fetchall()
+        return [{"start": row["start"], **self._totals(row)} for row in rows]
+
+    def alerts(self, user_id: str, now: float = None) -> list:
+        """Limits from data/voice_norms.py the user is near or over, most exceeded first."""
+        totals = {}
+        alerts = []
+        for measure, hours, limit in VOICE_LOAD_LIMITS:
+            if hours not in totals:
+                totals[hours] = self.window(user_id, hours, now=now)
+            value = totals[hours][measure]
+            ratio = value / limit
+            if ratio < VOICE_LOAD_WARNING_FRACTION:
+                continue
+            alerts.append({
+                "measure": measure,
+                "window_hours": hours,
+                "value": value,
+                "limit": limit,
+                "percent_of_limit": round(100 * ratio, 1),
+                "level": "limit" if ratio >= 1.0 else "warning",
+                "message": VOICE_LOAD_FEEDBACK[measure],
+            })
+        alerts.sort(key=lambda alert: alert["percent_of_limit"], reverse=True)
+        return alerts
+
+    def purge(self, older_than_days: int = None) -> int:
+        """Drop buckets (and their source keys) older than the retention; returns buckets removed."""
+        days = settings.VOICE_LOAD_RETENTION_DAYS if older_than_days is None else older_than_days
+        cutoff = _hour(time.time()) - days * 24 * HOUR
+        with self._connect() as conn:
+            removed = conn.execute("DELETE FROM voice_load WHERE hour_start < ?", (cutoff,)).rowcount
+            conn.execute("DELETE FROM voice_load_sources WHERE hour_start < ?", (cutoff,))
+        if removed:
+            logger.info("Purged %d voice-load buckets", removed)
+        return removed
+
+    @staticmethod
+    def _totals(row, hours: int = None) -> dict:
+        totals = {measure: round(row[measure] or 0.0, 2) for measure in MEASURES if measure != "energy_dose"}
+        totals["recordings"] = row["recordings"] or 0
+        energy, phonation = row["energy_dose"] or 0.0, row["phonation_seconds"] or 0.0
+        # Equivalent level of the voiced time (dBFS, uncalibrated)
+        totals["mean_level_dbfs"] = round(10 * math.log10(energy / phonation), 1) if energy > 0 and phonation else None
+        if hours is not None:
+            totals["window_hours"] = hours
+        return totals
+
+
+# Lazily-built singleton instance
+get_voice_load_store = LazyService("voice_load", VoiceLoadStore)
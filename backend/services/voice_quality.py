@@ -0,0 +1,290 @@
+# backend/services/voice_quality.py
+"""
+Voice-quality (vocal strain) measures from a recording.
+
+- Jitter and shimmer: cycle-to-cycle variation of glottal period and peak
+  amplitude. Cycles are marked by peak picking guided by the pitch track:
+  a waveform peak is a cycle mark if it dominates its neighbours within
+  0.6 of the local period. Period pairs that differ by more than
+  MAX_PERIOD_FACTOR (octave jumps, missed cycles) are skipped, as in Praat.
+- Harmonics-to-noise ratio: 10*log10(r / (1 - r)) from the normalized
+  autocorrelation peak r of each voiced frame (Boersma 1993).
+- Spectral tilt: slope of the long-term average spectrum of voiced speech,
+  in dB per octave (100 Hz to 5 kHz), and the alpha ratio.
+- Voice breaks: gaps in voicing inside a phrase where the sound goes on
+  at a voiced-like level (voicing lost, not a pause or a quiet consonant).
+- Vocal dose: phonation time, cycle dose (vocal-fold oscillations), loud
+  and high-pitch time, and a level-weighted energy dose, summed over time
+  by services/voice_load.py.
+
+Everything is vectorized over frames, cycles and samples; a minute of
+audio takes about 0.15 s on one core (benchmarks/bench_voice_quality.py).
+"""
+import numpy as np
+
+from data.voice_norms import (
+    STRAIN_LIMITS, STRAIN_FEEDBACK, STRAIN_LEVELS, LOUD_SPEECH_DBFS, HIGH_PITCH_SEMITONES
+)
+from services.audio_features import frame_signal, pitch_track
+from services.audio_io import decode_wav
+from services.providers import LazyService
+from services.tracing_service import span
+
+HOP_SECONDS = 0.01
+FMIN = 70.0
+FMAX = 400.0
+# Consecutive periods differing by more than this factor are not compared
+MAX_PERIOD_FACTOR = 1.3
+# Peak dominance window, as a fraction of the local period
+PEAK_WINDOW = 0.6
+# Candidates compared on each side when testing peak dominance
+PEAK_NEIGHBOURS = 24
+# Low-pass (Hann) kernel length applied before peak picking
+SMOOTHING_SECONDS = 0.0015
+# Voice breaks: unvoiced gaps between these lengths whose level stays within
+# BREAK_LEVEL_DB of the surrounding voiced frames
+MIN_BREAK_SECONDS = 1.25 / FMIN
+MAX_BREAK_SECONDS = 0.5
+BREAK_LEVEL_DB = 10.0
+LTAS_FRAME = 1024
+TILT_BAND_HZ = (100.0, 5000.0)
+MIN_CYCLES = 20
+
+
+def _runs(mask: np.ndarray) -> tuple:
+    """(starts, ends) of runs of True in a boolean array (ends exclusive)."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[::2], edges[1::2]
+
+
+def cycle_marks(samples: np.ndarray, sample_rate: int, f0: np.ndarray, voiced: np.ndarray,
+                hop: int, frame_length: int) -> tuple:
+    """
+    Glottal cycle marks in voiced speech: (positions in samples, sub-sample
+    precision; peak amplitudes; voiced-run id per mark).
+    """
+    n = len(samples)
+    centers = np.arange(len(f0)) * hop + frame_length / 2
+    if not voiced.any():
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+
+    # Frame-level voicing and local period, per sample
+    frame_of_sample = np.minimum(
+        np.maximum(((np.arange(n) - frame_length / 2) / hop + 0.5).astype(np.int64), 0), len(f0) - 1
+    )
+    sample_voiced = voiced[frame_of_sample]
+    period = sample_rate / np.interp(np.arange(n), centers[voiced], f0[voiced])
+
+    # Low-pass first so noise does not move or split the peaks (a symmetric
+    # kernel leaves peak positions in place)
+    kernel = np.hanning(max(3, int(sample_rate * SMOOTHING_SECONDS)) | 1)
+    x = np.convolve(samples, kernel / kernel.sum(), mode="same")
+    # Glottal pulses may point either way; pick the stronger polarity
+    if x[sample_voiced].max(initial=0) < -x[sample_voiced].min(initial=0):
+        x = -x
+
+    # Candidates: local maxima inside voiced speech
+    candidate = np.flatnonzero((x[1:-1] > x[:-2]) & (x[1:-1] >= x[2:]) & (x[1:-1] > 0)) + 1
+    candidate = candidate[sample_voiced[candidate]]
+    if len(candidate) < 2:
+        return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+    height = x[candidate]
+    reach = PEAK_WINDOW * period[candidate]
+
+    # Keep candidates that dominate every other candidate within reach
+    keep = np.ones(len(candidate), dtype=bool)
+    for k in range(1, PEAK_NEIGHBOURS + 1):
+        if k >= len(candidate):
+            break
+        distance = candidate[k:] - candidate[:-k]
+        # right neighbour k steps away vs. each candidate, and vice versa
+        keep[:-k] &= ~((distance < reach[:-k]) & (height[k:] > height[:-k]))
+        keep[k:] &= ~((distance < reach[k:]) & (height[:-k] >= height[k:]))
+    peaks = candidate[keep]
+
+    # Parabolic interpolation for sub-sample peak positions and heights
+    left, mid, right = x[peaks - 1], x[peaks], x[np.minimum(peaks + 1, n - 1)]
+    denom = left - 2 * mid + right
+    offset = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / np.where(denom == 0, 1, denom), 0.0)
+    offset = np.clip(offset, -0.5, 0.5)
+    positions = peaks + offset
+    amplitudes = mid - 0.25 * (left - right) * offset
+
+    # Voiced-run id per mark, so periods never span an unvoiced gap
+    run_id = np.cumsum(np.concatenate(([0], (~sample_voiced[1:] & sample_voiced[:-1]).astype(np.int64))))
+    return positions, amplitudes, run_id[peaks]
+
+
+def _perturbation(positions: np.ndarray, amplitudes: np.ndarray, runs: np.ndarray, sample_rate: int) -> dict:
+    # Period i runs from mark i to mark i+1; only within one voiced run and the pitch range
+    periods = np.diff(positions) / sample_rate
+    valid = (runs[1:] == runs[:-1]) & (periods >= 1.0 / FMAX) & (periods <= 1.0 / FMIN)
+    if valid.sum() < MIN_CYCLES:
+        return {}
+
+    # Jitter: consecutive valid periods that are similar enough to be the same voicing
+    pair = valid[:-1] & valid[1:]
+    ratio = periods[1:] / np.maximum(periods[:-1], 1e-9)
+    pair &= (ratio <= MAX_PERIOD_FACTOR) & (ratio >= 1.0 / MAX_PERIOD_FACTOR)
+    if not pair.any():
+        return {}
+    mean_period = periods[valid].mean()
+    period_diffs = np.abs(np.diff(periods))[pair]
+
+    # Shimmer: peak amplitudes of the two cycles bounding each valid period
+    a1 = np.maximum(amplitudes[:-1][valid], 1e-9)
+    a2 = np.maximum(amplitudes[1:][valid], 1e-9)
+    return {
+        "cycles": int(valid.sum()),
+        "mean_f0_hz": round(float(1.0 / mean_period), 1),
+        "jitter_local_percent": round(float(100 * period_diffs.mean() / mean_period), 3),
+        "jitter_absolute_us": round(float(1e6 * period_diffs.mean()), 1),
+        "shimmer_local_percent": round(float(100 * np.abs(a2 - a1).mean() / ((a1 + a2) / 2).mean()), 3),
+        "shimmer_db": round(float(np.abs(20 * np.log10(a2 / a1)).mean()), 3),
+    }
+
+
+def _spectral_tilt(samples: np.ndarray, sample_rate: int, voiced: np.ndarray, hop: int) -> dict:
+    frames = frame_signal(samples, LTAS_FRAME, LTAS_FRAME)
+    # An LTAS frame counts as voiced if most of its pitch frames were
+    per_frame = LTAS_FRAME / hop
+    index = (np.arange(len(frames))[:, None] * per_frame + np.arange(int(per_frame))[None, :]).astype(np.int64)
+    index = np.minimum(index, len(voiced) - 1)
+    chosen = voiced[index].mean(axis=1) > 0.5
+    if chosen.sum() < 3:
+        return {}
+    spectrum = np.fft.rfft(frames[chosen] * np.hanning(LTAS_FRAME), axis=1)
+    power = (spectrum.real ** 2 + spectrum.imag ** 2).mean(axis=0) + 1e-20
+    freqs = np.fft.rfftfreq(LTAS_FRAME, 1.0 / sample_rate)
+
+    low, high = TILT_BAND_HZ[0], min(TILT_BAND_HZ[1], 0.9 * sample_rate / 2)
+    band = (freqs >= low) & (freqs <= high)
+    slope = np.polyfit(np.log2(freqs[band]), 10 * np.log10(power[band]), 1)[0]
+    lower = power[(freqs >= 50) & (freqs < 1000)].sum()
+    upper = power[(freqs >= 1000) & (freqs <= min(5000, sample_rate / 2))].sum()
+    return {
+        "spectral_tilt_db_per_octave": round(float(slope), 2),
+        "alpha_ratio_db": round(float(10 * np.log10(upper / lower)), 2) if upper > 0 and lower > 0 else None,
+    }
+
+
+def _voice_breaks(voiced: np.ndarray, energy_db: np.ndarray) -> dict:
+    frame_seconds = HOP_SECONDS
+    starts, ends = _runs(~voiced)
+    # Only gaps with voicing on both sides
+    inner = (starts > 0) & (ends < len(voiced))
+    starts, ends = starts[inner], ends[inner]
+    length = (ends - starts) * frame_seconds
+    candidate = (length >= MIN_BREAK_SECONDS) & (length <= MAX_BREAK_SECONDS)
+    starts, ends, length = starts[candidate], ends[candidate], length[candidate]
+
+    if len(starts):
+        # Quietest frame of the gap vs. the voiced frames either side
+        cumulative_min = np.minimum.reduceat(energy_db, np.stack([starts, ends], axis=1).ravel())[::2]
+        neighbours = np.minimum(energy_db[starts - 1], energy_db[ends])
+        is_break = cumulative_min >= neighbours - BREAK_LEVEL_DB
+    else:
+        is_break = np.zeros(0, dtype=bool)
+
+    voiced_frames = np.flatnonzero(voiced)
+    span_seconds = (voiced_frames[-1] - voiced_frames[0] + 1) * frame_seconds if len(voiced_frames) else 0.0
+    break_seconds = float(length[is_break].sum())
+    return {
+        "voice_breaks": int(is_break.sum()),
+        "voice_break_percent": round(float(100 * break_seconds / span_seconds), 2) if span_seconds else 0.0,
+    }
+
+
+def voice_dose(f0: np.ndarray, voiced: np.ndarray, energy_db: np.ndarray) -> dict:
+    """Vocal dose of one recording from its pitch track; all measures add up across recordings."""
+    f0, level = f0[voiced], energy_db[voiced]
+    if not len(f0):
+        return {"phonation_seconds": 0.0, "cycle_dose": 0.0, "loud_seconds": 0.0,
+                "high_pitch_seconds": 0.0, "energy_dose": 0.0}
+    high_pitch = np.median(f0) * 2 ** (HIGH_PITCH_SEMITONES / 12)
+    return {
+        "phonation_seconds": round(float(len(f0) * HOP_SECONDS), 2),
+        "cycle_dose": round(float(f0.sum() * HOP_SECONDS), 1),
+        "loud_seconds": round(float((level > LOUD_SPEECH_DBFS).sum() * HOP_SECONDS), 2),
+        "high_pitch_seconds": round(float((f0 > high_pitch).sum() * HOP_SECONDS), 2),
+        # Power-weighted time (full scale = 1); energy_dose / phonation_seconds is the mean power
+        "energy_dose": float((10 ** (level / 10)).sum() * HOP_SECONDS),
+    }
+
+
+def voice_quality(samples: np.ndarray, sample_rate: int, gain_db: float = 0.0) -> dict:
+    """
+    Voice-quality measures for mono float samples; {"available": False, ...}
+    if there is too little voicing. gain_db is any gain already applied
+    (loudness normalization); levels and the loudness dose are reported as
+    recorded.
+    """
+    samples = np.ascontiguousarray(samples, dtype=np.float32)
+    hop = max(1, int(sample_rate * HOP_SECONDS))
+    frame_length = int(2.5 * sample_rate / FMIN)
+    if len(samples) < frame_length * 2:
+        return {"available": False, "reason": "Recording too short"}
+
+    f0, voiced, periodicity, energy_db = pitch_track(samples, sample_rate, hop, frame_length, FMIN, FMAX)
+    energy_db = energy_db - gain_db
+    voiced_seconds = float(voiced.sum() * HOP_SECONDS)
+    dose = voice_dose(f0, voiced, energy_db)
+
+    positions, amplitudes, runs = cycle_marks(samples, sample_rate, f0, voiced, hop, frame_length)
+    result = _perturbation(positions, amplitudes, runs, sample_rate) if len(positions) > 2 else {}
+    if not result:
+        return {"available": False, "reason": "Not enough voiced speech", "voiced_seconds": round(voiced_seconds, 2),
+                "dose": dose}
+
+    r = np.clip(periodicity[voiced], 1e-4, 0.999)
+    result["hnr_db"] = round(float(np.mean(10 * np.log10(r / (1 - r)))), 2)
+    result.update(_spectral_tilt(samples, sample_rate, voiced, hop))
+    result.update(_voice_breaks(voiced, energy_db))
+    result["voiced_seconds"] = round(voiced_seconds, 2)
+    speech_level = float(np.median(energy_db[voiced]))
+    unvoiced = energy_db[~voiced]
+    # Quiet unvoiced frames, or the noise implied by the HNR when there are none
+    noise_floor = float(np.percentile(unvoiced, 10)) if len(unvoiced) >= 10 else speech_level - result["hnr_db"]
+    result["speech_level_dbfs"] = round(speech_level, 1)
+    result["noise_floor_dbfs"] = round(min(noise_floor, speech_level), 1)
+    result["dose"] = dose
+    result["available"] = True
+    result.update(strain_assessment(result))
+    return result
+
+
+def strain_assessment(measures: dict) -> dict:
+    """Flag measures outside the limits in data/voice_norms.py and rate overall strain."""
+    flagged = []
+    for measure, (direction, limit) in STRAIN_LIMITS.items():
+        value = measures.get(measure)
+        if value is None:
+            continue
+        if (direction == "above" and value > limit) or (direction == "below" and value < limit):
+            flagged.append(measure)
+    level = next(name for count, name in reversed(STRAIN_LEVELS) if len(flagged) >= count)
+    return {
+        "strain_level": level,
+        "strain_indicators": flagged,
+        "strain_feedback": [STRAIN_FEEDBACK[measure] for measure in flagged],
+    }
+
+
+class VoiceQualityService:
+    def analyze_samples(self, samples: np.ndarray, sample_rate: int, gain_db: float = 0.0) -> dict:
+        with span("voice_quality.analyze", seconds=round(len(samples) / sample_rate, 1)):
+            return voice_quality(samples, sample_rate, gain_db)
+
+    def analyze(self, audio_bytes) -> dict:
+        """Voice-quality measures for a WAV recording (bytes or buffer)."""
+        try:
+            with span("voice_quality.decode"):
+                samples, sample_rate = decode_wav(audio_bytes)
+        except ValueError as e:
+            return {"available": False, "reason": str(e)}
+        return self.analyze_samples(samples, sample_rate)
+
+
+# Lazily-built singleton instance
+get_voice_quality_service = LazyService("voice_quality", VoiceQualityService)
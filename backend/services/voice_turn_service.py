@@ -0,0 +1,247 @@
+# backend/services/voice_turn_service.py
+"""
+One-request voice turn: recorded audio in, coach reply text and audio out.
+
+Replaces the client's speech-to-text -> conversation -> text-to-speech
+round trips. The stages overlap: the coach reply is streamed from Gemini,
+and each sentence is sent to TTS as soon as it is complete, so audio for
+the first sentence is ready while the rest of the reply is still being
+written. Events are yielded in this order:
+
+    {"event": "transcript", "text"}
+    {"event": "text", "delta"}                      (as the reply streams)
+    {"event": "audio", "index", "text", "audio"}    (per sentence, in order;
+                                                     base64 MP3, or null if TTS failed)
+    {"event": "done", "user_message", "response", "timings"}
+"""
+import asyncio
+import base64
+import logging
+import re
+import time
+from datetime import datetime
+
+from config.settings import settings
+from services.context_manager import get_context_manager
+from services.conversation_service import get_conversation_service
+from services.elevenlabs_service import get_elevenlabs_service
+from services.firebase_service import get_firebase_service
+from services.metrics_service import VOICE_TURN_LATENCY, record_fallback
+from services.practice_stt_service import get_practice_stt_service
+from services.providers import LazyService
+from services.session_store import get_session_store
+from services.stt_cache import get_transcript_cache
+from services.tracing_service import span
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+
+NOT_HEARD_TEXT = "I didn't catch that. Could you please repeat or speak a bit louder?"
+FALLBACK_TEXT = "Thanks for sharing that! Let's keep practicing. What would you like to work on next?"
+
+
+class SentenceChunker:
+    """Accumulates streamed text and hands back complete sentences."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list:
+        self._buffer += text
+        parts = _SENTENCE_END_RE.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+
+    def flush(self) -> list:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class VoiceTurnService:
+    def __init__(self):
+        self.stt = get_practice_stt_service()
+        self.transcripts = get_transcript_cache()
+        self.conversation = get_conversation_service()
+        self.tts = get_elevenlabs_service()
+        self.session_store = get_session_store()
+        self.context_manager = get_context_manager()
+        self.firebase = get_firebase_service()
+
+    async def run(self, audio_bytes: bytes, digest: str, session_id: str = None, history: list = None,
+                  voice_id: str = None):
+        """Run one turn for a recording with content `digest`, yielding the events described above."""
+        start = time.perf_counter()
+        timings = {}
+
+        def mark(stage: str):
+            elapsed = time.perf_counter() - start
+            timings[stage] = round(elapsed * 1000, 1)
+            VOICE_TURN_LATENCY.labels(stage).observe(elapsed)
+
+        with span("voice_turn.transcribe", bytes=len(audio_bytes)):
+            user_message = await self.transcripts.get_or_compute(
+                digest, "practice", self.stt.transcribe_practice_speech, audio_bytes
+            )
+        mark("transcript")
+        yield {"event": "transcript", "text": user_message}
+
+        history = history or []
+        session = None
+        context = None
+        if session_id:
+            session = await asyncio.to_thread(self.session_store.get_or_create, session_id, history=history)
+            history = session.history
+            context = self.context_manager.build_for_session(session, self.session_store)
+
+        heard = bool(user_message) and len(user_message) >= 3
+        # Runs alongside the reply; only needed for the final event
+        analysis_task = asyncio.create_task(self._quick_analysis(user_message, audio_bytes, digest)) if heard else None
+
+        limit = asyncio.Semaphore(settings.VOICE_TURN_TTS_CONCURRENCY)
+        voice_id = voice_id or settings.TTS_VOICE_ID
+
+        async def synthesize(sentence: str):
+            async with limit:
+                with span("voice_turn.tts", chars=len(sentence)):
+                    return await asyncio.to_thread(self.tts.text_to_speech, sentence, voice_id)
+
+        # Producer streams the reply and starts TTS per sentence; the loop
+        # below emits text as it arrives and audio in sentence order
+        events = asyncio.Queue()
+        tts_tasks = []
+
+        async def produce():
+            chunker = SentenceChunker()
+            response = None
+            try:
+                if heard:
+                    stream = self.conversation.stream_coaching_response(user_message, history, context)
+                else:
+                    stream = _canned(NOT_HEARD_TEXT)
+                async for kind, value in stream:
+                    if kind == "response":
+                        response = value
+                        continue
+                    await events.put(("text", value))
+                    for sentence in chunker.feed(value):
+                        tts_tasks.append(asyncio.create_task(synthesize(sentence)))
+                        await events.put(("audio", (sentence, tts_tasks[-1])))
+                for sentence in chunker.flush():
+                    tts_tasks.append(asyncio.create_task(synthesize(sentence)))
+                    await events.put(("audio", (sentence, tts_tasks[-1])))
+            except Exception as e:
+                logger.error("Voice turn reply failed: %s", e)
+                record_fallback("voice_turn", "reply_error")
+            finally:
+                await events.put(("end", response))
+
+        producer = asyncio.create_task(produce())
+        finished = False
+        try:
+            index = 0
+            while True:
+                kind, value = await events.get()
+                if kind == "text":
+                    yield {"event": "text", "delta": value}
+                elif kind == "audio":
+                    sentence, task = value
+                    try:
+                        audio = await task
+                    except Exception as e:
+                        logger.warning("Voice turn TTS failed: %s", e)
+                        audio = None
+                    if audio is None:
+                        record_fallback("voice_turn_tts", "no_audio")
+                    if index == 0:
+                        mark("first_audio")
+                    yield {
+                        "event": "audio",
+                        "index": index,
+                        "text": sentence,
+                        "audio": base64.b64encode(audio).decode("ascii") if audio else None,
+                        "format": "mp3"
+                    }
+                    index += 1
+                else:
+                    response = value
+                    break
+            await producer
+            finished = True
+        finally:
+            if not finished:
+                # Client disconnected: stop pending work
+                producer.cancel()
+                for task in tts_tasks:
+                    task.cancel()
+                if analysis_task is not None:
+                    analysis_task.cancel()
+
+        if response is None:
+            response = _coach_reply(FALLBACK_TEXT)
+        if analysis_task is not None:
+            try:
+                response["quick_analysis"] = await analysis_task
+            except Exception as e:
+                logger.error("Analysis error: %s", e)
+                record_fallback("quick_analysis", "error")
+
+        if heard:
+            session = await self._record_turn(session, session_id, user_message, response, history)
+            if session is not None:
+                response["session_id"] = session.session_id
+        mark("complete")
+        yield {"event": "done", "user_message": user_message, "response": response, "timings": timings}
+
+    async def _quick_analysis(self, user_message: str, audio_bytes: bytes, digest: str) -> dict:
+        """Speaking-pattern analysis, with the acoustic filler count of the recording when it can be measured."""
+        filled_pauses = None
+        try:
+            # Shares the cached result with /api/speech-to-text for the same recording
+            quality = await self.transcripts.get_or_compute(
+                digest, "quality", self.stt.analyze_recording_quality, audio_bytes
+            )
+            fillers = (quality or {}).get("fillers") or {}
+            if fillers.get("available"):
+                filled_pauses = fillers["filled_pauses"]
+        except Exception as e:
+            logger.warning("Voice turn filler detection failed: %s", e)
+            record_fallback("voice_turn", "fillers_unavailable")
+        return await self.conversation.analyze_speaking_pattern(user_message, filled_pauses)
+
+    async def _record_turn(self, session, session_id: str, user_message: str, response: dict, history: list):
+        try:
+            with span("firestore.enqueue", collection="conversation_entries"):
+                self.firebase.save_conversation_entry({
+                    "session_id": session_id,
+                    "user_message": user_message,
+                    "ai_response": response.get("text", ""),
+                    "timestamp": datetime.now().isoformat(),
+                    "analysis": response.get("quick_analysis", {})
+                })
+        except Exception as e:
+            logger.error("Failed to save conversation entry: %s", e)
+        if session is None:
+            return None
+        return await asyncio.to_thread(
+            self.session_store.append_turns, session.session_id,
+            [("user", user_message), ("ai", response.get("text", ""))], history=history
+        )
+
+
+def _coach_reply(text: str) -> dict:
+    return {
+        "text": text,
+        "coach_name": "Alex",
+        "coaching_tips": ["Speak clearly", "Project your voice"],
+        "requires_response": True
+    }
+
+
+async def _canned(text: str):
+    yield "text", text
+    yield "response", _coach_reply(text)
+
+
+# Lazily-built singleton instance
+get_voice_turn_service = LazyService("voice_turn", VoiceTurnService)
@@ -449,7 +449,7 @@ function App() {
                       </Box>
 
                       {/* Mock data notice */}
-                      {(analysisResult.feedback?.is_real_ai === false || analysisResult.is_mock === true) && (
+                      {((analysisResult.feedback?.is_real_ai === false && analysisResult.feedback?.analysis_source !== 'local') || analysisResult.is_mock === true) && (
                         <Alert severity="info" sx={{ mt: 3 }}>
                           Showing demonstration analysis. Record your own speech for personalized feedback.
                         </Alert>
@@ -30,10 +30,13 @@ const ConversationCoach = ({ backendUrl }) => {
   const [isSpeaking, setIsSpeaking] = useState(false);
   const [availableTopics, setAvailableTopics] = useState([]);
   const [showTips, setShowTips] = useState(true);
+  const [sessionId, setSessionId] = useState(null);
 
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
   const conversationEndRef = useRef(null);
+  const audioQueueRef = useRef([]);
+  const audioPlayingRef = useRef(false);
 
   // Define fetchTopics function with useCallback
   const fetchTopics = useCallback(async () => {
@@ -63,6 +66,7 @@ const ConversationCoach = ({ backendUrl }) => {
       };
       
       setConversation([welcomeMessage]);
+      setSessionId(data.session_id || null);
       setCurrentTopic(null);
       
       // Speak the welcome message
@@ -107,10 +111,18 @@ const ConversationCoach = ({ backendUrl }) => {
       };
       
       mediaRecorderRef.current.onstop = async () => {
+        // Create blob from audio chunks
+        const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/wav' });
+        try {
+          // One request: transcript, streamed reply and coach audio
+          await processVoiceTurn(audioBlob);
+          stream.getTracks().forEach(track => track.stop());
+          return;
+        } catch (voiceTurnError) {
+          console.warn('Voice turn unavailable, using separate requests:', voiceTurnError);
+        }
+        
         try {
-          // Create blob from audio chunks
-          const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/wav' });
-          
           // Send audio to backend for transcription
           const formData = new FormData();
           formData.append('file', audioBlob, 'conversation.wav');
@@ -154,6 +166,109 @@ const ConversationCoach = ({ backendUrl }) => {
     }
   };
 
+  // Coach audio from /api/voice-turn plays sentence by sentence as it arrives
+  const playNextCoachAudio = useCallback(() => {
+    const next = audioQueueRef.current.shift();
+    if (!next) {
+      audioPlayingRef.current = false;
+      setIsSpeaking(false);
+      return;
+    }
+    audioPlayingRef.current = true;
+    setIsSpeaking(true);
+    
+    if (next.audio) {
+      const player = new Audio(`data:audio/mpeg;base64,${next.audio}`);
+      player.onended = playNextCoachAudio;
+      player.onerror = playNextCoachAudio;
+      player.play().catch(playNextCoachAudio);
+    } else if ('speechSynthesis' in window) {
+      // No server audio for this sentence: use the browser voice
+      const utterance = new SpeechSynthesisUtterance(next.text);
+      utterance.rate = 0.9;
+      utterance.onend = playNextCoachAudio;
+      utterance.onerror = playNextCoachAudio;
+      window.speechSynthesis.speak(utterance);
+    } else {
+      playNextCoachAudio();
+    }
+  }, []);
+
+  const enqueueCoachAudio = useCallback((chunk) => {
+    audioQueueRef.current.push(chunk);
+    if (!audioPlayingRef.current) {
+      playNextCoachAudio();
+    }
+  }, [playNextCoachAudio]);
+
+  const processVoiceTurn = async (audioBlob) => {
+    const formData = new FormData();
+    formData.append('file', audioBlob, 'conversation.wav');
+    if (sessionId) {
+      formData.append('session_id', sessionId);
+    } else {
+      formData.append('history', JSON.stringify(conversation));
+    }
+    
+    const response = await fetch(`${backendUrl}/api/voice-turn`, {
+      method: 'POST',
+      body: formData,
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Voice turn failed: ${response.status}`);
+    }
+    
+    setIsProcessing(true);
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const startedAt = new Date().toISOString();
+    let buffer = '';
+    let replyText = '';
+    
+    const updateReply = (fields) => {
+      setConversation(prev => {
+        const rest = prev.filter(message => !(message.speaker === 'ai' && message.timestamp === startedAt));
+        return [...rest, { speaker: 'ai', text: replyText, timestamp: startedAt, ...fields }];
+      });
+    };
+    
+    const handleEvent = (event) => {
+      if (event.event === 'transcript') {
+        setConversation(prev => [...prev, { speaker: 'user', text: event.text, timestamp: new Date().toISOString() }]);
+      } else if (event.event === 'text') {
+        replyText += event.delta;
+        updateReply({});
+      } else if (event.event === 'audio') {
+        enqueueCoachAudio(event);
+      } else if (event.event === 'done') {
+        replyText = event.response.text || replyText;
+        updateReply({
+          tips: event.response.coaching_tips || ["Keep practicing", "Focus on your pacing"],
+          quickAnalysis: event.response.quick_analysis
+        });
+      }
+    };
+    
+    try {
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+      }
+      if (buffer.trim()) {
+        handleEvent(JSON.parse(buffer));
+      }
+    } catch (streamError) {
+      // The turn already started; keep what arrived rather than starting over
+      console.error('Voice turn stream error:', streamError);
+    } finally {
+      setIsProcessing(false);
+    }
+  };
+
   const processUserMessage = async (text) => {
     if (!text.trim()) return;
     
@@ -178,9 +293,13 @@ const ConversationCoach = ({ backendUrl }) => {
       const response = await fetch(`${backendUrl}/api/conversation/respond`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
+        // With a session the backend keeps the history; only send the new message
+        body: JSON.stringify(sessionId ? {
           message: text,
-          history: conversation  // Send current conversation state
+          session_id: sessionId
+        } : {
+          message: text,
+          history: conversation
         })
       });
       
@@ -206,8 +325,16 @@ const ConversationCoach = ({ backendUrl }) => {
       setConversation(prev => [...prev, aiMessage]);
       console.log("✅ Added AI response to conversation");
       
-      // Speak the AI response
-      speakMessage(aiResponse.text || aiMessage.text);
+      // Speak the AI response: the server already started synthesizing it
+      if (aiResponse.audio_token) {
+        const player = new Audio(`${backendUrl}/api/text-to-speech/${aiResponse.audio_token}`);
+        player.onended = () => setIsSpeaking(false);
+        player.onerror = () => speakMessage(aiMessage.text);
+        setIsSpeaking(true);
+        player.play().catch(() => speakMessage(aiMessage.text));
+      } else {
+        speakMessage(aiResponse.text || aiMessage.text);
+      }
       
     } catch (error) {
       console.error('❌ Error processing message:', error);
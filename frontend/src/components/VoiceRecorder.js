@@ -27,6 +27,17 @@ import CloseIcon from '@mui/icons-material/Close';
 import ComparisonComponent from './ComparisonComponent';
 import VirtualMeetingPractice from './VirtualMeetingPractice';
 
+// Recordings larger than this use the resumable upload API
+const RESUMABLE_UPLOAD_BYTES = 5 * 1024 * 1024;
+const RESUMABLE_UPLOAD_RETRIES = 5;
+
+// MediaRecorder produces webm (Chrome, Firefox) or mp4 (Safari), never WAV;
+// label the blob with what it really is so the backend decodes it correctly
+const recordingFilename = (blob, base) => {
+  const extension = (blob.type.split(';')[0].split('/')[1] || 'webm').replace('x-', '');
+  return `${base}.${extension}`;
+};
+
 const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selectedTemplate }) => {
   const [isRecording, setIsRecording] = useState(false);
   const [audioBlob, setAudioBlob] = useState(null);
@@ -54,6 +65,11 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
   const audioChunksRef = useRef([]);
   const audioRef = useRef(null);
   const conversationRecorderRef = useRef(null);
+  // Practice session of the current recording: created before upload so the
+  // backend can archive it and attach its voice-quality measures
+  const sessionIdRef = useRef(null);
+  // Acoustic filled-pause count of the current recording (STT drops most "um"s)
+  const filledPausesRef = useRef(null);
 
   // ✅ Load saved state from localStorage on component mount
   useEffect(() => {
@@ -118,6 +134,8 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
       setShowComparison(false);
       setShowMeetingPractice(false);
       audioChunksRef.current = [];
+      sessionIdRef.current = null;
+      filledPausesRef.current = null;
       
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
       mediaRecorderRef.current = new MediaRecorder(stream);
@@ -129,7 +147,7 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
       };
       
       mediaRecorderRef.current.onstop = () => {
-        const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/wav' });
+        const audioBlob = new Blob(audioChunksRef.current, { type: mediaRecorderRef.current.mimeType });
         const audioUrl = URL.createObjectURL(audioBlob);
         setAudioBlob(audioBlob);
         setAudioUrl(audioUrl);
@@ -162,6 +180,80 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
     }
   };
 
+  // Long recordings go up in chunks that survive a dropped connection:
+  // a failed chunk is retried from the server's offset, not from byte 0
+  const uploadResumable = async (blob, sessionId) => {
+    const init = await fetch(`${backendUrl}/api/uploads`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ filename: recordingFilename(blob, 'recording'), size: blob.size }),
+    });
+    const upload = await init.json();
+    if (!init.ok) throw new Error(upload.detail || 'Could not start upload');
+
+    let offset = 0;
+    let failures = 0;
+    while (offset < blob.size) {
+      let response = null;
+      try {
+        response = await fetch(`${backendUrl}/api/uploads/${upload.upload_id}?offset=${offset}`, {
+          method: 'PUT',
+          body: blob.slice(offset, offset + upload.chunk_size),
+        });
+      } catch (err) {
+        // Network error: fall through to the retry below
+      }
+      if (response && response.ok) {
+        offset = (await response.json()).offset;
+        failures = 0;
+        continue;
+      }
+      if (response && response.status !== 409 && response.status < 500) {
+        const data = await response.json();
+        throw new Error(data.detail || 'Upload rejected');
+      }
+      if (!response || response.status !== 409) {
+        failures += 1;
+        if (failures > RESUMABLE_UPLOAD_RETRIES) throw new Error('Upload interrupted; please try again');
+        await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** failures));
+      }
+      // Resume from wherever the server got to (409: it has more or less than we thought)
+      const status = await fetch(`${backendUrl}/api/uploads/${upload.upload_id}`).catch(() => null);
+      if (status && status.ok) offset = (await status.json()).offset;
+    }
+
+    const query = sessionId ? `?session_id=${encodeURIComponent(sessionId)}` : '';
+    const response = await fetch(`${backendUrl}/api/uploads/${upload.upload_id}/finalize${query}`, { method: 'POST' });
+    return { response, data: await response.json() };
+  };
+
+  // The practice session for the current recording, created on first use;
+  // null if the backend could not create one. A transcribed recording's text
+  // is set on the session by the backend; typed text is sent here
+  const ensureSession = async () => {
+    if (sessionIdRef.current) return sessionIdRef.current;
+    try {
+      const sessionResponse = await fetch(`${backendUrl}/api/sessions`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          ...(transcribedText && { text: transcribedText }),
+          audio_duration: audioBlob ? Math.round(audioBlob.size / 1000) : 0,
+          recorded_at: new Date().toISOString()
+        }),
+      });
+      if (!sessionResponse.ok) return null;
+      const sessionData = await sessionResponse.json();
+      sessionIdRef.current = sessionData.session_id;
+      console.log('✅ Created session:', sessionIdRef.current);
+    } catch (sessionError) {
+      console.log('⚠️ Session save failed', sessionError);
+    }
+    return sessionIdRef.current;
+  };
+
   // ✅ FIXED: Updated transcribeAudio with mode parameter for analysis
   const transcribeAudio = async () => {
     if (!audioBlob) {
@@ -173,21 +265,32 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
     setError('');
     
     try {
-      const formData = new FormData();
-      formData.append('file', audioBlob, 'recording.wav');
-      formData.append('mode', 'analysis');  // CRITICAL: Tell backend this is for analysis
-      
-      console.log('🔍 Sending transcription request with mode=analysis');
-      
-      const response = await fetch(`${backendUrl}/api/speech-to-text`, {
-        method: 'POST',
-        body: formData,  // FormData automatically sets Content-Type
-      });
-      
-      const data = await response.json();
+      let response;
+      let data;
+      // With a session id the recording is archived and its voice-quality
+      // measures are attached to the session
+      const sessionId = await ensureSession();
+      if (audioBlob.size > RESUMABLE_UPLOAD_BYTES) {
+        ({ response, data } = await uploadResumable(audioBlob, sessionId));
+      } else {
+        const formData = new FormData();
+        formData.append('file', audioBlob, recordingFilename(audioBlob, 'recording'));
+        formData.append('mode', 'analysis');  // CRITICAL: Tell backend this is for analysis
+        if (sessionId) formData.append('session_id', sessionId);
+        
+        console.log('🔍 Sending transcription request with mode=analysis');
+        
+        response = await fetch(`${backendUrl}/api/speech-to-text`, {
+          method: 'POST',
+          body: formData,  // FormData automatically sets Content-Type
+        });
+        data = await response.json();
+      }
       
       if (response.ok) {
         setTranscribedText(data.text);
+        const fillers = data.recording_quality?.fillers;
+        filledPausesRef.current = fillers?.available ? fillers.filled_pauses : null;
         setSuccess('✅ Speech transcribed! Now analyze or generate feedback.');
         console.log('🎤 Transcription complete:', {
           mode: data.mode,
@@ -206,6 +309,27 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
     }
   };
 
+  // Merge the AI narrative into the result when the analysis job finishes
+  // (the backend also saves it to the session)
+  const followAnalysisJob = (analysisData) => {
+    const events = new EventSource(`${backendUrl}/api/analysis-jobs/${analysisData.job_id}/events`);
+    const finish = (event) => {
+      events.close();
+      const job = JSON.parse(event.data);
+      if (job.status !== 'done') return;
+      const updated = { ...analysisData, feedback: job.feedback };
+      setAnalysisResult(updated);
+      localStorage.setItem('vocalCoach_analysisResult', JSON.stringify(updated));
+      if (onAnalysisComplete) {
+        onAnalysisComplete(updated);
+      }
+    };
+    events.addEventListener('done', finish);
+    events.addEventListener('failed', finish);
+    events.addEventListener('timeout', () => events.close());
+    events.onerror = () => events.close();
+  };
+
   // ✅ FIXED: Updated analyzeText function with better error handling
   const analyzeText = async () => {
     if (!transcribedText.trim()) {
@@ -214,28 +338,10 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
     }
 
     try {
-      let sessionId = null;
-      
-      // FIRST: Save session to get session ID
-      try {
-        const sessionResponse = await fetch(`${backendUrl}/api/sessions`, {
-          method: 'POST',
-          headers: {
-            'Content-Type': 'application/json',
-          },
-          body: JSON.stringify({
-            text: transcribedText,
-            audio_duration: audioBlob ? Math.round(audioBlob.size / 1000) : 0,
-            recorded_at: new Date().toISOString()
-          }),
-        });
-
-        const sessionData = await sessionResponse.json();
-        sessionId = sessionData.session_id;
-        console.log('✅ Created session:', sessionId);
-        
-      } catch (sessionError) {
-        console.log('⚠️ Session save failed, using mock session', sessionError);
+      // FIRST: The recording's session (created when it was transcribed)
+      let sessionId = await ensureSession();
+      if (!sessionId) {
+        console.log('⚠️ Session save failed, using mock session');
         sessionId = `mock_${Date.now()}`;
       }
 
@@ -245,9 +351,14 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ text: transcribedText }),
+        body: JSON.stringify({
+          text: transcribedText,
+          session_id: sessionId,
+          ...(filledPausesRef.current != null && { filled_pauses: filledPausesRef.current })
+        }),
       });
       
+      // Local metrics arrive immediately; the AI narrative follows via the job
       const analysisData = await analysisResponse.json();
       
       if (analysisResponse.ok && sessionId) {
@@ -275,6 +386,10 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
         if (onAnalysisComplete) {
           onAnalysisComplete(analysisData);
         }
+
+        if (analysisData.job_id && analysisData.feedback?.narrative_status === 'pending') {
+          followAnalysisJob(analysisData);
+        }
       } else {
         setError('Analysis failed. Please try again.');
       }
@@ -532,7 +647,7 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
       };
       
       conversationRecorderRef.current.onstop = async () => {
-        const audioBlob = new Blob(audioChunksRef.current, { type: 'audio/wav' });
+        const audioBlob = new Blob(audioChunksRef.current, { type: conversationRecorderRef.current.mimeType });
         await handleConversationAudio(audioBlob);
         stream.getTracks().forEach(track => track.stop());
       };
@@ -559,7 +674,7 @@ const VoiceRecorder = ({ backendUrl, onAnalysisComplete, selectedVoice, selected
     try {
       // Transcribe user speech with conversation mode
       const formData = new FormData();
-      formData.append('file', audioBlob, 'conversation.wav');
+      formData.append('file', audioBlob, recordingFilename(audioBlob, 'conversation'));
       formData.append('mode', 'conversation');  // Use conversation mode for varied responses
       
       console.log('💬 Sending conversation transcription with mode=conversation');